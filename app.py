@@ -1,8 +1,10 @@
 import streamlit as st
 import os
+import asyncio
+import hashlib
 import tempfile
 from utils.document_parser import extract_text_from_document
-from utils.llm_interface import extract_clauses, summarize_clause, analyze_risks
+from utils.llm_interface import extract_clauses, warm_up_client, analyze_document, submit_document_batch, check_document_batch, BATCH_FAILED_STATUSES
 from db import init_db, get_db, create_user, get_user_by_email, save_analysis
 from models import User, ContractAnalysis
 import sqlalchemy.orm
@@ -15,6 +17,15 @@ from components.full_contract import display_full_contract
 from components.landing_page import display_landing_page
 from utils.session_manager import initialize_session_state, update_risk_metrics
 
+# How a pending background analysis is described, by batch status. Other
+# statuses, including "unknown" when the batch couldn't be checked, get a generic message
+BATCH_STATUS_MESSAGES = {
+    "validating": "being validated",
+    "in_progress": "in progress",
+    "finalizing": "being finalized",
+    "cancelling": "being cancelled",
+}
+
 # Initialize database
 init_db()
 
@@ -29,6 +40,9 @@ st.set_page_config(
 # Initialize session state
 initialize_session_state()
 
+# Open a connection to the OpenAI API while the page is built
+warm_up_client()
+
 def login_user(email, password):
     """Authenticate user and set session state"""
     db = next(get_db())
@@ -127,6 +141,10 @@ with st.sidebar:
 
 # File upload
 uploaded_file = st.file_uploader("Upload your contract document", type=["pdf", "docx", "txt"])
+background_analysis = st.toggle(
+    "Background analysis",
+    help="Analyze the whole contract as a discounted batch job. Results can take a while to come back."
+)
 
 # Process the document when uploaded
 if uploaded_file is not None:
@@ -162,7 +180,8 @@ if uploaded_file is not None:
         
         # Extract clauses from the document
         with st.spinner("Extracting and analyzing clauses..."):
-            clauses = extract_clauses(document_text)
+            doc_hash = hashlib.sha256(document_text.encode('utf-8')).hexdigest()
+            clauses = extract_clauses(doc_hash, document_text)
             
             # Store clauses in session state
             st.session_state.clauses = clauses
@@ -177,23 +196,43 @@ if uploaded_file is not None:
             if 'clause_simple_risks' not in st.session_state:
                 st.session_state.clause_simple_risks = {}
             
-            # Process each clause for summaries and risk analysis
+            # Summarize and analyze all clauses, concurrently or as a batch job
             progress_text = st.empty()
             analysis_progress_bar = st.progress(0)
-            total_clauses = len(clauses)
             
-            for i, (clause_title, clause_text) in enumerate(clauses.items()):
-                # Update progress
-                progress_text.text(f"Analyzing clause {i+1} of {total_clauses}: {clause_title}")
-                analysis_progress_bar.progress((i+1)/total_clauses)
-                
-                # Get summary using GPT
-                st.session_state.clause_summaries[clause_title] = summarize_clause(clause_title, clause_text)
+            def show_progress(completed, total):
+                progress_text.text(f"Analyzing clauses: {completed} of {total} analyses complete")
+                analysis_progress_bar.progress(completed / total)
+            
+            if background_analysis:
+                # Submit once per file; later reruns only check on the same batch
+                if st.session_state.get('batch_file_id') != file_info:
+                    st.session_state.batch_id = submit_document_batch(clauses)
+                    st.session_state.batch_file_id = file_info
                 
-                # Get risk analysis using GPT
-                simple_risks, detailed_risks = analyze_risks(clause_title, clause_text)
-                st.session_state.clause_simple_risks[clause_title] = simple_risks
-                st.session_state.clause_detailed_risks[clause_title] = detailed_risks
+                batch_status, batch_results = check_document_batch(st.session_state.batch_id, clauses)
+                if batch_results is None:
+                    progress_text.empty()
+                    analysis_progress_bar.empty()
+                    if batch_status in BATCH_FAILED_STATUSES:
+                        # Forget the batch so the next run submits a fresh one
+                        st.session_state.pop('batch_id', None)
+                        st.session_state.pop('batch_file_id', None)
+                        st.error(f"Background analysis {batch_status}. Resubmit it, or turn off background analysis to analyze this contract now.")
+                        st.button("Resubmit")
+                    else:
+                        status_message = BATCH_STATUS_MESSAGES.get(batch_status, "still pending")
+                        st.info(f"Background analysis of {len(clauses)} clauses is {status_message}. Results can take a while to come back.")
+                        st.button("Check again")
+                    st.stop()
+                summaries, simple_risks, detailed_risks = batch_results
+            else:
+                progress_text.text(f"Analyzing {len(clauses)} clauses...")
+                # Summaries are streamed by the summary tabs when they are shown
+                summaries, simple_risks, detailed_risks = asyncio.run(analyze_document(clauses, on_progress=show_progress, summarize=False))
+            st.session_state.clause_summaries.update(summaries)
+            st.session_state.clause_simple_risks.update(simple_risks)
+            st.session_state.clause_detailed_risks.update(detailed_risks)
             
             # Clean up the progress display
             progress_text.empty()
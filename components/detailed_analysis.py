@@ -2,6 +2,7 @@ import streamlit as st
 from utils.session_manager import get_current_clause_data, set_current_clause, save_user_note, get_sample_contract_data
 from utils.text_highlighter import annotate_clause_risks
 from utils.lucide_icons import get_risk_icon
+from components.simple_summary import display_streamed_summary
 
 LUCIDE_ICON_HIGH_RISK = get_risk_icon("high")
 LUCIDE_ICON_MEDIUM_RISK = get_risk_icon("medium")
@@ -160,13 +161,8 @@ def display_detailed_analysis(is_sample=False):
                     'low_risk_clauses': []
                 })
                 
-                # Determine risk level based on which list the clause is in
-                if clause_title in risk_metrics['high_risk_clauses']:
-                    risk_level = "high"
-                elif clause_title in risk_metrics['medium_risk_clauses']:
-                    risk_level = "medium"
-                else:
-                    risk_level = "low"
+                # Look up the risk level computed by update_risk_metrics
+                risk_level = risk_metrics.get('clause_risk_level', {}).get(clause_title, "low")
                 
                 # Determine icon based on risk level
                 if risk_level == "high":
@@ -273,4 +269,4 @@ def display_detailed_analysis(is_sample=False):
             
             # Plain English Summary
             st.markdown("### Plain English Summary")
-            st.markdown(clause_data["summary"])
\ No newline at end of file
+            display_streamed_summary(clause_data["title"], clause_data["text"])
\ No newline at end of file
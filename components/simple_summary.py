@@ -1,7 +1,29 @@
 import streamlit as st
-from utils.llm_interface import summarize_clause
+from utils.llm_interface import stream_summary
 from utils.session_manager import get_sample_contract_data
 
+def display_streamed_summary(title, text):
+    """
+    Show a clause summary, streaming it in if it hasn't been generated yet
+    
+    Args:
+        title: Title of the clause
+        text: Full text of the clause
+    """
+    if 'clause_summaries' not in st.session_state:
+        st.session_state.clause_summaries = {}
+    summaries = st.session_state.clause_summaries
+    
+    if title in summaries:
+        st.write(summaries[title])
+        return
+    
+    # Each value is the summary so far, or a fallback replacing a failed stream
+    summary_placeholder = st.empty()
+    for summary in stream_summary(title, text):
+        summary_placeholder.write(summary)
+    summaries[title] = summary
+
 def display_simple_summary(progress_bar=None, is_sample=False):
     """
     Display the simple summary tab
@@ -22,19 +44,14 @@ def display_simple_summary(progress_bar=None, is_sample=False):
             st.write(clause['summary'])
             st.divider()
     else:
-        # Process real clauses
-        key_clauses_summary = []
-        
+        # Process real clauses, streaming any summary we don't have yet
         clauses = st.session_state.clauses
+        
         for i, (title, text) in enumerate(list(clauses.items())[:5]):  # Just show top 5 for simple view
-            summary = summarize_clause(title, text)
-            key_clauses_summary.append((title, summary))
+            st.markdown(f"**{title}**")
+            display_streamed_summary(title, text)
+            st.divider()
             
             # Update progress bar if provided
             if progress_bar:
-                progress_bar.progress((i + 1) / len(clauses))
-        
-        for title, summary in key_clauses_summary:
-            st.markdown(f"**{title}**")
-            st.write(summary)
-            st.divider()
\ No newline at end of file
+                progress_bar.progress((i + 1) / len(clauses))
\ No newline at end of file
@@ -10,9 +10,16 @@ DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///plainsight.db')  # Default t
 # Application configuration
 SECRET_KEY = os.getenv('SECRET_KEY', 'your-secret-key-here')  # Change this in production
 DEFAULT_CREDITS = 5  # Number of credits new users get
+TEXT_CACHE_DIR = os.getenv('TEXT_CACHE_DIR', '.text_cache')  # Extracted document text, keyed by file hash
 
 # OpenAI configuration
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+LLM_CACHE_DIR = os.getenv('LLM_CACHE_DIR', '.llm_cache')  # On-disk cache of clause-level LLM results
+SEMANTIC_CACHE_DIR = os.getenv('SEMANTIC_CACHE_DIR', os.path.expanduser('~/.plainsight_cache'))  # Embedding index of analysed clauses
+
+# Debug logging
+DEBUG = bool(os.getenv('DEBUG'))  # Write prompt and response dumps to DEBUG_LOG_PATH
+DEBUG_LOG_PATH = os.getenv('DEBUG_LOG_PATH', os.path.expanduser('~/plainsight_debug.log'))
 
 # Session configuration
 SESSION_TYPE = 'filesystem'
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text, LargeBinary
 from sqlalchemy.orm import sessionmaker
 from models import Base
 from config import DATABASE_URL
@@ -44,6 +44,7 @@ def init_db():
     if not getattr(init_db, 'initialized', False):
         try:
             Base.metadata.create_all(bind=engine)
+            _migrate_password_hash()
             logger.info("Database tables created or verified")
             # Mark as initialized
             init_db.initialized = True
@@ -53,6 +54,31 @@ def init_db():
     else:
         logger.debug("Database already initialized in this session")
 
+def _migrate_password_hash():
+    """
+    Convert password hashes stored as text to binary
+
+    create_all() doesn't alter existing tables, so databases created while
+    password_hash was String(128) still hold the hashes as text.
+    """
+    if engine.dialect.name == 'postgresql':
+        columns = {column['name']: column['type'] for column in inspect(engine).get_columns('users')}
+        if isinstance(columns.get('password_hash'), LargeBinary):
+            return
+        with engine.begin() as connection:
+            connection.execute(text(
+                "ALTER TABLE users ALTER COLUMN password_hash TYPE bytea "
+                "USING convert_to(password_hash, 'UTF8')"
+            ))
+        logger.info("Converted users.password_hash to bytea")
+    elif engine.dialect.name == 'sqlite':
+        # SQLite columns aren't typed, so only the stored values need converting
+        with engine.begin() as connection:
+            connection.execute(text(
+                "UPDATE users SET password_hash = CAST(password_hash AS BLOB) "
+                "WHERE typeof(password_hash) = 'text'"
+            ))
+
 def get_db():
     """Get a database session"""
     db = SessionLocal()
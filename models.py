@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -11,18 +11,22 @@ class User(Base):
     
     id = Column(Integer, primary_key=True)
     email = Column(String(120), unique=True, nullable=False)
-    password_hash = Column(String(128), nullable=False)
+    password_hash = Column(LargeBinary(60), nullable=False)  # Raw bcrypt hash (always 60 bytes)
     credits = Column(Integer, default=5)  # Default 5 credits
     created_at = Column(DateTime, default=datetime.utcnow)
     analyses = relationship('ContractAnalysis', back_populates='user')
     
     def set_password(self, password):
         salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), salt)
     
     def check_password(self, password):
         try:
-            return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+            stored_hash = self.password_hash
+            # Hashes saved as text on databases init_db does not migrate
+            if isinstance(stored_hash, str):
+                stored_hash = stored_hash.encode('utf-8')
+            return bcrypt.checkpw(password.encode('utf-8'), stored_hash)
         except ValueError:
             # If the stored hash is invalid, return False
             return False
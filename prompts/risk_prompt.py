@@ -18,25 +18,71 @@ Analyze this clause for the following types of risks:
 6. Potentially unenforceable terms under Australian law
 7. Conflicts with ACCC guidelines on unfair contract terms
 
+Report at most the 3 most significant risks.
+
 For each risk you identify:
 1. Extract the EXACT problematic text segment (word-for-word from the clause)
 2. Explain why this specific text is problematic under Australian law
 3. Reference the specific Australian legal principle or regulation it may conflict with
 
-Return your analysis in the following JSON format:
+Return your analysis as a JSON object in the following format:
 ```json
-[
-  {{
-    "problematic_text": "exact text from the clause that is problematic",
-    "explanation": "explanation of why this text is problematic",
-    "legal_reference": "relevant Australian legal principle or regulation",
-    "severity": "high|medium|low"
-  }}
-]
+{{
+  "risks": [
+    {{
+      "problematic_text": "exact text from the clause that is problematic",
+      "explanation": "explanation of why this text is problematic",
+      "legal_reference": "relevant Australian legal principle or regulation",
+      "severity": "high|medium|low"
+    }}
+  ]
+}}
 ```
 
 If no risks are identified, return:
 ```json
-[]
+{{"risks": []}}
+```
+"""
+
+BULK_RISK_PROMPT = """
+Please analyze each of the following contract clauses for potential legal risks from the perspective of an Australian small business. 
+Focus on identifying clauses that may be unfair, unusually onerous, or potentially unenforceable under Australian law.
+
+Each clause is delimited by <<CLAUSE id=...>> and <<END CLAUSE>> markers.
+
+{clause_blocks}
+
+Analyze each clause for the following types of risks:
+1. Unfair contract terms under Australian Consumer Law (especially for standard form contracts)
+2. Overly broad indemnities or limitations of liability
+3. Unreasonable termination provisions
+4. Excessive penalties or fees
+5. Imbalanced rights and obligations between parties
+6. Potentially unenforceable terms under Australian law
+7. Conflicts with ACCC guidelines on unfair contract terms
+
+Report at most the 3 most significant risks for each clause.
+
+For each risk you identify:
+1. Extract the EXACT problematic text segment (word-for-word from that clause)
+2. Explain why this specific text is problematic under Australian law
+3. Reference the specific Australian legal principle or regulation it may conflict with
+
+Return a single JSON object mapping every clause id to the list of risks found in that clause:
+```json
+{{
+  "0": [
+    {{
+      "problematic_text": "exact text from the clause that is problematic",
+      "explanation": "explanation of why this text is problematic",
+      "legal_reference": "relevant Australian legal principle or regulation",
+      "severity": "high|medium|low"
+    }}
+  ],
+  "1": []
+}}
 ```
+
+Use an empty list for clauses with no identified risks.
 """
\ No newline at end of file
@@ -11,7 +11,7 @@ Clause Text:
 
 Guidelines for your summary:
 1. Use simple, everyday language (avoid legal jargon)
-2. Keep it concise (3-5 sentences is ideal)
+2. Keep it concise (no more than 3 sentences)
 3. Highlight the key obligations, rights, or requirements
 4. Explain what this means in practical terms for an Australian small business
 5. Use an active voice and direct language ("You must..." rather than "The party shall be obligated to...")
@@ -21,4 +21,28 @@ Your summary should help a small business owner understand:
 - What rights this clause gives them
 - Any important deadlines or conditions
 - Any potential financial implications
+"""
+
+BULK_SUMMARY_PROMPT = """
+Please provide a plain English summary of each of the following contract clauses.
+The summaries should be easy to understand for a small business owner without legal training.
+
+Each clause is delimited by <<CLAUSE id=...>> and <<END CLAUSE>> markers.
+
+{clause_blocks}
+
+Guidelines for each summary:
+1. Use simple, everyday language (avoid legal jargon)
+2. Keep it concise (no more than 3 sentences)
+3. Highlight the key obligations, rights, or requirements
+4. Explain what this means in practical terms for an Australian small business
+5. Use an active voice and direct language ("You must..." rather than "The party shall be obligated to...")
+
+Return a single JSON object mapping each clause id to its summary:
+```json
+{{
+  "0": "summary of clause 0",
+  "1": "summary of clause 1"
+}}
+```
 """
\ No newline at end of file
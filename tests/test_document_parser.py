@@ -0,0 +1,72 @@
+import os
+import zipfile
+
+from utils import document_parser
+from utils.document_parser import identify_clauses_regex, extract_text_from_docx
+
+
+def test_numbered_headings_become_clauses():
+    text = (
+        "1. Payment Terms. The Customer must pay each invoice within 30 days. "
+        "2. Termination. Either party may terminate on 60 days written notice"
+    )
+    assert identify_clauses_regex(text) == {
+        "1. Payment Terms": "The Customer must pay each invoice within 30 days.",
+        "2. Termination": "Either party may terminate on 60 days written notice"
+    }
+
+
+def test_all_caps_headings_become_clauses():
+    text = "CONFIDENTIALITY: Each party keeps the other's information secret\nGOVERNING LAW: New South Wales"
+    clauses = identify_clauses_regex(text)
+    assert clauses["CONFIDENTIALITY"] == "Each party keeps the other's information secret"
+    assert clauses["GOVERNING LAW"] == "New South Wales"
+
+
+def test_paragraph_fallback_keeps_substantive_paragraphs():
+    text = (
+        "this agreement is made between the supplier and the customer on the date below\n\n"
+        "short\n\n"
+        "the supplier will provide the services described in the schedule with due care and skill"
+    )
+    assert identify_clauses_regex(text) == {
+        "Paragraph 1": "this agreement is made between the supplier and the customer on the date below",
+        "Paragraph 3": "the supplier will provide the services described in the schedule with due care and skill"
+    }
+
+
+def test_text_without_clauses_gives_no_clauses():
+    assert identify_clauses_regex("too short") == {}
+
+
+def test_docx_tabs_and_breaks_separate_words(tmp_path):
+    document_xml = (
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+        '<w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs></w:pPr>'
+        '<w:r><w:t>Term</w:t><w:tab/><w:t>Renewal</w:t><w:br/><w:t>Notice</w:t><w:cr/><w:t>Period</w:t></w:r></w:p>'
+        '</w:body></w:document>'
+    )
+    docx_path = tmp_path / "contract.docx"
+    with zipfile.ZipFile(docx_path, "w") as archive:
+        archive.writestr("word/document.xml", document_xml)
+
+    assert extract_text_from_docx(str(docx_path)) == "Term Renewal Notice Period"
+
+
+def test_text_cache_is_versioned_and_pruned(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    monkeypatch.setattr(document_parser, "TEXT_CACHE_DIR", str(cache_dir))
+    old_entry = cache_dir / "0123.txt.txt"
+    old_entry.write_text("text from an old extractor")
+    stale_entry = cache_dir / f"4567.txt.v{document_parser.EXTRACTOR_VERSION}.txt"
+    stale_entry.write_text("text nobody has read in months")
+    os.utime(stale_entry, (0, 0))
+
+    contract = tmp_path / "contract.txt"
+    contract.write_text("The Supplier may terminate this Agreement.")
+    assert document_parser.extract_text_from_document(str(contract)) == "The Supplier may terminate this Agreement."
+
+    cached = sorted(path.name for path in cache_dir.iterdir())
+    assert len(cached) == 1
+    assert cached[0].endswith(f".txt.v{document_parser.EXTRACTOR_VERSION}.txt")
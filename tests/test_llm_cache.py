@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from utils import llm_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_db(tmp_path, monkeypatch):
+    """Point the cache at a fresh database for each test"""
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(llm_cache, "CACHE_DB_PATH", str(tmp_path / "llm_cache.sqlite3"))
+    monkeypatch.setattr(llm_cache, "_local", threading.local())
+
+
+def test_make_cache_key_is_stable():
+    key = llm_cache.make_cache_key("summary", "The Supplier may terminate this Agreement.")
+    assert key == llm_cache.make_cache_key("summary", "The Supplier may terminate this Agreement.")
+    assert key == "4a5806919e8b6eb12667a37fa2db6c33"
+
+
+def test_make_cache_key_separates_namespace_and_text():
+    key = llm_cache.make_cache_key("summary", "text")
+    assert key != llm_cache.make_cache_key("risks", "text")
+    assert key != llm_cache.make_cache_key("summary", "text ")
+    # The separator stops the namespace running into the text
+    assert llm_cache.make_cache_key("ab", "c") != llm_cache.make_cache_key("a", "bc")
+
+
+def test_cache_namespace_depends_on_every_part():
+    namespace = llm_cache.cache_namespace("summary", "gpt-4o-mini", "prompt")
+    assert namespace.startswith("summary:")
+    assert namespace == llm_cache.cache_namespace("summary", "gpt-4o-mini", "prompt")
+    assert namespace != llm_cache.cache_namespace("summary", "gpt-4o-mini", "edited prompt")
+    assert namespace != llm_cache.cache_namespace("summary", "gpt-4o", "prompt")
+
+
+def test_store_and_get_result_round_trip():
+    key = llm_cache.make_cache_key("risks", "clause")
+    value = {"simple_risks": ["risk"], "detailed_risks": [{"explanation": "risk"}]}
+    llm_cache.store_result(key, value)
+    assert llm_cache.get_cached_result(key) == value
+    assert llm_cache.get_cached_result(llm_cache.make_cache_key("risks", "other clause")) is None
+
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    now = 1_700_000_000.0
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now)
+    llm_cache.store_result("result-key", "summary", ttl=60)
+    llm_cache.store_bytes("bytes-key", b"\x00\x01", ttl=60)
+
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now + 59)
+    assert llm_cache.get_cached_result("result-key") == "summary"
+    assert llm_cache.get_cached_bytes("bytes-key") == b"\x00\x01"
+
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now + 61)
+    assert llm_cache.get_cached_result("result-key") is None
+    assert llm_cache.get_cached_bytes("bytes-key") is None
+
+
+def test_expired_entries_are_deleted(monkeypatch):
+    now = 1_700_000_000.0
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now)
+    monkeypatch.setattr(llm_cache, "PURGE_EVERY_WRITES", 1)
+    llm_cache.store_result("short-key", "summary", ttl=60)
+    llm_cache.store_result("long-key", "summary", ttl=600)
+
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now + 61)
+    llm_cache.store_result("new-key", "summary")
+    keys = {row[0] for row in llm_cache._connection().execute("SELECT key FROM cache")}
+    assert keys == {"long-key", "new-key"}
+
+
+def test_raw_values_evict_least_recently_used(monkeypatch):
+    clock = iter(range(1_700_000_000, 1_700_000_100))
+    monkeypatch.setattr(llm_cache.time, "time", lambda: float(next(clock)))
+    monkeypatch.setattr(llm_cache, "PURGE_EVERY_WRITES", 1)
+    monkeypatch.setattr(llm_cache, "MAX_BYTES_ENTRIES", 2)
+    llm_cache.store_bytes("first", b"\x01")
+    llm_cache.store_bytes("second", b"\x02")
+    assert llm_cache.get_cached_bytes("first") == b"\x01"
+
+    llm_cache.store_bytes("third", b"\x03")
+    assert llm_cache.get_cached_bytes("second") is None
+    assert llm_cache.get_cached_bytes("first") == b"\x01"
+    assert llm_cache.get_cached_bytes("third") == b"\x03"
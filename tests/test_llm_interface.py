@@ -0,0 +1,62 @@
+import pytest
+
+from utils.llm_interface import _request_cache_key, _parse_risk_response, _summary_fits_clause, _process_lru, _join_overlapping
+
+REQUEST = {
+    "model": "gpt-4o-mini",
+    "messages": [{"role": "user", "content": "Summarize this clause"}],
+    "temperature": 0.7,
+    "max_tokens": 220
+}
+
+
+def test_request_cache_key_is_stable_and_order_independent():
+    assert _request_cache_key(REQUEST) == _request_cache_key(dict(REQUEST))
+    assert _request_cache_key(REQUEST) == _request_cache_key(dict(reversed(list(REQUEST.items()))))
+
+
+def test_request_cache_key_covers_every_argument():
+    key = _request_cache_key(REQUEST)
+    assert key != _request_cache_key({**REQUEST, "model": "gpt-4o"})
+    assert key != _request_cache_key({**REQUEST, "temperature": 0.2})
+    assert key != _request_cache_key({**REQUEST, "stop": ["\n\n\n"]})
+    assert key != _request_cache_key({**REQUEST, "response_format": {"type": "json_object"}})
+
+
+@pytest.mark.parametrize("response_text", [
+    '{"risks": [{"problematic_text": "may terminate at any time", "expl',
+    '```json\n{"risks": [{"problematic_text": "may terminate',
+])
+def test_cut_off_json_risk_response_is_not_shown_as_a_risk(response_text):
+    assert _parse_risk_response(response_text) == ([], [])
+
+
+def test_semantic_summary_hits_must_match_the_clause_figures():
+    summary = "Either party can end the agreement on 30 days' notice and must pay $1,000."
+    assert _summary_fits_clause(summary, "Thirty (30) days written notice and a fee of $1,000.00 apply.")
+    assert not _summary_fits_clause(summary, "Sixty (60) days written notice and a fee of $1,000.00 apply.")
+    assert _summary_fits_clause("This clause sets out the governing law.", "Governed by the laws of NSW.")
+
+
+def test_process_lru_returns_a_copy_of_cached_results():
+    calls = []
+
+    def find_risks(clause_text):
+        calls.append(clause_text)
+        return [{"explanation": "risk"}]
+
+    cached_find_risks = _process_lru(find_risks)
+    cached_find_risks("clause").append({"explanation": "added by a caller"})
+    cached_find_risks("clause")[0]["explanation"] = "edited by a caller"
+    assert cached_find_risks("clause") == [{"explanation": "risk"}]
+    assert calls == ["clause"]
+
+
+def test_join_overlapping_drops_the_repeated_passage():
+    first = "The Supplier indemnifies the Customer against all claims arising from"
+    second = "against all claims arising from negligence or wilful misconduct."
+    assert _join_overlapping(first, second) == (
+        "The Supplier indemnifies the Customer against all claims arising from negligence or wilful misconduct."
+    )
+    assert _join_overlapping(first, "all claims") == first
+    assert _join_overlapping("Payment is due on the", "end of the month.") == "Payment is due on the\nend of the month."
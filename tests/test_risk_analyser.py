@@ -0,0 +1,93 @@
+import random
+import re
+
+import pytest
+
+from utils.risk_analyser import extract_notice_periods, extract_percentage_fees
+
+
+def _notice_periods_four_patterns(text):
+    """The four-pass implementation the fused regex replaced"""
+    patterns = [
+        r'(\d+)\s*(?:calendar|business)?\s*days[\'\s]*notice',
+        r'notice\s*(?:period|)\s*(?:of|)\s*(\d+)\s*(?:calendar|business)?\s*days',
+        r'(\d+)\s*(?:calendar|business)?\s*days[\'\s]*(?:written|advance|prior)\s*notice',
+        r'(\d+)\s*(?:calendar|business)?\s*days[\'\s]*(?:before|prior)'
+    ]
+    return [int(match) for pattern in patterns for match in re.findall(pattern, text, re.IGNORECASE)]
+
+
+def _percentage_fees_two_patterns(text):
+    """The two-pass implementation the fused regex replaced"""
+    patterns = [
+        r'(\d+(?:\.\d+)?)\s*%\s*(?:fee|charge|penalty|interest)',
+        r'(?:fee|charge|penalty|interest)\s*(?:of|is|at)\s*(\d+(?:\.\d+)?)\s*%'
+    ]
+    return [float(match) for pattern in patterns for match in re.findall(pattern, text, re.IGNORECASE)]
+
+
+CLAUSES = [
+    "Either party may terminate this Agreement by giving 30 days written notice.",
+    "The Supplier may terminate on 7 business days' notice; the Customer must give a notice period of 90 days.",
+    "Notice of 14 calendar days is required, and renewal requires 60 days prior notice.",
+    "Invoices must be paid 10 days before the due date. 5 days notice 10 days before.",
+    "A late payment fee of 15% applies, plus 2.5% interest per month.",
+    "The penalty is 20% of the outstanding amount; a charge at 1.75% applies to refunds.",
+    "No notice periods or fees appear in this clause.",
+]
+
+_FRAGMENTS = [
+    "30", "7", "120", "2.5", "15", " ", "  ", "\n", "'", "days", "Days", "calendar", "business",
+    "notice", "NOTICE", "period", "of", "written", "advance", "prior", "before", "%", "fee",
+    "charge", "penalty", "interest", "is", "at", ".", "the Supplier",
+]
+
+
+def _random_clauses(count, seed=0):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(_FRAGMENTS) + rng.choice(["", " "]) for _ in range(rng.randint(3, 25)))
+            for _ in range(count)]
+
+
+@pytest.mark.parametrize("text", CLAUSES)
+def test_notice_periods_match_the_four_pattern_implementation(text):
+    # A period found by several of the old patterns is now listed once
+    assert set(extract_notice_periods(text)) == set(_notice_periods_four_patterns(text))
+
+
+@pytest.mark.parametrize("text", CLAUSES)
+def test_percentage_fees_match_the_two_pattern_implementation(text):
+    assert set(extract_percentage_fees(text)) == set(_percentage_fees_two_patterns(text))
+
+
+# Numbers with several decimal points, e.g. 12.51.5%, are the one known difference
+_MALFORMED_NUMBER_RE = re.compile(r'\d\.\d+\.\d')
+
+
+def test_extractors_match_the_old_implementations_on_random_clauses():
+    for text in _random_clauses(5000):
+        if _MALFORMED_NUMBER_RE.search(text):
+            continue
+        assert set(extract_notice_periods(text)) == set(_notice_periods_four_patterns(text)), text
+        assert set(extract_percentage_fees(text)) == set(_percentage_fees_two_patterns(text)), text
+
+
+# Values come back once per place a pattern matches, in text order, where the
+# old implementations listed them pattern by pattern with repeats
+EXPECTED = [
+    ([30], []),
+    ([7, 90], []),
+    ([14, 60], []),
+    ([10, 5, 10, 10], []),
+    ([], [15.0, 2.5]),
+    ([], [20.0, 1.75]),
+    ([], []),
+]
+
+
+@pytest.mark.parametrize("text, notice_periods, percentage_fees", [
+    (text, *expected) for text, expected in zip(CLAUSES, EXPECTED)
+])
+def test_extractors_return_exact_values_in_text_order(text, notice_periods, percentage_fees):
+    assert extract_notice_periods(text) == notice_periods
+    assert extract_percentage_fees(text) == percentage_fees
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from utils.risk_schema import parse_risks, DEFAULT_LEGAL_REFERENCE, DEFAULT_SEVERITY
+from utils.llm_interface import _extract_json_block
+
+RISK = {
+    "problematic_text": "may terminate at any time",
+    "explanation": "One-sided termination right",
+    "legal_reference": "ACL s25(1)(a)",
+    "severity": "high"
+}
+
+
+def test_parse_risks_accepts_wrapped_object_and_bare_array():
+    assert parse_risks('{"risks": [%s]}' % json.dumps(RISK)) == [RISK]
+    assert parse_risks('[%s]' % json.dumps(RISK)) == [RISK]
+    assert parse_risks('{"risks": []}') == []
+
+
+def test_parse_risks_fills_in_missing_and_null_fields():
+    risks = parse_risks('[{"explanation": "Vague", "severity": null, "legal_reference": null}]')
+    assert risks == [{
+        "problematic_text": "",
+        "explanation": "Vague",
+        "legal_reference": DEFAULT_LEGAL_REFERENCE,
+        "severity": DEFAULT_SEVERITY
+    }]
+
+
+@pytest.mark.parametrize("json_str", [
+    "not json",
+    '{"risks": [{"severity": "high"}]}',  # explanation is required
+    '{"risks": "none"}',
+    '[{"explanation": "Unclosed"}',
+])
+def test_parse_risks_rejects_invalid_responses(json_str):
+    with pytest.raises(ValidationError):
+        parse_risks(json_str)
+
+
+def test_parse_risks_reads_fenced_json_once_the_fence_is_stripped():
+    response = 'Here are the risks:\n```json\n{"risks": [%s]}\n```\nLet me know.' % json.dumps(RISK)
+    with pytest.raises(ValidationError):
+        parse_risks(response)
+    assert parse_risks(_extract_json_block(response)) == [RISK]
+    assert parse_risks(_extract_json_block('```\n[%s]\n```' % json.dumps(RISK))) == [RISK]
@@ -2,10 +2,20 @@
 Provides Australian-specific legal references and resources for contract analysis.
 """
 
-from typing import Dict, List, Tuple
+import sys
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple
+
+def freeze(value: Any) -> Any:
+    """Recursively convert a nested dict or list into read-only mappings and tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({sys.intern(key): freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
 
 # Major Australian legislation relevant to contracts
-RELEVANT_LEGISLATION = {
+RELEVANT_LEGISLATION = freeze({
     "acl": {
         "name": "Australian Consumer Law",
         "description": "Schedule 2 of the Competition and Consumer Act 2010 (Cth), which provides consumer protections including unfair contract terms provisions.",
@@ -30,10 +40,10 @@ RELEVANT_LEGISLATION = {
         "url": "https://www.legislation.gov.au/Details/C2022C00176",
         "relevant_sections": {}
     }
-}
+})
 
 # Major regulatory bodies
-REGULATORY_BODIES = {
+REGULATORY_BODIES = freeze({
     "accc": {
         "name": "Australian Competition and Consumer Commission (ACCC)",
         "description": "Promotes competition, fair trading, and regulates national infrastructure services.",
@@ -57,10 +67,10 @@ REGULATORY_BODIES = {
             "privacy": "https://www.oaic.gov.au/privacy/your-privacy-rights"
         }
     }
-}
+})
 
 # Recent landmark legal cases related to contract law in Australia
-LANDMARK_CASES = {
+LANDMARK_CASES = freeze({
     "accc_v_bytescard": {
         "name": "ACCC v Chrisco Hampers Australia Ltd [2015] FCA 1204",
         "description": "The Federal Court found that a 'HeadStart' term in Chrisco's hamper contracts was unfair under the ACL. The term allowed Chrisco to continue taking payments after customers had fully paid for their hampers, unless they opted out.",
@@ -76,10 +86,10 @@ LANDMARK_CASES = {
         "description": "The Federal Court found Jetstar had made false or misleading representations about consumer guarantee rights under the ACL in relation to flight bookings.",
         "url": "https://www.judgments.fedcourt.gov.au/judgments/Judgments/fca/single/2017/2017fca0205"
     }
-}
+})
 
 # Common unfair terms in Australian contracts with explanations
-UNFAIR_TERMS_EXPLANATIONS = {
+UNFAIR_TERMS_EXPLANATIONS = freeze({
     "unilateral_variation": {
         "description": "Terms that allow one party to vary the contract without consent from the other party",
         "example": "The provider may modify any of the terms and conditions of this agreement at any time without prior notice.",
@@ -122,10 +132,10 @@ UNFAIR_TERMS_EXPLANATIONS = {
         "explanation": "Automatic renewal clauses with inadequate notice or difficult cancellation processes may be considered unfair, particularly for small businesses.",
         "risk_level": "Medium"
     }
-}
+})
 
 # Special considerations for specific contract types
-CONTRACT_TYPE_GUIDANCE = {
+CONTRACT_TYPE_GUIDANCE = freeze({
     "lease": {
         "name": "Commercial Lease Agreements",
         "key_legislation": "Retail Leases Act (varies by state/territory)",
@@ -166,30 +176,34 @@ CONTRACT_TYPE_GUIDANCE = {
         ],
         "resources": "https://business.gov.au/planning/protecting-your-ideas/non-disclosure-agreements"
     }
-}
+})
+
+# Empty result returned by the lookup helpers for unknown keys
+_EMPTY = MappingProxyType({})
+
+# Precomputed for get_acl_section_description
+_ACL_SECTIONS = RELEVANT_LEGISLATION["acl"]["relevant_sections"]
 
-def get_legislation_details(legislation_key: str) -> Dict:
+def get_legislation_details(legislation_key: str) -> Mapping:
     """Get details about specific Australian legislation"""
-    return RELEVANT_LEGISLATION.get(legislation_key, {})
+    return RELEVANT_LEGISLATION.get(legislation_key, _EMPTY)
 
-def get_regulatory_body_info(body_key: str) -> Dict:
+def get_regulatory_body_info(body_key: str) -> Mapping:
     """Get information about a specific Australian regulatory body"""
-    return REGULATORY_BODIES.get(body_key, {})
+    return REGULATORY_BODIES.get(body_key, _EMPTY)
 
-def get_unfair_term_explanation(term_type: str) -> Dict:
+def get_unfair_term_explanation(term_type: str) -> Mapping:
     """Get explanation and examples for a specific type of unfair term"""
-    return UNFAIR_TERMS_EXPLANATIONS.get(term_type, {})
+    return UNFAIR_TERMS_EXPLANATIONS.get(term_type, _EMPTY)
 
-def get_contract_type_guidance(contract_type: str) -> Dict:
+def get_contract_type_guidance(contract_type: str) -> Mapping:
     """Get specific guidance for a type of contract"""
-    return CONTRACT_TYPE_GUIDANCE.get(contract_type, {})
+    return CONTRACT_TYPE_GUIDANCE.get(contract_type, _EMPTY)
 
-def get_relevant_case(case_key: str) -> Dict:
+def get_relevant_case(case_key: str) -> Mapping:
     """Get information about a specific landmark case"""
-    return LANDMARK_CASES.get(case_key, {})
+    return LANDMARK_CASES.get(case_key, _EMPTY)
 
 def get_acl_section_description(section_number: str) -> str:
     """Get description of a specific section of the Australian Consumer Law"""
-    acl = RELEVANT_LEGISLATION.get("acl", {})
-    sections = acl.get("relevant_sections", {})
-    return sections.get(section_number, "Section description not available")
\ No newline at end of file
+    return _ACL_SECTIONS.get(section_number, "Section description not available")
\ No newline at end of file
@@ -1,8 +1,33 @@
 import os
 import re
-import docx
+import time
+import hashlib
+import tempfile
+import zipfile
 import PyPDF2
-from typing import Dict, List, Tuple
+import charset_normalizer
+import numpy as np
+from dataclasses import dataclass, field
+from lxml import etree
+from typing import Dict, Iterator, List, Tuple
+from config import TEXT_CACHE_DIR
+
+# Bump when extraction changes, so text extracted by the old code isn't reused
+EXTRACTOR_VERSION = 2
+
+# Cached text is dropped once unused for this long, and the least recently
+# used entries go first once the cache grows past TEXT_CACHE_MAX_BYTES
+TEXT_CACHE_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+TEXT_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# WordprocessingML element names used when reading DOCX files
+_DOCX_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_DOCX_PARAGRAPH = f'{_DOCX_NAMESPACE}p'
+_DOCX_TEXT = f'{_DOCX_NAMESPACE}t'
+_DOCX_RUN = f'{_DOCX_NAMESPACE}r'
+_DOCX_TAB = f'{_DOCX_NAMESPACE}tab'
+_DOCX_BREAK = f'{_DOCX_NAMESPACE}br'
+_DOCX_CARRIAGE_RETURN = f'{_DOCX_NAMESPACE}cr'
 
 def extract_text_from_document(file_path: str) -> str:
     """
@@ -15,7 +40,64 @@ def extract_text_from_document(file_path: str) -> str:
         Extracted text content as a string
     """
     file_extension = os.path.splitext(file_path)[1].lower()
+    if file_extension not in ('.pdf', '.docx', '.txt'):
+        raise ValueError(f"Unsupported file format: {file_extension}")
+    
+    # Re-uploads of the same file reuse the text extracted last time
+    with open(file_path, 'rb') as file:
+        digest = hashlib.file_digest(file, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+    cache_path = os.path.join(TEXT_CACHE_DIR, f"{digest}{file_extension}.v{EXTRACTOR_VERSION}.txt")
     
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as cached_file:
+            text = cached_file.read()
+        # Mark the entry as recently used for _prune_text_cache
+        os.utime(cache_path)
+        return text
+    except FileNotFoundError:
+        pass
+    
+    text = _extract_text_by_format(file_path, file_extension)
+    
+    try:
+        os.makedirs(TEXT_CACHE_DIR, exist_ok=True)
+        # Write to a temp file first so concurrent readers never see a partial entry
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=TEXT_CACHE_DIR, delete=False) as tmp_file:
+            tmp_file.write(text)
+        os.replace(tmp_file.name, cache_path)
+        _prune_text_cache()
+    except OSError:
+        # Caching is best effort; the extracted text is still valid
+        pass
+    
+    return text
+
+def _prune_text_cache() -> None:
+    """Delete cached text that is stale, from an old extractor, or beyond the size limit"""
+    entries = []
+    with os.scandir(TEXT_CACHE_DIR) as directory:
+        for entry in directory:
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path, entry.name))
+    
+    # Newest first, so the size limit evicts the least recently used
+    entries.sort(reverse=True)
+    cutoff = time.time() - TEXT_CACHE_MAX_AGE_SECONDS
+    current_suffix = f".v{EXTRACTOR_VERSION}.txt"
+    total_bytes = 0
+    for mtime, size, path, name in entries:
+        total_bytes += size
+        # Temp files still being written by other processes only expire with age
+        is_outdated = name.endswith('.txt') and not name.endswith(current_suffix)
+        if mtime < cutoff or total_bytes > TEXT_CACHE_MAX_BYTES or is_outdated:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def _extract_text_by_format(file_path: str, file_extension: str) -> str:
+    """Run the extractor for a supported file extension"""
     if file_extension == '.pdf':
         return extract_text_from_pdf(file_path)
     elif file_extension == '.docx':
@@ -43,37 +125,55 @@ def extract_text_from_pdf(file_path: str) -> str:
 
 def extract_text_from_docx(file_path: str) -> str:
     """Extract text from DOCX file"""
-    text = ""
+    paragraphs = []
     
     try:
-        doc = docx.Document(file_path)
-        
-        for para in doc.paragraphs:
-            text += para.text + "\n"
-            
-        # Also extract text from tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    text += cell.text + " "
-                text += "\n"
+        # Stream word/document.xml directly rather than building python-docx
+        # objects for every paragraph, row and cell. Table cells contain
+        # ordinary paragraphs, so their text is picked up in document order
+        with zipfile.ZipFile(file_path) as archive:
+            with archive.open('word/document.xml') as document_xml:
+                for _, paragraph in etree.iterparse(document_xml, events=('end',), tag=_DOCX_PARAGRAPH):
+                    paragraphs.append(_docx_paragraph_text(paragraph))
+                    # Free the paragraph once read so memory stays flat on large documents
+                    paragraph.clear()
     except Exception as e:
         raise Exception(f"Error extracting text from DOCX: {str(e)}")
     
-    return clean_extracted_text(text)
+    return clean_extracted_text('\n'.join(paragraphs))
+
+def _docx_paragraph_text(paragraph: etree._Element) -> str:
+    """Join a DOCX paragraph's text, keeping tabs and line breaks so the words either side stay apart"""
+    parts = []
+    for element in paragraph.iter(_DOCX_TEXT, _DOCX_TAB, _DOCX_BREAK, _DOCX_CARRIAGE_RETURN):
+        if element.tag == _DOCX_TEXT:
+            parts.append(element.text or '')
+        elif element.getparent().tag != _DOCX_RUN:
+            # Tab stop definitions in the paragraph properties aren't content
+            continue
+        elif element.tag == _DOCX_TAB:
+            parts.append('\t')
+        else:
+            parts.append('\n')
+    return ''.join(parts)
 
 def extract_text_from_txt(file_path: str) -> str:
     """Extract text from TXT file"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            text = file.read()
-    except UnicodeDecodeError:
-        # Try with a different encoding if UTF-8 fails
-        with open(file_path, 'r', encoding='latin-1') as file:
-            text = file.read()
+        # Read the file once and decode in memory
+        with open(file_path, 'rb') as file:
+            raw = file.read()
     except Exception as e:
         raise Exception(f"Error extracting text from TXT: {str(e)}")
     
+    try:
+        text = raw.decode('utf-8')
+    except UnicodeDecodeError:
+        # Detect the encoding if UTF-8 fails, falling back to latin-1
+        best_match = charset_normalizer.from_bytes(raw).best()
+        encoding = best_match.encoding if best_match else 'latin-1'
+        text = raw.decode(encoding, errors='replace')
+    
     return clean_extracted_text(text)
 
 def clean_extracted_text(text: str) -> str:
@@ -97,6 +197,49 @@ def clean_extracted_text(text: str) -> str:
     
     return '\n'.join(cleaned_lines)
 
+# Heading patterns for the regex clause fallback. Each heading runs up to the
+# first '.' or ':' and its content runs up to the next heading of the same kind
+_CLAUSE_HEADING_PATTERNS = [
+    re.compile(r'(\d+\.\s*[A-Z][^\.]+)(?:\.|:)'),  # 1. Title: Content
+    re.compile(r'([A-Z][A-Z\s]+)(?:\.|:)'),  # ALL CAPS TITLE: Content
+    re.compile(r'((?:Article|Section|Clause)\s+\d+[^\.]+)(?:\.|:)')  # Article 1 - Title: Content
+]
+
+@dataclass
+class Clauses:
+    """
+    Clause titles and contents stored as parallel lists, so per-clause
+    statistics can be computed over whole columns at once
+    """
+    titles: List[str] = field(default_factory=list)
+    contents: List[str] = field(default_factory=list)
+    _positions: Dict[str, int] = field(default_factory=dict, repr=False)
+    
+    def __setitem__(self, title: str, content: str) -> None:
+        # A repeated title replaces the earlier content, matching dict semantics
+        position = self._positions.get(title)
+        if position is None:
+            self._positions[title] = len(self.titles)
+            self.titles.append(title)
+            self.contents.append(content)
+        else:
+            self.contents[position] = content
+    
+    def __len__(self) -> int:
+        return len(self.titles)
+    
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """Iterate over (title, content) pairs in document order"""
+        return zip(self.titles, self.contents)
+    
+    def lengths(self) -> np.ndarray:
+        """Character length of every clause"""
+        return np.fromiter(map(len, self.contents), dtype=np.int32, count=len(self.contents))
+    
+    def to_dict(self) -> Dict[str, str]:
+        """Convert to the title -> content dictionary used by the rest of the app"""
+        return dict(zip(self.titles, self.contents))
+
 def identify_clauses_regex(text: str) -> Dict[str, str]:
     """
     Attempt to identify contract clauses using regex patterns
@@ -108,23 +251,31 @@ def identify_clauses_regex(text: str) -> Dict[str, str]:
     Returns:
         Dictionary of clause titles and their content
     """
-    # Common patterns for clause numbering
-    patterns = [
-        r'(\d+\.\s*[A-Z][^\.]+)(?:\.|:)(.*?)(?=\d+\.\s*[A-Z][^\.]+(?:\.|:)|$)', # 1. Title: Content
-        r'([A-Z][A-Z\s]+)(?:\.|:)(.*?)(?=[A-Z][A-Z\s]+(?:\.|:)|$)',  # ALL CAPS TITLE: Content
-        r'((?:Article|Section|Clause)\s+\d+[^\.]+)(?:\.|:)(.*?)(?=(?:Article|Section|Clause)\s+\d+[^\.]+(?:\.|:)|$)'  # Article 1 - Title: Content
-    ]
-    
-    clauses = {}
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, text, re.DOTALL)
-        if matches:
-            for title, content in matches:
-                clean_title = title.strip()
-                clean_content = content.strip()
-                if clean_title and clean_content:
-                    clauses[clean_title] = clean_content
+    return identify_clause_columns(text).to_dict()
+
+def identify_clause_columns(text: str) -> Clauses:
+    """
+    Identify contract clauses using regex patterns, keeping titles and
+    contents in parallel lists
+    
+    Args:
+        text: The contract text
+        
+    Returns:
+        Clauses with titles and contents in document order
+    """
+    clauses = Clauses()
+    
+    for heading_pattern in _CLAUSE_HEADING_PATTERNS:
+        # Scan for headings once and slice the content between consecutive
+        # headings, rather than re-testing for a heading at every character
+        headings = list(heading_pattern.finditer(text))
+        for i, heading in enumerate(headings):
+            content_end = headings[i + 1].start() if i + 1 < len(headings) else len(text)
+            clean_title = heading.group(1).strip()
+            clean_content = text[heading.end():content_end].strip()
+            if clean_title and clean_content:
+                clauses[clean_title] = clean_content
     
     # If we couldn't find clauses with regex, use a simple paragraph-based approach
     if not clauses:
@@ -0,0 +1,214 @@
+"""
+Persistent cache for clause-level LLM results.
+
+Boilerplate clauses (limitation of liability, confidentiality, governing law)
+recur across contracts almost word for word, so results are stored on disk
+under a hash of the clause text and reused instead of re-querying the LLM.
+
+Entries live in a single SQLite database in WAL mode, so concurrent readers
+and the writer never block each other, and each entry expires after a TTL.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import itertools
+import threading
+from typing import Any, Optional
+
+from config import LLM_CACHE_DIR
+
+# orjson reads and writes cache entries several times faster than the stdlib
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = lambda value: json.dumps(value).encode('utf-8')
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate every entry, e.g. after changing how responses are parsed
+CACHE_VERSION = "v1"
+
+# Entries older than this are treated as misses
+CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+CACHE_DB_PATH = os.path.join(LLM_CACHE_DIR, "llm_cache.sqlite3")
+
+# Expired entries are deleted when a connection opens and then every this many writes
+PURGE_EVERY_WRITES = 500
+
+# Raw values such as embeddings are kept to this many entries, least recently used evicted first
+MAX_BYTES_ENTRIES = 20000
+
+_write_count = itertools.count(1)
+
+# sqlite3 connections can't be shared between threads, so each thread opens its own
+_local = threading.local()
+
+def cache_namespace(name: str, *parts: str) -> str:
+    """
+    Build a versioned cache namespace from everything that shapes a result
+
+    Folding the model and prompt templates into the namespace means editing
+    a prompt or switching models starts a fresh set of entries instead of
+    serving results generated under the old ones.
+
+    Args:
+        name: Name of the analysis, e.g. "summary"
+        *parts: Model names, prompt templates and anything else the result depends on
+
+    Returns:
+        Namespace for make_cache_key
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for part in (CACHE_VERSION, *parts):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\x00')
+    return f"{name}:{digest.hexdigest()}"
+
+def make_cache_key(namespace: str, text: str) -> str:
+    """
+    Build a cache key from a namespace (e.g. "summary", "risks") and the clause text
+
+    Args:
+        namespace: Name of the analysis the result belongs to
+        text: Clause text the result was generated from
+
+    Returns:
+        Hex digest identifying the cached result
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(namespace.encode('utf-8'))
+    digest.update(b'\x00')
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+def _connection() -> sqlite3.Connection:
+    """Get this thread's connection to the cache database, creating the database if needed"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(LLM_CACHE_DIR, exist_ok=True)
+        conn = sqlite3.connect(CACHE_DB_PATH, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS bytes_cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS bytes_cache_last_used ON bytes_cache (last_used)")
+        _purge(conn)
+        _local.conn = conn
+    return conn
+
+def _purge(conn: sqlite3.Connection) -> None:
+    """Delete expired entries and the least recently used raw values beyond MAX_BYTES_ENTRIES"""
+    now = time.time()
+    conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+    conn.execute("DELETE FROM bytes_cache WHERE expires_at <= ?", (now,))
+    conn.execute(
+        "DELETE FROM bytes_cache WHERE key IN ("
+        "SELECT key FROM bytes_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+        (MAX_BYTES_ENTRIES,)
+    )
+
+def _count_write(conn: sqlite3.Connection) -> None:
+    """Purge the cache every PURGE_EVERY_WRITES writes"""
+    if next(_write_count) % PURGE_EVERY_WRITES == 0:
+        _purge(conn)
+
+def get_cached_result(key: str) -> Optional[Any]:
+    """
+    Look up a cached LLM result
+
+    Args:
+        key: Cache key from make_cache_key
+
+    Returns:
+        The cached value, or None if there is no usable entry
+    """
+    try:
+        row = _connection().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return _json_loads(row[0]) if row is not None else None
+    except (OSError, sqlite3.Error, ValueError) as e:
+        logger.warning(f"Ignoring unreadable LLM cache entry {key}: {str(e)}")
+        return None
+
+def store_result(key: str, value: Any, ttl: float = CACHE_TTL_SECONDS) -> None:
+    """
+    Store an LLM result in the cache
+
+    Args:
+        key: Cache key from make_cache_key
+        value: JSON-serialisable result to store
+        ttl: Seconds until the entry expires
+    """
+    try:
+        data = _json_dumps(value)
+        conn = _connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, data, time.time() + ttl)
+        )
+        _count_write(conn)
+    except (OSError, sqlite3.Error, TypeError) as e:
+        logger.warning(f"Could not write LLM cache entry {key}: {str(e)}")
+
+def get_cached_bytes(key: str) -> Optional[bytes]:
+    """
+    Look up a raw cached value, e.g. an embedding stored as float32 bytes
+
+    Args:
+        key: Cache key from make_cache_key
+
+    Returns:
+        The stored bytes, or None if there is no usable entry
+    """
+    try:
+        conn = _connection()
+        now = time.time()
+        row = conn.execute(
+            "SELECT value FROM bytes_cache WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE bytes_cache SET last_used = ? WHERE key = ?", (now, key))
+        return row[0]
+    except sqlite3.Error as e:
+        logger.warning(f"Ignoring unreadable LLM cache entry {key}: {str(e)}")
+        return None
+
+def store_bytes(key: str, data: bytes, ttl: float = CACHE_TTL_SECONDS) -> None:
+    """
+    Store a raw value in the cache without JSON encoding
+
+    Raw values are kept to MAX_BYTES_ENTRIES entries, evicting the least
+    recently used first, since embeddings are far larger than text results.
+
+    Args:
+        key: Cache key from make_cache_key
+        data: Bytes to store
+        ttl: Seconds until the entry expires
+    """
+    try:
+        conn = _connection()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO bytes_cache (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)",
+            (key, data, now + ttl, now)
+        )
+        _count_write(conn)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Could not write LLM cache entry {key}: {str(e)}")
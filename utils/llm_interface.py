@@ -1,19 +1,45 @@
 import os
+import copy
 import json
-import time
+import asyncio
+import weakref
+import threading
+import concurrent.futures
+from types import MappingProxyType
+from collections import OrderedDict
 import hashlib
+import functools
 import re
-from typing import Dict, List, Any, Optional, Tuple
-from openai import OpenAI
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Set, Tuple, Iterator, Callable, Awaitable
+from tenacity import retry, stop_after_attempt, wait_random_exponential, retry_if_exception
 from prompts.extraction_prompt import EXTRACTION_PROMPT
-from prompts.summary_prompt import SUMMARY_PROMPT
-from prompts.risk_prompt import RISK_PROMPT
+from prompts.summary_prompt import SUMMARY_PROMPT, BULK_SUMMARY_PROMPT
+from prompts.risk_prompt import RISK_PROMPT, BULK_RISK_PROMPT
+from utils.llm_cache import cache_namespace, make_cache_key, get_cached_result, store_result, get_cached_bytes, store_bytes
+from utils.document_parser import identify_clauses_regex
+from utils.risk_schema import parse_risks, validate_risk_list, RISK_RESPONSE_FORMAT
+from config import DEBUG, DEBUG_LOG_PATH
+from utils.precomputed_cache import get_precomputed_summary, get_precomputed_risks, has_precomputed, warmup
 from dotenv import load_dotenv
-import streamlit as st
 import logging
+from logging.handlers import RotatingFileHandler, MemoryHandler
+
+# openai, httpx, numpy, faiss and streamlit are imported where they are used,
+# so MOCK_MODE, the batch path and scripts don't pay for loading them
+if TYPE_CHECKING:
+    import numpy as np
+    from openai import OpenAI, AsyncOpenAI
+    from utils.semantic_cache import SemanticCache
+
+# orjson parses model output several times faster than the stdlib; its
+# JSONDecodeError subclasses json.JSONDecodeError so callers are unaffected
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 # Mock data for development without API calls
 MOCK_MODE = os.getenv("MOCK_MODE", "False").lower() == "true"
@@ -22,62 +48,591 @@ MOCK_MODE = os.getenv("MOCK_MODE", "False").lower() == "true"
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Cache the extraction function
-@st.cache_data(ttl=3600, show_spinner=False)
-def extract_clauses(document_text: str) -> Dict[str, str]:
+# Prompt and response dumps are logged at DEBUG level, and only formatted
+# and written (to a rotating file) when the DEBUG env var is set. The file
+# handler keeps one open handle for the process, and the memory handler in
+# front of it batches records into a single write per DEBUG_LOG_BUFFER
+# records (or on an error, or at interpreter exit via logging.shutdown)
+DEBUG_LOG_BUFFER = 256
+if DEBUG:
+    logger.setLevel(logging.DEBUG)
+    _debug_file_handler = RotatingFileHandler(DEBUG_LOG_PATH, maxBytes=10_000_000, backupCount=3, delay=True)
+    _debug_file_handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    logger.addHandler(MemoryHandler(DEBUG_LOG_BUFFER, flushLevel=logging.ERROR, target=_debug_file_handler))
+
+# Maximum number of OpenAI requests in flight during document analysis;
+# lower it on accounts with small rate limits to avoid bursts of 429s.
+# At least one request is always allowed, or analysis would never finish
+MAX_CONCURRENT_REQUESTS = max(1, int(os.getenv("MAX_CONCURRENT_REQUESTS", "10")))
+
+# System messages are shared by every request so their prompt prefix is
+# identical across calls and eligible for OpenAI's automatic prompt caching
+_SYS_EXTRACT = {"role": "system", "content": "You are a legal assistant specializing in Australian contract law. Your task is to extract and identify distinct clauses from contracts."}
+_SYS_SUMMARY = {"role": "system", "content": "You are a legal assistant specializing in explaining Australian contract law in plain English. Your goal is to make complex legal language understandable for small business owners."}
+_SYS_RISK = {"role": "system", "content": "You are a legal risk analysis system specializing in Australian contract law. Identify potential risks in contract clauses for small businesses, focusing on unfair contract terms under the Australian Consumer Law and ACCC guidelines. You must respond with valid JSON in the exact format specified in the prompt."}
+
+# The extraction prompt has a single placeholder, so it is split once and
+# the document text concatenated in between
+_EXTRACTION_PREFIX, _EXTRACTION_SUFFIX = (
+    part.replace("{{", "{").replace("}}", "}") for part in EXTRACTION_PROMPT.split("{document_text}")
+)
+
+# Documents longer than this are extracted in chunks of at most
+# EXTRACTION_CHUNK_CHARS characters, split on numbered headings where possible
+EXTRACTION_CHUNK_THRESHOLD = 8000
+EXTRACTION_CHUNK_CHARS = 12000
+EXTRACTION_CHUNK_OVERLAP = 500
+_HEADING_BOUNDARY_RE = re.compile(r'\n(?=\d+\.)')
+
+# A prose response saying the clause has no (significant) risks
+_NO_RISKS_RE = re.compile(r"no (?:significant )?risks", re.IGNORECASE)
+
+# A list item or "Risk:" line in a prose risk response, matched across the
+# whole response in one pass. Whitespace classes exclude newlines so a match
+# never spans lines, and the body must be over 10 characters (ignoring
+# surrounding whitespace) so only substantial risk descriptions are kept
+_RISK_LINE_RE = re.compile(
+    r'^[^\S\n]*+(?:Risk:|[-•*] [-•* ]*+[^\S\n]*+(?i:risk:)?+)[^\S\n]*+(?P<body>.{10,}?\S)[^\S\n]*+$',
+    re.MULTILINE
+)
+
+# The contents of the first markdown code fence, with or without a json tag
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+# A JSON array of objects embedded in prose, and trailing commas to strip
+# before parsing. The array match is non-greedy so a long response with
+# several blocks doesn't backtrack from its end
+_JSON_ARRAY_RE = re.compile(r'\[\s*\{.*?\}\s*\]', re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+
+# A response that starts out as JSON, fenced or not, even if it is cut off
+_JSON_START_RE = re.compile(r'\s*(?:```(?:json)?\s*)?[\[{]')
+
+# Risk analysis runs on the cheaper model first, and only goes to the
+# stronger one when the cheap response isn't a usable JSON risk list, or
+# finds no risks in a clause that touches a usually risky subject
+RISK_MODEL = "gpt-4o-mini"
+RISK_ESCALATION_MODEL = "gpt-4o"
+_HIGH_SIGNAL_RE = re.compile(r"liabilit|indemni|waive|exclusiv|terminat|penalt", re.IGNORECASE)
+
+# Output cap for one clause's risk analysis, sized for the schema's worst case:
+# the prompt allows 3 risks, each with a quoted segment, an explanation and a
+# legal reference (~300 tokens), plus the {"risks": [...]} wrapper. A cut-off
+# response is invalid JSON, so the cap must never bind on a legitimate answer
+RISK_MAX_TOKENS = 3 * 300 + 50
+
+# Fresh (non-cached) mini-model risk responses checked for escalation, and how
+# many were escalated, for the escalation rate log
+_escalation_counts = {"checked": 0, "escalated": 0}
+_escalation_counts_lock = threading.Lock()
+
+# Clause-level results are cached on disk under namespaces that include the
+# model and prompts, so editing either invalidates the old entries
+SUMMARY_MODEL = "gpt-4o-mini"
+_SUMMARY_CACHE_NAMESPACE = cache_namespace("summary", SUMMARY_MODEL, _SYS_SUMMARY["content"], SUMMARY_PROMPT)
+_RISK_CACHE_NAMESPACE = cache_namespace("risks", RISK_MODEL, RISK_ESCALATION_MODEL, _SYS_RISK["content"], RISK_PROMPT)
+
+# Near-identical clauses reuse earlier results via embedding similarity,
+# with separate caches so summaries and risk analyses never mix. They are
+# named after the disk cache namespaces so prompt edits invalidate them too
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+@functools.lru_cache(maxsize=1)
+def _get_summary_semantic_cache() -> "SemanticCache":
+    """Load the summary semantic cache on first use, so MOCK_MODE never touches it"""
+    from utils.semantic_cache import SemanticCache, SIMILARITY_THRESHOLD
+    return SemanticCache(_SUMMARY_CACHE_NAMESPACE.replace(":", "-"), SIMILARITY_THRESHOLD)
+
+@functools.lru_cache(maxsize=1)
+def _get_risk_semantic_cache() -> "SemanticCache":
+    """Load the risk semantic cache on first use, so MOCK_MODE never touches it"""
+    from utils.semantic_cache import SemanticCache, RISK_SIMILARITY_THRESHOLD
+    return SemanticCache(_RISK_CACHE_NAMESPACE.replace(":", "-"), RISK_SIMILARITY_THRESHOLD)
+
+# Number of clauses packed into a single request by the bulk functions,
+# and the most output tokens a packed request may ask for
+BULK_CLAUSES_PER_REQUEST = 8
+BULK_MAX_TOKENS = 16000
+
+@functools.lru_cache(maxsize=1)
+def get_client() -> "OpenAI":
     """
-    Extract clauses from contract text using GPT
+    Get the shared OpenAI client, creating it on first use
+    
+    Creating the client validates its settings and builds a connection pool,
+    so it is deferred until a real request is made and never happens in
+    MOCK_MODE. Like the async clients, it keeps a pool of HTTP/2 connections
+    alive between calls so sequential requests skip the TCP and TLS handshake.
+    """
+    import httpx
+    from openai import OpenAI
+    
+    http_client = httpx.Client(
+        http2=True,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        timeout=httpx.Timeout(60, connect=5)
+    )
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client)
+
+def _warm_up_client() -> None:
+    """Open a pooled connection to the API so the first real request skips the TLS handshake"""
+    try:
+        get_client().models.list()
+    except Exception as e:
+        logger.info(f"OpenAI client warm-up failed: {str(e)}")
+
+@functools.lru_cache(maxsize=1)
+def warm_up_client() -> None:
+    """
+    Warm up the OpenAI client in the background while Streamlit builds the page
+    
+    Cached so the thread starts once per server process rather than on every
+    rerun. Does nothing in MOCK_MODE.
+    """
+    if not MOCK_MODE:
+        threading.Thread(target=_warm_up_client, name="openai-warmup", daemon=True).start()
+
+# Async clients are kept per event loop, since their connection pools
+# cannot be shared across the loops created by successive asyncio.run calls
+_async_clients = weakref.WeakKeyDictionary()
+
+def _get_async_client() -> "AsyncOpenAI":
+    """
+    Get the AsyncOpenAI client for the running event loop
+    
+    The client multiplexes requests over a small pool of HTTP/2 connections
+    so concurrent calls don't each pay for a TCP and TLS handshake.
+    """
+    loop = asyncio.get_running_loop()
+    if loop not in _async_clients:
+        import httpx
+        from openai import AsyncOpenAI
+        
+        http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=httpx.Timeout(60, connect=5)
+        )
+        _async_clients[loop] = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client)
+    return _async_clients[loop]
+
+async def _close_async_client() -> None:
+    """Close the running event loop's client before asyncio.run tears the loop down"""
+    async_client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if async_client is not None:
+        await async_client.close()
+
+def _is_transient(error: BaseException) -> bool:
+    """Whether an OpenAI request failed in a way worth retrying"""
+    from openai import RateLimitError, APITimeoutError, APIConnectionError, InternalServerError
+    return isinstance(error, (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError))
+
+# Only transient HTTP failures are retried; parse failures use the fallbacks
+_retry_transient = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_random_exponential(min=1, max=20),
+    retry=retry_if_exception(_is_transient),
+    reraise=True
+)
+
+def _log_usage(request: Dict[str, Any], response: Any) -> None:
+    """Log the token usage of a chat completion"""
+    # Streamed responses don't carry usage
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        logger.info(f"{request['model']} usage: {usage.prompt_tokens} prompt + {usage.completion_tokens} completion tokens")
+
+@_retry_transient
+def _chat(**request) -> Any:
+    """Run a chat completion, retrying transient failures with exponential backoff"""
+    response = get_client().chat.completions.create(**request)
+    _log_usage(request, response)
+    return response
+
+@_retry_transient
+async def _achat(**request) -> Any:
+    """Async version of _chat"""
+    response = await _get_async_client().chat.completions.create(**request)
+    _log_usage(request, response)
+    return response
+
+# Requests currently being made, so identical requests from concurrent
+# Streamlit sessions wait for the first one instead of repeating it. These
+# are thread-safe futures because each session runs its own event loop
+_inflight: Dict[str, concurrent.futures.Future] = {}
+_inflight_lock = threading.Lock()
+
+async def _coalesced(key: str, make_request: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run a request, or wait for the identical request already in flight
+    
+    Args:
+        key: Hash identifying the request
+        make_request: Function creating the coroutine that makes the request
+        
+    Returns:
+        Result of the request
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = concurrent.futures.Future()
+            _inflight[key] = future
+    
+    if not is_owner:
+        return await asyncio.wrap_future(future)
+    
+    try:
+        result = await make_request()
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+def _semantic_text(clause_title: str, clause_text: str) -> str:
+    """
+    Text embedded for semantic cache lookups
+    
+    The whole clause is embedded, so clauses that only differ late in the
+    text don't share a vector. A clause beyond the embedding model's input
+    limit fails to embed and skips the semantic cache.
+    """
+    return clause_title + "\n" + clause_text
+
+# Amounts, percentages, durations and dates in a summary, e.g. "30", "1,000" or "2.5"
+_FIGURE_RE = re.compile(r'\d+(?:[.,]\d+)*')
+
+def _summary_fits_clause(summary: str, clause_text: str) -> bool:
+    """
+    Check that a cached summary only states figures found in a clause
+    
+    Near-identical clauses often differ only in amounts, notice periods or
+    dates, which the summary of one would misstate for the other.
+    
+    Args:
+        summary: Cached summary of a similar clause
+        clause_text: Full text of the clause being summarized
+        
+    Returns:
+        True if every figure in the summary also appears in the clause
+    """
+    return _figures(summary) <= _figures(clause_text)
+
+def _figures(text: str) -> Set[Any]:
+    """Figures in text by value, so "1,000" in a summary matches "1,000.00" in the clause"""
+    figures = set()
+    for figure in _FIGURE_RE.findall(text):
+        try:
+            figures.add(float(figure.replace(",", "")))
+        except ValueError:
+            figures.add(figure)  # Dates such as 1.2.2024
+    return figures
+
+def _embed(text: str) -> Optional["np.ndarray"]:
+    """
+    Embed text for the semantic cache
+    
+    Args:
+        text: Text to embed
+        
+    Returns:
+        Embedding vector, or None if the embedding request failed
+    """
+    import numpy as np
+    
+    # Restated definitions and recitals repeat within and across documents, so reuse stored vectors
+    cache_key = make_cache_key(f"embedding:{EMBEDDING_MODEL}", text)
+    cached_vector = get_cached_bytes(cache_key)
+    if cached_vector is not None:
+        return np.frombuffer(cached_vector, dtype=np.float32)
+    
+    try:
+        response = get_client().embeddings.create(model=EMBEDDING_MODEL, input=text)
+    except Exception as e:
+        logger.warning(f"Embedding failed, skipping semantic cache: {str(e)}")
+        return None
+    
+    vector = np.array(response.data[0].embedding, dtype=np.float32)
+    store_bytes(cache_key, vector.tobytes())
+    return vector
+
+async def _aembed(text: str) -> Optional["np.ndarray"]:
+    """Async version of _embed"""
+    import numpy as np
+    
+    cache_key = make_cache_key(f"embedding:{EMBEDDING_MODEL}", text)
+    cached_vector = get_cached_bytes(cache_key)
+    if cached_vector is not None:
+        return np.frombuffer(cached_vector, dtype=np.float32)
+    
+    try:
+        response = await _get_async_client().embeddings.create(model=EMBEDDING_MODEL, input=text)
+    except Exception as e:
+        logger.warning(f"Embedding failed, skipping semantic cache: {str(e)}")
+        return None
+    
+    vector = np.array(response.data[0].embedding, dtype=np.float32)
+    store_bytes(cache_key, vector.tobytes())
+    return vector
+
+# Embeds text for stream_summary while its stream is being opened
+_embed_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="embed")
+
+async def _alookup_alongside(text: str, lookup: Callable[["np.ndarray"], Any], request: Awaitable[Any]) -> Tuple[Optional["np.ndarray"], Any, Any]:
+    """
+    Look text up in a semantic cache while the real request is already running
+
+    The embedding is much faster than a completion, so a semantic cache miss
+    adds no latency. On a hit the request is cancelled.
+
+    Args:
+        text: Text to embed for the semantic cache
+        lookup: Returns a usable cached result for a vector, or None
+        request: The real request, awaited only on a miss
+
+    Returns:
+        Tuple of (vector or None, cached result or None, request result or None)
+    """
+    request_task = asyncio.ensure_future(request)
+    try:
+        vector = await _aembed(text)
+        similar_result = lookup(vector) if vector is not None else None
+    except BaseException:
+        request_task.cancel()
+        raise
+
+    if similar_result is not None:
+        request_task.cancel()
+        return vector, similar_result, None
+    return vector, None, await request_task
+
+def _request_cache_key(request: Dict[str, Any]) -> str:
+    """Hash every argument of a chat request, since any of them (e.g. response_format or stop) can change its response"""
+    return hashlib.blake2b(json.dumps(request, sort_keys=True).encode('utf-8'), digest_size=16).hexdigest()
+
+def _was_truncated(request: Dict[str, Any], response: Any) -> bool:
+    """Check whether a response was cut off by max_tokens, so it isn't cached as a complete answer"""
+    if response.choices[0].finish_reason != "length":
+        return False
+    logger.warning(f"{request['model']} response hit max_tokens={request.get('max_tokens')} and was cut off")
+    return True
+
+def _cached_chat_with_status(**request) -> Tuple[str, bool]:
+    """
+    Run a chat completion, reusing the stored response for an identical request
+    
+    All requests made by this module are informational (they don't change any
+    state), so replaying a stored response is always safe.
+    
+    Args:
+        **request: Arguments for client.chat.completions.create
+        
+    Returns:
+        Tuple of the content of the response message and whether it came from the cache
+    """
+    cache_key = _request_cache_key(request)
+    cached_content = get_cached_result(cache_key)
+    if cached_content is not None:
+        return cached_content, True
+    
+    response = _chat(**request)
+    content = response.choices[0].message.content
+    if not _was_truncated(request, response):
+        store_result(cache_key, content)
+    return content, False
+
+def _cached_chat(**request) -> str:
+    """Run a chat completion through the response cache, returning the content of the response message"""
+    return _cached_chat_with_status(**request)[0]
+
+async def _acached_chat_with_status(**request) -> Tuple[str, bool]:
+    """Async version of _cached_chat_with_status"""
+    cache_key = _request_cache_key(request)
+    cached_content = get_cached_result(cache_key)
+    if cached_content is not None:
+        return cached_content, True
+    
+    response = await _achat(**request)
+    content = response.choices[0].message.content
+    if not _was_truncated(request, response):
+        store_result(cache_key, content)
+    return content, False
+
+async def _acached_chat(**request) -> str:
+    """Async version of _cached_chat"""
+    return (await _acached_chat_with_status(**request))[0]
+
+def _extract_json_block(text: str) -> str:
+    """Get the contents of a markdown code fence, or the text itself if there is none"""
+    fence_match = _FENCE_RE.search(text)
+    return fence_match.group(1) if fence_match else text
+
+def _split_on_headings(document_text: str, max_chars: int, overlap: int) -> List[str]:
+    """
+    Split a document into chunks of at most max_chars characters
+    
+    Chunks end at the last numbered heading that fits, so clauses aren't cut
+    in half. A section longer than max_chars is cut at max_chars, with the
+    next chunk starting overlap characters earlier to keep context.
     
     Args:
         document_text: Full text of the contract document
+        max_chars: Maximum length of a chunk
+        overlap: Characters repeated between chunks that had to be hard cut
         
     Returns:
-        Dictionary with clause titles as keys and clause text as values
+        List of document chunks
     """
-    if MOCK_MODE:
-        # Return mock data for development
-        return {
-            "1. Definitions": "In this Agreement: 'Service' means the consulting services...",
-            "2. Scope of Work": "The Consultant shall provide the following services to the Client...",
-            "3. Payment Terms": "The Client shall pay the Consultant within 30 days of receipt of invoice...",
-            "4. Intellectual Property": "All intellectual property created during the provision of services...",
-            "5. Confidentiality": "Each party shall maintain the confidentiality of all information...",
-            "6. Termination": "This Agreement may be terminated by either party with 30 days notice...",
-            "7. Limitation of Liability": "The Consultant's liability shall not exceed the fees paid...",
-            "8. Governing Law": "This Agreement is governed by the laws of New South Wales..."
-        }
+    boundaries = [match.start() for match in _HEADING_BOUNDARY_RE.finditer(document_text)]
+    chunks = []
+    start = 0
+    while len(document_text) - start > max_chars:
+        limit = start + max_chars
+        ends = [boundary for boundary in boundaries if start < boundary <= limit]
+        if ends:
+            chunks.append(document_text[start:ends[-1]])
+            start = ends[-1]
+        else:
+            chunks.append(document_text[start:limit])
+            start = limit - overlap
+    chunks.append(document_text[start:])
+    return chunks
+
+def _join_overlapping(first: str, second: str) -> str:
+    """
+    Join two parts of a clause that was split across chunks, dropping the text they share
+    
+    Hard-cut chunks repeat up to EXTRACTION_CHUNK_OVERLAP characters, so
+    both parts can contain the same passage at the join.
+    
+    Args:
+        first: Text of the clause from the earlier chunk
+        second: Text of the clause from the later chunk
+        
+    Returns:
+        The combined clause text
+    """
+    first, second = first.rstrip(), second.lstrip()
+    if second in first:
+        return first
+    if first in second:
+        return second
+    
+    # Longest end of first that starts second, ignoring short coincidental matches
+    for length in range(min(len(first), len(second), 2 * EXTRACTION_CHUNK_OVERLAP), 19, -1):
+        if first.endswith(second[:length]):
+            return first + second[length:]
+    return first + "\n" + second
+
+async def _aextract_chunk(chunk: str) -> Dict[str, str]:
+    """Extract the clauses from one chunk of a long document"""
+    try:
+        clauses_json = await _acached_chat(model="gpt-4o-mini",
+            messages=[
+                _SYS_EXTRACT,
+                {"role": "user", "content": _EXTRACTION_PREFIX + chunk + _EXTRACTION_SUFFIX}
+            ],
+            temperature=0.1,
+            max_tokens=4096,
+            response_format={"type": "json_object"}
+        )
+        return _json_loads(_extract_json_block(clauses_json))
+    except Exception as e:
+        logger.info(f"Chunk extraction failed, falling back to regex-based extraction: {str(e)}")
+        return identify_clauses_regex(chunk)
+
+async def _extract_clauses_chunked(document_text: str) -> Dict[str, str]:
+    """
+    Extract clauses from a long document by extracting its chunks concurrently
+    
+    Args:
+        document_text: Full text of the contract document
+        
+    Returns:
+        Dictionary with clause titles as keys and clause text as values, in document order
+    """
+    chunks = _split_on_headings(document_text, EXTRACTION_CHUNK_CHARS, EXTRACTION_CHUNK_OVERLAP)
+    logger.info(f"Extracting clauses from {len(chunks)} chunks (EXTRACTION)")
+    
+    partials = await _gather_bounded([_aextract_chunk(chunk) for chunk in chunks])
+    
+    # Merge the chunks, joining clauses that were split across a chunk boundary
+    merged = {}
+    for partial in partials:
+        if not isinstance(partial, dict):
+            logger.info(f"Ignoring chunk extraction that is not a JSON object: {type(partial).__name__}")
+            continue
+        for clause_title, clause_text in partial.items():
+            if not isinstance(clause_text, str):
+                logger.info(f"Ignoring clause {clause_title!r} with non-text value: {type(clause_text).__name__}")
+                continue
+            if clause_title not in merged:
+                merged[clause_title] = clause_text
+            else:
+                merged[clause_title] = _join_overlapping(merged[clause_title], clause_text)
+    return merged
+
+def _extract_clauses_mock(doc_hash: str, _document_text: str) -> Dict[str, str]:
+    """Get the mock clauses used when running in MOCK_MODE"""
+    return {
+        "1. Definitions": "In this Agreement: 'Service' means the consulting services...",
+        "2. Scope of Work": "The Consultant shall provide the following services to the Client...",
+        "3. Payment Terms": "The Client shall pay the Consultant within 30 days of receipt of invoice...",
+        "4. Intellectual Property": "All intellectual property created during the provision of services...",
+        "5. Confidentiality": "Each party shall maintain the confidentiality of all information...",
+        "6. Termination": "This Agreement may be terminated by either party with 30 days notice...",
+        "7. Limitation of Liability": "The Consultant's liability shall not exceed the fees paid...",
+        "8. Governing Law": "This Agreement is governed by the laws of New South Wales..."
+    }
+
+def _extract_clauses_real(doc_hash: str, _document_text: str) -> Dict[str, str]:
+    """
+    Extract clauses from contract text using GPT
+    
+    The cache is keyed on doc_hash alone; the leading underscore stops
+    Streamlit from hashing the (potentially very long) document text.
     
+    Args:
+        doc_hash: SHA-256 hex digest of the document text
+        _document_text: Full text of the contract document
+        
+    Returns:
+        Dictionary with clause titles as keys and clause text as values
+    """
     # Log that we're starting clause extraction
     logger.info("Starting clause extraction with LLM (EXTRACTION)")
     
+    # Long documents would overflow a single response, so extract them in chunks
+    if len(_document_text) > EXTRACTION_CHUNK_THRESHOLD:
+        return asyncio.run(_extract_clauses_chunked(_document_text))
+    
     # Prepare prompt with the document text
-    prompt = EXTRACTION_PROMPT.format(document_text=document_text)
-    logger.info(f"Extraction Prompt: {prompt}")
+    prompt = _EXTRACTION_PREFIX + _document_text + _EXTRACTION_SUFFIX
+    logger.debug("Extraction Prompt: %s", prompt)
 
     try:
         # Call OpenAI API
-        response = client.chat.completions.create(model="gpt-4o-mini",  # or "gpt-3.5-turbo" for lower cost
+        clauses_json = _cached_chat(model="gpt-4o-mini",  # or "gpt-3.5-turbo" for lower cost
             messages=[
-                {"role": "system", "content": "You are a legal assistant specializing in Australian contract law. Your task is to extract and identify distinct clauses from contracts."},
+                _SYS_EXTRACT,
                 {"role": "user", "content": prompt}
             ],
             temperature=0.1,  # Low temperature for more consistent results
-            max_tokens=10000
+            max_tokens=10000,
+            response_format={"type": "json_object"}
         )
 
-        logger.info(f"Response from LLM in extraction: {response}")
+        logger.debug("Response from LLM in extraction: %s", clauses_json)
         
         # Parse the response
         try:
-            clauses_json = response.choices[0].message.content
-            # Extract JSON if it's within markdown code blocks
-            if "```json" in clauses_json:
-                clauses_json = clauses_json.split("```json")[1].split("```")[0]
-            elif "```" in clauses_json:
-                clauses_json = clauses_json.split("```")[1].split("```")[0]
-            
             # Parse the JSON response
-            clauses = json.loads(clauses_json)
+            clauses = _json_loads(_extract_json_block(clauses_json))
             
             # Log the LLM response for debugging
             logger.info(f"LLM provided a valid response and we were able to parse it")
@@ -85,20 +640,59 @@ def extract_clauses(document_text: str) -> Dict[str, str]:
             return clauses
         except json.JSONDecodeError:
             # Fallback to regex-based extraction if JSON parsing fails
-            from utils.document_parser import identify_clauses_regex
             logger.info(f"LLM did not provide a response. We fallback to regex-based extraction")
-            return identify_clauses_regex(document_text)
+            return identify_clauses_regex(_document_text)
             
-    except Exception as e:
-        print(f"Error in GPT clause extraction: {str(e)}")
-        logger.info(f"LLM did not provide a response. There was an error in the clause extraction.")
+    except Exception:
+        logger.error("Error in GPT clause extraction", exc_info=True)
         # Fallback to regex-based extraction
-        from utils.document_parser import identify_clauses_regex
-        return identify_clauses_regex(document_text)
+        return identify_clauses_regex(_document_text)
+
+# Mock data for MOCK_MODE, built once at import and read-only so callers can share it
+_MOCK_SUMMARIES = MappingProxyType({
+    "1. Definitions": "This section defines key terms used throughout the agreement, including what constitutes the 'Service' and who the parties are.",
+    "2. Scope of Work": "This outlines exactly what work the consultant will do, including deliverables and timelines.",
+    "3. Payment Terms": "You must pay within 30 days of receiving an invoice. Late payments may incur additional fees.",
+    "4. Intellectual Property": "Any work created during the project belongs to the client after payment is complete.",
+    "5. Confidentiality": "Both parties must keep sensitive business information private and not share it with others.",
+    "6. Termination": "Either party can end the agreement with 30 days written notice. Immediate termination is possible if there's a serious breach.",
+    "7. Limitation of Liability": "The consultant won't be responsible for damages beyond the amount you've paid them.",
+    "8. Governing Law": "If there's a dispute, New South Wales law applies and any legal proceedings must happen in NSW courts."
+})
+
+def _mock_summary(clause_title: str) -> str:
+    """Get the mock summary for a clause when running in MOCK_MODE"""
+    # Return mock summary if available, otherwise generate a generic one
+    return _MOCK_SUMMARIES.get(clause_title, f"This clause covers {clause_title.lower()} terms.")
 
-# Cache the summarization function
-@st.cache_data(ttl=3600, show_spinner=False)
-def summarize_clause(clause_title: str, clause_text: str) -> str:
+def _fallback_summary(clause_title: str) -> str:
+    """Generic summary used when the API call fails"""
+    return f"This clause appears to address {clause_title.lower()}. Please review the original text for details."
+
+@functools.lru_cache(maxsize=2048)
+def _summary_prompt(clause_title: str, clause_text: str) -> str:
+    """Format the summary prompt, reusing the string for a clause seen before"""
+    return SUMMARY_PROMPT.format(clause_title=clause_title, clause_text=clause_text)
+
+def _summary_request(clause_title: str, clause_text: str) -> Dict[str, Any]:
+    """Build the chat completion arguments for a clause summary"""
+    prompt = _summary_prompt(clause_title, clause_text)
+    return {
+        "model": SUMMARY_MODEL,
+        "messages": [
+            _SYS_SUMMARY,
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0.7,  # Slightly higher for more natural language
+        "max_tokens": 220,
+        "stop": ["\n\n\n"]
+    }
+
+def _summarize_clause_mock(clause_title: str, clause_text: str) -> str:
+    """Get the mock summary used when running in MOCK_MODE"""
+    return _mock_summary(clause_title)
+
+def _summarize_clause_real(clause_title: str, clause_text: str) -> str:
     """
     Generate a plain English summary of a contract clause
     
@@ -110,47 +704,357 @@ def summarize_clause(clause_title: str, clause_text: str) -> str:
         Plain English summary of the clause
     """
     logger.info("Starting summarization with LLM (SUMMARIZATION)")
+    
+    # Standard clauses have summaries generated ahead of time
+    precomputed_summary = get_precomputed_summary(clause_title, clause_text)
+    if precomputed_summary is not None:
+        return precomputed_summary
+    
+    # Reuse the summary of an identical clause if we've seen it before
+    cache_key = make_cache_key(_SUMMARY_CACHE_NAMESPACE, clause_text)
+    cached_summary = get_cached_result(cache_key)
+    if cached_summary is not None:
+        logger.info("Using cached summary (SUMMARIZATION)")
+        return cached_summary
+    
+    # Fall back to the summary of a near-identical clause
+    vector = _embed(_semantic_text(clause_title, clause_text))
+    if vector is not None:
+        similar_summary = _get_summary_semantic_cache().lookup(vector)
+        if similar_summary is not None and _summary_fits_clause(similar_summary, clause_text):
+            return similar_summary
+    
+    try:
+        # Call OpenAI API
+        summary = _cached_chat(**_summary_request(clause_title, clause_text)).strip()
+        
+        # Cache and return the summary
+        store_result(cache_key, summary)
+        if vector is not None:
+            _get_summary_semantic_cache().add(vector, summary)
+        return summary
+    
+    except Exception:
+        logger.error("Error in GPT summarization", exc_info=True)
+        # Return a generic summary if API call fails
+        return _fallback_summary(clause_title)
+
+def stream_summary(clause_title: str, clause_text: str) -> Iterator[str]:
+    """
+    Generate a plain English summary of a contract clause, yielding it as it is written
+    
+    Each value yielded is the whole summary so far, so callers can show the
+    latest one in place. If the stream fails, the fallback summary is yielded
+    to replace whatever was partially written.
+    
+    Args:
+        clause_title: Title or identifier of the clause
+        clause_text: Full text of the clause
+        
+    Yields:
+        The summary text written so far
+    """
     if MOCK_MODE:
-        # Return mock data for development
-        mock_summaries = {
-            "1. Definitions": "This section defines key terms used throughout the agreement, including what constitutes the 'Service' and who the parties are.",
-            "2. Scope of Work": "This outlines exactly what work the consultant will do, including deliverables and timelines.",
-            "3. Payment Terms": "You must pay within 30 days of receiving an invoice. Late payments may incur additional fees.",
-            "4. Intellectual Property": "Any work created during the project belongs to the client after payment is complete.",
-            "5. Confidentiality": "Both parties must keep sensitive business information private and not share it with others.",
-            "6. Termination": "Either party can end the agreement with 30 days written notice. Immediate termination is possible if there's a serious breach.",
-            "7. Limitation of Liability": "The consultant won't be responsible for damages beyond the amount you've paid them.",
-            "8. Governing Law": "If there's a dispute, New South Wales law applies and any legal proceedings must happen in NSW courts."
-        }
+        yield _mock_summary(clause_title)
+        return
+    
+    # Standard clauses have summaries generated ahead of time
+    precomputed_summary = get_precomputed_summary(clause_title, clause_text)
+    if precomputed_summary is not None:
+        yield precomputed_summary
+        return
+    
+    cache_key = make_cache_key(_SUMMARY_CACHE_NAMESPACE, clause_text)
+    cached_summary = get_cached_result(cache_key)
+    if cached_summary is not None:
+        yield cached_summary
+        return
+    
+    # Embed while the stream is opened, so a semantic cache miss adds no latency
+    vector_future = _embed_executor.submit(_embed, _semantic_text(clause_title, clause_text))
+    
+    try:
+        summary = ""
+        stream = _chat(stream=True, **_summary_request(clause_title, clause_text))
+        
+        # Fall back to the summary of a near-identical clause before anything is shown
+        vector = vector_future.result()
+        if vector is not None:
+            similar_summary = _get_summary_semantic_cache().lookup(vector)
+            if similar_summary is not None and _summary_fits_clause(similar_summary, clause_text):
+                stream.close()
+                yield similar_summary
+                return
+        
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                summary += chunk.choices[0].delta.content
+                yield summary
+        summary = summary.strip()
+    except Exception:
+        logger.error("Error in streamed GPT summarization", exc_info=True)
+        summary = ""
+    
+    if not summary:
+        yield _fallback_summary(clause_title)
+        return
+    
+    # Cache only complete summaries, so later reruns don't stream them again
+    store_result(cache_key, summary)
+    if vector is not None:
+        _get_summary_semantic_cache().add(vector, summary)
+    yield summary
+
+async def asummarize_clause(clause_title: str, clause_text: str) -> str:
+    """
+    Async version of summarize_clause, for summarizing many clauses concurrently
+    
+    Args:
+        clause_title: Title or identifier of the clause
+        clause_text: Full text of the clause
         
-        # Return mock summary if available, otherwise generate a generic one
-        return mock_summaries.get(clause_title, f"This clause covers {clause_title.lower()} terms.")
+    Returns:
+        Plain English summary of the clause
+    """
+    key = hashlib.sha256(f"summary\x00{clause_title}\x00{clause_text}".encode('utf-8')).hexdigest()
+    return await _coalesced(key, lambda: _asummarize_clause(clause_title, clause_text))
+
+async def _asummarize_clause(clause_title: str, clause_text: str) -> str:
+    """Summarize a clause without coalescing identical in-flight requests"""
+    if MOCK_MODE:
+        return _mock_summary(clause_title)
+    
+    # Standard clauses have summaries generated ahead of time
+    precomputed_summary = get_precomputed_summary(clause_title, clause_text)
+    if precomputed_summary is not None:
+        return precomputed_summary
     
-    # Prepare prompt
-    prompt = SUMMARY_PROMPT.format(clause_title=clause_title, clause_text=clause_text)
+    cache_key = make_cache_key(_SUMMARY_CACHE_NAMESPACE, clause_text)
+    cached_summary = get_cached_result(cache_key)
+    if cached_summary is not None:
+        return cached_summary
+    
+    def lookup_similar(vector: "np.ndarray") -> Optional[str]:
+        similar_summary = _get_summary_semantic_cache().lookup(vector)
+        if similar_summary is not None and _summary_fits_clause(similar_summary, clause_text):
+            return similar_summary
+        return None
     
     try:
-        # Call OpenAI API
-        response = client.chat.completions.create(model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a legal assistant specializing in explaining Australian contract law in plain English. Your goal is to make complex legal language understandable for small business owners."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,  # Slightly higher for more natural language
-            max_tokens=500
+        # Fall back to the summary of a near-identical clause
+        vector, similar_summary, summary = await _alookup_alongside(
+            _semantic_text(clause_title, clause_text),
+            lookup_similar,
+            _acached_chat(**_summary_request(clause_title, clause_text)),
         )
+        if similar_summary is not None:
+            return similar_summary
+        summary = summary.strip()
+        store_result(cache_key, summary)
+        if vector is not None:
+            _get_summary_semantic_cache().add(vector, summary)
+        return summary
+    
+    except Exception:
+        logger.error("Error in async GPT summarization", exc_info=True)
+        return _fallback_summary(clause_title)
+
+# Mock detailed risks for MOCK_MODE, keyed like _MOCK_SUMMARIES
+_MOCK_RISKS = MappingProxyType({
+    "1. Definitions": [],
+    "2. Scope of Work": [],
+    "3. Payment Terms": [
+        {
+            "problematic_text": "The Client shall pay the Consultant within 30 days of receipt of invoice",
+            "explanation": "The 30-day payment term may be too long for small businesses with cash flow concerns.",
+            "legal_reference": "ACCC guidelines on fair payment terms for small businesses",
+            "severity": "medium"
+        }
+    ],
+    "4. Intellectual Property": [],
+    "5. Confidentiality": [
+        {
+            "problematic_text": "Each party shall maintain the confidentiality of all information",
+            "explanation": "The confidentiality obligations continue indefinitely, which may be overly restrictive.",
+            "legal_reference": "Australian common law on restraint of trade",
+            "severity": "medium"
+        }
+    ],
+    "6. Termination": [
+        {
+            "problematic_text": "This Agreement may be terminated by either party with 30 days notice",
+            "explanation": "The 30-day notice period for termination may be problematic if you need to exit quickly.",
+            "legal_reference": "ACCC guidelines on fair termination clauses",
+            "severity": "low"
+        }
+    ],
+    "7. Limitation of Liability": [
+        {
+            "problematic_text": "The Consultant's liability shall not exceed the fees paid",
+            "explanation": "This broad limitation of liability clause may be unenforceable under Australian Consumer Law for certain types of loss.",
+            "legal_reference": "Section 64A of the Australian Consumer Law",
+            "severity": "high"
+        }
+    ],
+    "8. Governing Law": []
+})
+
+# Simple risk statements for backward compatibility, projected once
+_MOCK_SIMPLE_RISKS = MappingProxyType({
+    clause_title: [risk["explanation"] for risk in detailed_risks]
+    for clause_title, detailed_risks in _MOCK_RISKS.items()
+})
+
+def _mock_risks(clause_title: str) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Get the mock risk analysis for a clause when running in MOCK_MODE"""
+    return _MOCK_SIMPLE_RISKS.get(clause_title, []), _MOCK_RISKS.get(clause_title, [])
+
+@functools.lru_cache(maxsize=2048)
+def _risk_prompt(clause_title: str, clause_text: str) -> str:
+    """Format the risk prompt, reusing the string for a clause seen before"""
+    return RISK_PROMPT.format(clause_title=clause_title, clause_text=clause_text)
+
+def _risk_request(clause_title: str, clause_text: str, model: str = RISK_MODEL) -> Dict[str, Any]:
+    """Build the chat completion arguments for a clause risk analysis"""
+    prompt = _risk_prompt(clause_title, clause_text)
+    return {
+        "model": model,
+        "messages": [
+            _SYS_RISK,
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0.1,  # Low temperature for consistency
+        "max_tokens": RISK_MAX_TOKENS,
+        "response_format": RISK_RESPONSE_FORMAT
+    }
+
+def _needs_escalation(response_text: str, clause_text: str, was_cached: bool = False) -> bool:
+    """
+    Check whether a risk response should be retried on the stronger model
+    
+    Args:
+        response_text: Raw text returned by the model
+        clause_text: Full text of the clause that was analysed
+        was_cached: Whether the response was replayed from the cache, in which
+            case it is left out of the escalation rate
         
-        # Return the summary
-        return response.choices[0].message.content.strip()
+    Returns:
+        True if the response isn't a JSON risk list with an explanation for every
+        risk, or reports no risks for a clause about liability, indemnities,
+        waivers, exclusivity, termination or penalties
+    """
+    try:
+        risks = parse_risks(_extract_json_block(response_text))
+        escalate = not risks and _HIGH_SIGNAL_RE.search(clause_text) is not None
+    except ValueError:
+        escalate = True
     
-    except Exception as e:
-        print(f"Error in GPT summarization: {str(e)}")
-        # Return a generic summary if API call fails
-        return f"This clause appears to address {clause_title.lower()}. Please review the original text for details."
+    if not was_cached:
+        with _escalation_counts_lock:
+            _escalation_counts["checked"] += 1
+            if escalate:
+                _escalation_counts["escalated"] += 1
+            escalated, checked = _escalation_counts["escalated"], _escalation_counts["checked"]
+        if escalate:
+            logger.info(f"Escalating risk analysis to {RISK_ESCALATION_MODEL} "
+                        f"({escalated} of {checked} analyses escalated)")
+    return escalate
 
-# Cache the risk analysis function
-@st.cache_data(ttl=3600, show_spinner=False)
-def analyze_risks(clause_title: str, clause_text: str) -> Tuple[List[str], List[Dict[str, Any]]]:
+def _parse_risk_response(response_text: str) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Parse the model's risk analysis response
+    
+    Args:
+        response_text: Raw text returned by the model
+        
+    Returns:
+        Tuple of simple risk statements and detailed risk dictionaries
+    """
+    # Try to parse as JSON
+    detailed_risks = []
+    simple_risks = []
+    
+    try:
+        # Responses are requested with a strict JSON schema, but tolerate fenced or
+        # embedded arrays from responses that predate it
+        json_str = _extract_json_block(response_text).strip()
+        if not json_str.startswith(("{", "[")):
+            # Try to find JSON array in the text
+            json_match = _JSON_ARRAY_RE.search(json_str)
+            if json_match:
+                json_str = json_match.group(0)
+                logger.debug("Found JSON array in risk response text: %s", json_str)
+        
+        # Remove any trailing commas
+        json_str = _TRAILING_COMMA_RE.sub(r'\1', json_str)
+        
+        # Parse and validate the JSON in one pass; pydantic's ValidationError is a ValueError
+        detailed_risks = parse_risks(json_str)
+        
+        # Extract simple risks for backward compatibility
+        simple_risks = [risk_item["explanation"] for risk_item in detailed_risks]
+            
+    except (ValueError, IndexError) as e:
+        logger.info(f"JSON parsing failed in risk analysis ({type(e).__name__}), using the text fallback")
+        logger.debug("Error message: %s | Response text: %s | JSON string that failed: %s",
+                     e, response_text, json_str if 'json_str' in locals() else 'Not found')
+        
+        # Fallback to the old method for backward compatibility
+        if _NO_RISKS_RE.search(response_text):
+            return [], []
+        
+        # Extract risk points from list items or "Risk:" lines
+        simple_risks = [risk_match.group('body') for risk_match in _RISK_LINE_RE.finditer(response_text)]
+        detailed_risks = [
+            {
+                "problematic_text": "",  # We don't have the exact text in this case
+                "explanation": risk,
+                "legal_reference": "General Australian contract law principles",
+                "severity": "medium"  # Default to medium severity
+            }
+            for risk in simple_risks
+        ]
+        
+        # If we couldn't parse list items but there's content, use the whole
+        # response, unless it is a cut-off or malformed JSON object
+        if not detailed_risks and len(response_text) > 10 and not _JSON_START_RE.match(response_text):
+            risk_dict = {
+                "problematic_text": "",  # We don't have the exact text in this case
+                "explanation": response_text,
+                "legal_reference": "General Australian contract law principles",
+                "severity": "medium"  # Default to medium severity
+            }
+            detailed_risks = [risk_dict]
+            simple_risks = [response_text]
+    
+    return simple_risks, detailed_risks
+
+def _analyze_risks_mock(clause_title: str, clause_text: str) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Get the mock risk analysis used when running in MOCK_MODE"""
+    return _mock_risks(clause_title)
+
+def _risks_fit_clause(detailed_risks: List[Dict[str, Any]], clause_text: str) -> bool:
+    """
+    Check that a cached risk analysis only quotes text found in a clause
+    
+    A near-identical clause can still differ in the figures or wording a risk
+    quotes, and highlighting relies on the quotes appearing in the clause.
+    
+    Args:
+        detailed_risks: Detailed risk dictionaries from the cached analysis
+        clause_text: Full text of the clause being analyzed
+        
+    Returns:
+        True if every quoted problematic text appears in the clause, ignoring whitespace differences
+    """
+    normalized_clause = " ".join(clause_text.split())
+    for risk in detailed_risks:
+        problematic_text = " ".join(str(risk.get("problematic_text") or "").split())
+        if problematic_text and problematic_text not in normalized_clause:
+            return False
+    return True
+
+def _analyze_risks_real(clause_title: str, clause_text: str) -> Tuple[List[str], List[Dict[str, Any]]]:
     """
     Analyze a clause for potential legal risks based on Australian law
     
@@ -164,175 +1068,583 @@ def analyze_risks(clause_title: str, clause_text: str) -> Tuple[List[str], List[
         - List of dictionaries with detailed risk information including problematic text
     """
     logger.info("Starting risk analysis with LLM (RISK ANALYSIS)")
-    if MOCK_MODE:
-        # Return mock data for development
-        mock_risks = {
-            "1. Definitions": [],
-            "2. Scope of Work": [],
-            "3. Payment Terms": [
-                {
-                    "problematic_text": "The Client shall pay the Consultant within 30 days of receipt of invoice",
-                    "explanation": "The 30-day payment term may be too long for small businesses with cash flow concerns.",
-                    "legal_reference": "ACCC guidelines on fair payment terms for small businesses",
-                    "severity": "medium"
-                }
-            ],
-            "4. Intellectual Property": [],
-            "5. Confidentiality": [
-                {
-                    "problematic_text": "Each party shall maintain the confidentiality of all information",
-                    "explanation": "The confidentiality obligations continue indefinitely, which may be overly restrictive.",
-                    "legal_reference": "Australian common law on restraint of trade",
-                    "severity": "medium"
-                }
-            ],
-            "6. Termination": [
-                {
-                    "problematic_text": "This Agreement may be terminated by either party with 30 days notice",
-                    "explanation": "The 30-day notice period for termination may be problematic if you need to exit quickly.",
-                    "legal_reference": "ACCC guidelines on fair termination clauses",
-                    "severity": "low"
-                }
-            ],
-            "7. Limitation of Liability": [
-                {
-                    "problematic_text": "The Consultant's liability shall not exceed the fees paid",
-                    "explanation": "This broad limitation of liability clause may be unenforceable under Australian Consumer Law for certain types of loss.",
-                    "legal_reference": "Section 64A of the Australian Consumer Law",
-                    "severity": "high"
-                }
-            ],
-            "8. Governing Law": []
-        }
-        
-        # Get the detailed risk information
-        detailed_risks = mock_risks.get(clause_title, [])
+    
+    # Standard clauses have risk analyses generated ahead of time
+    precomputed_risks = get_precomputed_risks(clause_title, clause_text)
+    if precomputed_risks is not None:
+        return [risk["explanation"] for risk in precomputed_risks], precomputed_risks
+    
+    # Reuse the analysis of an identical clause if we've seen it before
+    cache_key = make_cache_key(_RISK_CACHE_NAMESPACE, clause_text)
+    cached_risks = get_cached_result(cache_key)
+    if cached_risks is not None:
+        logger.info("Using cached risk analysis (RISK ANALYSIS)")
+        return cached_risks["simple_risks"], cached_risks["detailed_risks"]
+    
+    # Fall back to the analysis of a near-identical clause
+    vector = _embed(_semantic_text(clause_title, clause_text))
+    if vector is not None:
+        similar_risks = _get_risk_semantic_cache().lookup(vector)
+        if similar_risks is not None and _risks_fit_clause(similar_risks["detailed_risks"], clause_text):
+            return similar_risks["simple_risks"], similar_risks["detailed_risks"]
+    
+    try:
+        # Call OpenAI API
+        response_text, was_cached = _cached_chat_with_status(**_risk_request(clause_title, clause_text))
+        response_text = response_text.strip()
+        if _needs_escalation(response_text, clause_text, was_cached):
+            response_text = _cached_chat(**_risk_request(clause_title, clause_text, RISK_ESCALATION_MODEL)).strip()
         
-        # For backward compatibility, also return the simple risk statements
-        simple_risks = [risk["explanation"] for risk in detailed_risks]
+        # Parse the response
+        logger.debug("Risk Response from OpenAI: %s", response_text)
         
+        simple_risks, detailed_risks = _parse_risk_response(response_text)
+        store_result(cache_key, {"simple_risks": simple_risks, "detailed_risks": detailed_risks})
+        if vector is not None:
+            _get_risk_semantic_cache().add(vector, {"simple_risks": simple_risks, "detailed_risks": detailed_risks})
         return simple_risks, detailed_risks
     
-    # Prepare prompt
-    prompt = RISK_PROMPT.format(clause_title=clause_title, clause_text=clause_text)
+    except Exception:
+        logger.error("Error in GPT risk analysis", exc_info=True)
+        # Return empty lists if API call fails
+        return [], []
+
+async def aanalyze_risks(clause_title: str, clause_text: str) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Async version of analyze_risks, for analyzing many clauses concurrently
+    
+    Args:
+        clause_title: Title or identifier of the clause
+        clause_text: Full text of the clause
+        
+    Returns:
+        Tuple of simple risk statements and detailed risk dictionaries
+    """
+    key = hashlib.sha256(f"risks\x00{clause_title}\x00{clause_text}".encode('utf-8')).hexdigest()
+    return await _coalesced(key, lambda: _aanalyze_risks(clause_title, clause_text))
+
+async def _aanalyze_risks(clause_title: str, clause_text: str) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Analyze a clause's risks without coalescing identical in-flight requests"""
+    if MOCK_MODE:
+        return _mock_risks(clause_title)
+    
+    # Standard clauses have risk analyses generated ahead of time
+    precomputed_risks = get_precomputed_risks(clause_title, clause_text)
+    if precomputed_risks is not None:
+        return [risk["explanation"] for risk in precomputed_risks], precomputed_risks
+    
+    cache_key = make_cache_key(_RISK_CACHE_NAMESPACE, clause_text)
+    cached_risks = get_cached_result(cache_key)
+    if cached_risks is not None:
+        return cached_risks["simple_risks"], cached_risks["detailed_risks"]
+    
+    def lookup_similar(vector: "np.ndarray") -> Optional[Dict[str, Any]]:
+        similar_risks = _get_risk_semantic_cache().lookup(vector)
+        if similar_risks is not None and _risks_fit_clause(similar_risks["detailed_risks"], clause_text):
+            return similar_risks
+        return None
+    
+    async def request_risks() -> str:
+        response_text, was_cached = await _acached_chat_with_status(**_risk_request(clause_title, clause_text))
+        response_text = response_text.strip()
+        if _needs_escalation(response_text, clause_text, was_cached):
+            response_text = (await _acached_chat(**_risk_request(clause_title, clause_text, RISK_ESCALATION_MODEL))).strip()
+        return response_text
     
     try:
-        # Call OpenAI API
-        response = client.chat.completions.create(model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a legal risk analysis system specializing in Australian contract law. Identify potential risks in contract clauses for small businesses, focusing on unfair contract terms under the Australian Consumer Law and ACCC guidelines. You must respond with valid JSON in the exact format specified in the prompt."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.1,  # Low temperature for consistency
-            max_tokens=2000
+        # Fall back to the analysis of a near-identical clause
+        vector, similar_risks, response_text = await _alookup_alongside(
+            _semantic_text(clause_title, clause_text),
+            lookup_similar,
+            request_risks(),
         )
+        if similar_risks is not None:
+            return similar_risks["simple_risks"], similar_risks["detailed_risks"]
+        simple_risks, detailed_risks = _parse_risk_response(response_text)
+        store_result(cache_key, {"simple_risks": simple_risks, "detailed_risks": detailed_risks})
+        if vector is not None:
+            _get_risk_semantic_cache().add(vector, {"simple_risks": simple_risks, "detailed_risks": detailed_risks})
+        return simple_risks, detailed_risks
+    
+    except Exception:
+        logger.error("Error in async GPT risk analysis", exc_info=True)
+        return [], []
+
+def _dedupe_clauses(clauses: Dict[str, str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Collapse clauses with byte-identical text so each is only sent once
+    
+    Args:
+        clauses: Dictionary with clause titles as keys and clause text as values
         
-        # Parse the response
-        response_text = response.choices[0].message.content.strip()
-        logger.info("=== DEBUG: Risk Response from OpenAI ===")
-        logger.info(response_text)
-        logger.info("=== END DEBUG ===")
+    Returns:
+        Tuple containing:
+        - Dictionary of the first clause seen for each distinct text
+        - Dictionary mapping every clause title to the title of that first clause
+    """
+    unique_clauses = {}
+    first_title_by_hash = {}
+    representative = {}
+    for clause_title, clause_text in clauses.items():
+        text_hash = hashlib.sha1(clause_text.encode('utf-8')).digest()
+        if text_hash not in first_title_by_hash:
+            first_title_by_hash[text_hash] = clause_title
+            unique_clauses[clause_title] = clause_text
+        representative[clause_title] = first_title_by_hash[text_hash]
+    return unique_clauses, representative
+
+def _scatter_results(results: Tuple[Dict[str, Any], ...], representative: Dict[str, str]) -> Tuple[Dict[str, Any], ...]:
+    """Copy the results for each unique clause back to every clause sharing its text"""
+    return tuple({title: result[first_title] for title, first_title in representative.items()} for result in results)
+
+async def analyze_document(clauses: Dict[str, str], on_progress: Optional[Callable[[int, int], None]] = None,
+                           summarize: bool = True) -> Tuple[Dict[str, str], Dict[str, List[str]], Dict[str, List[Dict[str, Any]]]]:
+    """
+    Summarize and analyze the risks of every clause concurrently
+    
+    Args:
+        clauses: Dictionary with clause titles as keys and clause text as values
+        on_progress: Optional callback given (completed, total) as each request finishes
+        summarize: Whether to summarize the clauses too; callers that stream
+            summaries on demand with stream_summary pass False
+        
+    Returns:
+        Tuple of dictionaries keyed by clause title:
+        - Plain English summaries
+        - Simple risk statements
+        - Detailed risk information
+    """
+    # Created per run because asyncio primitives are bound to a single event loop
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    
+    async def labelled(kind, title, coro):
+        async with semaphore:
+            try:
+                return kind, title, await coro
+            except Exception as e:
+                return kind, title, e
+    
+    # Repeated boilerplate only needs to be analyzed once
+    unique_clauses, representative = _dedupe_clauses(clauses)
+    if has_precomputed():
+        logger.info(f"{warmup(unique_clauses)} of {len(unique_clauses)} clause titles have precomputed results")
+    
+    tasks = [labelled("summary", title, asummarize_clause(title, text)) for title, text in unique_clauses.items()] if summarize else []
+    tasks += [labelled("risks", title, aanalyze_risks(title, text)) for title, text in unique_clauses.items()]
+    
+    summaries = {}
+    simple_risks = {}
+    detailed_risks = {}
+    try:
+        # Handle results as they finish so the caller can report progress
+        for completed, next_result in enumerate(asyncio.as_completed(tasks), start=1):
+            kind, title, result = await next_result
+            if kind == "summary":
+                summaries[title] = _fallback_summary(title) if isinstance(result, Exception) else result
+            else:
+                simple_risks[title], detailed_risks[title] = ([], []) if isinstance(result, Exception) else result
+            if on_progress:
+                on_progress(completed, len(tasks))
+    finally:
+        await _close_async_client()
+    
+    return _scatter_results((summaries, simple_risks, detailed_risks), representative)
+
+async def _gather_bounded(coros: List[Awaitable[Any]]) -> List[Any]:
+    """
+    Run coroutines concurrently, at most MAX_CONCURRENT_REQUESTS at a time
+    
+    A TaskGroup cancels the remaining requests if one fails, rather than
+    leaving them running against a client that is about to be closed.
+    
+    Args:
+        coros: Coroutines to run
+        
+    Returns:
+        Their results, in the same order
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    
+    async def bounded(coro):
+        async with semaphore:
+            return await coro
+    
+    try:
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [task_group.create_task(bounded(coro)) for coro in coros]
+        return [task.result() for task in tasks]
+    finally:
+        await _close_async_client()
+
+async def summarize_all(clauses: Dict[str, str]) -> Dict[str, str]:
+    """
+    Summarize every clause concurrently
+    
+    Args:
+        clauses: Dictionary with clause titles as keys and clause text as values
         
-        # Try to parse as JSON
-        detailed_risks = []
-        simple_risks = []
+    Returns:
+        Dictionary with clause titles as keys and summaries as values
+    """
+    unique_clauses, representative = _dedupe_clauses(clauses)
+    summaries = await _gather_bounded([asummarize_clause(title, text) for title, text in unique_clauses.items()])
+    return _scatter_results((dict(zip(unique_clauses.keys(), summaries)),), representative)[0]
+
+async def analyze_all(clauses: Dict[str, str]) -> Dict[str, Tuple[List[str], List[Dict[str, Any]]]]:
+    """
+    Analyze every clause for risks concurrently
+    
+    Args:
+        clauses: Dictionary with clause titles as keys and clause text as values
         
+    Returns:
+        Dictionary with clause titles as keys and (simple risks, detailed risks) tuples as values
+    """
+    unique_clauses, representative = _dedupe_clauses(clauses)
+    risks = await _gather_bounded([aanalyze_risks(title, text) for title, text in unique_clauses.items()])
+    return _scatter_results((dict(zip(unique_clauses.keys(), risks)),), representative)[0]
+
+# Batch statuses that mean the batch will never produce results
+BATCH_FAILED_STATUSES = ("failed", "expired", "cancelled")
+
+# Stands in for a batch ID in MOCK_MODE, where nothing is submitted
+_MOCK_BATCH_ID = "mock-batch"
+
+def submit_document_batch(clauses: Dict[str, str]) -> str:
+    """
+    Submit the summary and risk requests for every clause as one OpenAI batch job
+    
+    Batch jobs are billed at half the price of synchronous requests and have
+    separate rate limits, at the cost of completing within 24 hours rather than
+    immediately. Nothing waits for the job here; check on it with
+    check_document_batch.
+    
+    Args:
+        clauses: Dictionary with clause titles as keys and clause text as values
+        
+    Returns:
+        ID of the submitted batch
+    """
+    if MOCK_MODE:
+        return _MOCK_BATCH_ID
+    
+    # Repeated boilerplate only needs to be analyzed once
+    unique_clauses, _ = _dedupe_clauses(clauses)
+    
+    lines = []
+    for clause_title, clause_text in unique_clauses.items():
+        lines.append({"custom_id": f"sum-{clause_title}", "method": "POST", "url": "/v1/chat/completions",
+                      "body": _summary_request(clause_title, clause_text)})
+        lines.append({"custom_id": f"risk-{clause_title}", "method": "POST", "url": "/v1/chat/completions",
+                      "body": _risk_request(clause_title, clause_text)})
+    batch_input = "\n".join(json.dumps(line) for line in lines).encode('utf-8')
+    
+    input_file = get_client().files.create(file=("batch_input.jsonl", batch_input), purpose="batch")
+    batch = get_client().batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    logger.info(f"Submitted batch {batch.id} with {len(lines)} requests")
+    return batch.id
+
+def check_document_batch(batch_id: str, clauses: Dict[str, str]) -> Tuple[str, Optional[Tuple[Dict[str, str], Dict[str, List[str]], Dict[str, List[Dict[str, Any]]]]]]:
+    """
+    Check on a batch job once, without waiting for it
+    
+    Args:
+        batch_id: ID returned by submit_document_batch
+        clauses: The clauses the batch was submitted for
+        
+    Returns:
+        Tuple containing:
+        - The batch status, e.g. "in_progress", "completed" or one of BATCH_FAILED_STATUSES
+        - The results in the same shape as analyze_document once the batch has
+          completed, otherwise None
+    """
+    if MOCK_MODE:
+        summaries = {title: _mock_summary(title) for title in clauses}
+        risks = {title: _mock_risks(title) for title in clauses}
+        return "completed", (summaries, {title: r[0] for title, r in risks.items()}, {title: r[1] for title, r in risks.items()})
+    
+    try:
+        batch = get_client().batches.retrieve(batch_id)
+    except Exception:
+        logger.error(f"Could not check batch {batch_id}", exc_info=True)
+        return "unknown", None
+    
+    if batch.status in BATCH_FAILED_STATUSES:
+        logger.error(f"Batch {batch_id} finished with status {batch.status}")
+    if batch.status != "completed":
+        return batch.status, None
+    
+    logger.info(f"Batch {batch_id} completed")
+    unique_clauses, representative = _dedupe_clauses(clauses)
+    return batch.status, _scatter_results(collect_batch_results(batch, unique_clauses), representative)
+
+def collect_batch_results(batch: Any, clauses: Dict[str, str]) -> Tuple[Dict[str, str], Dict[str, List[str]], Dict[str, List[Dict[str, Any]]]]:
+    """
+    Read the output of a completed batch job into per-clause results
+    
+    Args:
+        batch: Completed batch object
+        clauses: The clauses the batch was submitted for
+        
+    Returns:
+        Tuple of dictionaries keyed by clause title, in the same shape as analyze_document
+    """
+    responses = {}
+    if batch.output_file_id:
+        for line in get_client().files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            result = _json_loads(line)
+            response = result.get("response") or {}
+            if response.get("status_code") == 200:
+                responses[result["custom_id"]] = response["body"]["choices"][0]["message"]["content"].strip()
+    
+    summaries = {}
+    simple_risks = {}
+    detailed_risks = {}
+    for clause_title, clause_text in clauses.items():
+        summary = responses.get(f"sum-{clause_title}")
+        if summary is not None:
+            store_result(make_cache_key(_SUMMARY_CACHE_NAMESPACE, clause_text), summary)
+            summaries[clause_title] = summary
+        else:
+            summaries[clause_title] = _fallback_summary(clause_title)
+        
+        risk_text = responses.get(f"risk-{clause_title}")
+        if risk_text is not None:
+            simple_risks[clause_title], detailed_risks[clause_title] = _parse_risk_response(risk_text)
+            store_result(make_cache_key(_RISK_CACHE_NAMESPACE, clause_text), {
+                "simple_risks": simple_risks[clause_title],
+                "detailed_risks": detailed_risks[clause_title]
+            })
+        else:
+            simple_risks[clause_title], detailed_risks[clause_title] = [], []
+    
+    return summaries, simple_risks, detailed_risks
+
+def _format_clause_blocks(items: List[Tuple[str, str]]) -> str:
+    """Enumerate clauses with id delimiters for a bulk prompt"""
+    return "\n\n".join(
+        f"<<CLAUSE id={clause_id}>>\nClause Title: {clause_title}\n\n{clause_text}\n<<END CLAUSE>>"
+        for clause_id, (clause_title, clause_text) in enumerate(items)
+    )
+
+def _parse_bulk_response(response_text: str) -> Dict[str, Any]:
+    """
+    Parse the JSON object returned for a bulk request
+    
+    Args:
+        response_text: Raw text returned by the model
+        
+    Returns:
+        Dictionary keyed by clause id
+        
+    Raises:
+        ValueError: If the response is not a JSON object
+    """
+    result = _json_loads(_extract_json_block(response_text).strip())
+    if not isinstance(result, dict):
+        raise ValueError("Response is not a JSON object")
+    return result
+
+def _chunks(items: List[Tuple[str, str]], size: int) -> List[List[Tuple[str, str]]]:
+    """Split items into lists of at most size elements"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def summarize_clause_bulk(items: List[Tuple[str, str]], clauses_per_request: int = BULK_CLAUSES_PER_REQUEST) -> Dict[str, str]:
+    """
+    Summarize several clauses with one request per clauses_per_request clauses
+    
+    Clauses the model leaves out of its response, or whole chunks whose response
+    can't be parsed, fall back to summarize_clause.
+    
+    Args:
+        items: List of (clause title, clause text) pairs
+        clauses_per_request: Maximum number of clauses packed into one request
+        
+    Returns:
+        Dictionary with clause titles as keys and summaries as values
+    """
+    if MOCK_MODE:
+        return {clause_title: _mock_summary(clause_title) for clause_title, _ in items}
+    
+    summaries = {}
+    pending = []
+    for clause_title, clause_text in items:
+        cached_summary = get_cached_result(make_cache_key(_SUMMARY_CACHE_NAMESPACE, clause_text))
+        if cached_summary is not None:
+            summaries[clause_title] = cached_summary
+        else:
+            pending.append((clause_title, clause_text))
+    
+    for chunk in _chunks(pending, clauses_per_request):
         try:
-            # First try to find JSON in the response
-            json_str = None
-            if "```json" in response_text:
-                json_str = response_text.split("```json")[1].split("```")[0]
-                logger.info("=== DEBUG: Found JSON in ```json block ===")
-                logger.info(json_str)
-                logger.info("=== END DEBUG ===")
-            elif "```" in response_text:
-                json_str = response_text.split("```")[1].split("```")[0]
-                logger.info("=== DEBUG: Found JSON in ``` block ===")
-                logger.info(json_str)
-                logger.info("=== END DEBUG ===")
+            response_text = _cached_chat(model=SUMMARY_MODEL,
+                messages=[
+                    _SYS_SUMMARY,
+                    {"role": "user", "content": BULK_SUMMARY_PROMPT.format(clause_blocks=_format_clause_blocks(chunk))}
+                ],
+                temperature=0.7,
+                max_tokens=min(220 * len(chunk), BULK_MAX_TOKENS),
+                response_format={"type": "json_object"}
+            )
+            results = _parse_bulk_response(response_text.strip())
+        except Exception as e:
+            logger.warning(f"Bulk summarization failed, falling back to per-clause requests: {str(e)}")
+            results = {}
+        
+        for clause_id, (clause_title, clause_text) in enumerate(chunk):
+            summary = results.get(str(clause_id))
+            if isinstance(summary, str) and summary.strip():
+                summaries[clause_title] = summary.strip()
+                store_result(make_cache_key(_SUMMARY_CACHE_NAMESPACE, clause_text), summaries[clause_title])
             else:
-                # Try to find JSON array in the text
-                json_match = re.search(r'\[\s*\{.*\}\s*\]', response_text, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group(0)
-                    st.write("=== DEBUG: Found JSON array in text ===")
-                    st.write(json_str)
-                    st.write("=== END DEBUG ===")
-                else:
-                    json_str = response_text
-                    st.write("=== DEBUG: Using entire response as JSON ===")
-                    st.write(json_str)
-                    st.write("=== END DEBUG ===")
-            
-            # Clean up the JSON string
-            json_str = json_str.strip()
-            # Remove any trailing commas
-            json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)
-            
-            # Parse the JSON
-            detailed_risks = json.loads(json_str)
-            
-            # Validate the structure
-            if not isinstance(detailed_risks, list):
-                raise ValueError("Response is not a JSON array")
-            
-            # Extract simple risks for backward compatibility
-            for risk_item in detailed_risks:
-                if not isinstance(risk_item, dict):
-                    raise ValueError("Risk item is not a dictionary")
-                if "explanation" not in risk_item:
-                    raise ValueError("Risk item missing 'explanation' field")
-                simple_risks.append(risk_item.get("explanation", ""))
-                
-        except (json.JSONDecodeError, ValueError, IndexError) as e:
-            logger.info("=== ERROR: JSON parsing failed in Risk  ===")
-            logger.info(f"Error type: {type(e).__name__}")
-            logger.info(f"Error message: {str(e)}")
-            logger.info(f"Response text: {response_text}")
-            logger.info(f"JSON string that failed: {json_str if 'json_str' in locals() else 'Not found'}")
-            logger.info("=== END ERROR ===")
-            
-            # Fallback to the old method for backward compatibility
-            if "no significant risks" in response_text.lower() or "no risks" in response_text.lower():
-                return [], []
-            
-            # Extract risk points
-            for line in response_text.split('\n'):
-                line = line.strip()
-                # Look for list items or paragraphs that describe risks
-                if (line.startswith('- ') or line.startswith('• ') or 
-                    line.startswith('* ') or line.startswith('Risk:')):
-                    # Clean up the line
-                    risk = line.lstrip('- •*').strip()
-                    if risk.lower().startswith('risk:'):
-                        risk = risk[5:].strip()
-                    
-                    if risk and len(risk) > 10:  # Only include substantial risk descriptions
-                        # Create a proper dictionary structure for the risk
-                        risk_dict = {
-                            "problematic_text": "",  # We don't have the exact text in this case
-                            "explanation": risk,
-                            "legal_reference": "General Australian contract law principles",
-                            "severity": "medium"  # Default to medium severity
-                        }
-                        detailed_risks.append(risk_dict)
-                        simple_risks.append(risk)
-            
-            # If we couldn't parse list items but there's content, use the whole response
-            if not detailed_risks and len(response_text) > 10:
-                risk_dict = {
-                    "problematic_text": "",  # We don't have the exact text in this case
-                    "explanation": response_text,
-                    "legal_reference": "General Australian contract law principles",
-                    "severity": "medium"  # Default to medium severity
-                }
-                detailed_risks = [risk_dict]
-                simple_risks = [response_text]
-                
-        return simple_risks, detailed_risks
+                summaries[clause_title] = summarize_clause(clause_title, clause_text)
     
-    except Exception as e:
-        print(f"Error in GPT risk analysis: {str(e)}")
-        logger.info(f"Error in GPT risk analysis: {str(e)}")
-        # Return empty lists if API call fails
-        return [], []
\ No newline at end of file
+    return {clause_title: summaries[clause_title] for clause_title, _ in items}
+
+def analyze_risks_bulk(items: List[Tuple[str, str]], clauses_per_request: int = BULK_CLAUSES_PER_REQUEST) -> Dict[str, Tuple[List[str], List[Dict[str, Any]]]]:
+    """
+    Analyze several clauses for risks with one request per clauses_per_request clauses
+    
+    Clauses the model leaves out of its response, or whole chunks whose response
+    can't be parsed, fall back to analyze_risks.
+    
+    Args:
+        items: List of (clause title, clause text) pairs
+        clauses_per_request: Maximum number of clauses packed into one request
+        
+    Returns:
+        Dictionary with clause titles as keys and (simple risks, detailed risks) tuples as values
+    """
+    if MOCK_MODE:
+        return {clause_title: _mock_risks(clause_title) for clause_title, _ in items}
+    
+    risks = {}
+    pending = []
+    for clause_title, clause_text in items:
+        cached_risks = get_cached_result(make_cache_key(_RISK_CACHE_NAMESPACE, clause_text))
+        if cached_risks is not None:
+            risks[clause_title] = (cached_risks["simple_risks"], cached_risks["detailed_risks"])
+        else:
+            pending.append((clause_title, clause_text))
+    
+    for chunk in _chunks(pending, clauses_per_request):
+        try:
+            response_text = _cached_chat(model=RISK_MODEL,
+                messages=[
+                    _SYS_RISK,
+                    {"role": "user", "content": BULK_RISK_PROMPT.format(clause_blocks=_format_clause_blocks(chunk))}
+                ],
+                temperature=0.1,
+                max_tokens=min(RISK_MAX_TOKENS * len(chunk), BULK_MAX_TOKENS),
+                response_format={"type": "json_object"}
+            )
+            results = _parse_bulk_response(response_text.strip())
+        except Exception as e:
+            logger.warning(f"Bulk risk analysis failed, falling back to per-clause requests: {str(e)}")
+            results = {}
+        
+        for clause_id, (clause_title, clause_text) in enumerate(chunk):
+            try:
+                detailed_risks = validate_risk_list(results.get(str(clause_id)))
+            except ValueError:
+                risks[clause_title] = analyze_risks(clause_title, clause_text)
+                continue
+            simple_risks = [risk["explanation"] for risk in detailed_risks]
+            risks[clause_title] = (simple_risks, detailed_risks)
+            store_result(make_cache_key(_RISK_CACHE_NAMESPACE, clause_text), {"simple_risks": simple_risks, "detailed_risks": detailed_risks})
+    
+    return {clause_title: risks[clause_title] for clause_title, _ in items}
+
+def summarize_clauses_batch(clauses: Dict[str, str]) -> Dict[str, str]:
+    """
+    Summarize every clause of a document in a single request
+    
+    Args:
+        clauses: Dictionary with clause titles as keys and clause text as values
+        
+    Returns:
+        Dictionary with clause titles as keys and summaries as values
+    """
+    unique_clauses, representative = _dedupe_clauses(clauses)
+    summaries = summarize_clause_bulk(list(unique_clauses.items()), clauses_per_request=max(len(unique_clauses), 1))
+    return _scatter_results((summaries,), representative)[0]
+
+def analyze_risks_batch(clauses: Dict[str, str]) -> Dict[str, Tuple[List[str], List[Dict[str, Any]]]]:
+    """
+    Analyze every clause of a document for risks in a single request
+    
+    Args:
+        clauses: Dictionary with clause titles as keys and clause text as values
+        
+    Returns:
+        Dictionary with clause titles as keys and (simple risks, detailed risks) tuples as values
+    """
+    unique_clauses, representative = _dedupe_clauses(clauses)
+    risks = analyze_risks_bulk(list(unique_clauses.items()), clauses_per_request=max(len(unique_clauses), 1))
+    return _scatter_results((risks,), representative)[0]
+
+# FAST_CACHE=0 restores st.cache_data in place of the in-process LRU
+FAST_CACHE = os.getenv("FAST_CACHE", "1") != "0"
+RESULT_CACHE_SIZE = 1024
+
+# Shared by every session, like st.cache_data
+_result_cache: "OrderedDict[bytes, Any]" = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+def _process_lru(func: Callable[..., Any], key_args: Optional[int] = None) -> Callable[..., Any]:
+    """
+    Cache a function's results in process memory, keyed by a BLAKE2b hash of its arguments
+    
+    Like st.cache_data the cache is shared across sessions and callers get
+    their own copy of each result, but copying is much cheaper than pickling
+    on every hit. Entries are evicted least recently used first beyond
+    RESULT_CACHE_SIZE.
+    
+    Args:
+        func: Function taking string arguments
+        key_args: Number of leading arguments that identify the result (all by default)
+        
+    Returns:
+        Caching wrapper around func
+    """
+    @functools.wraps(func)
+    def wrapper(*args):
+        digest = hashlib.blake2b(func.__name__.encode('utf-8'), digest_size=16)
+        for arg in args[:key_args]:
+            digest.update(b'\x00')
+            digest.update(arg.encode('utf-8'))
+        key = digest.digest()
+        
+        with _result_cache_lock:
+            if key in _result_cache:
+                _result_cache.move_to_end(key)
+                return copy.deepcopy(_result_cache[key])
+        
+        result = func(*args)
+        with _result_cache_lock:
+            _result_cache[key] = copy.deepcopy(result)
+            if len(_result_cache) > RESULT_CACHE_SIZE:
+                _result_cache.popitem(last=False)
+        return result
+    
+    return wrapper
+
+def _cached(func: Callable[..., Any], key_args: Optional[int] = None) -> Callable[..., Any]:
+    """Wrap an LLM function in the configured result cache"""
+    if FAST_CACHE:
+        return _process_lru(func, key_args)
+    import streamlit as st
+    return st.cache_data(ttl=3600, show_spinner=False)(func)
+
+# MOCK_MODE is fixed at startup, so choose each implementation once here
+# rather than checking the flag on every call. extract_clauses is keyed on
+# its doc_hash argument alone
+extract_clauses = _cached(_extract_clauses_mock if MOCK_MODE else _extract_clauses_real, key_args=1)
+summarize_clause = _cached(_summarize_clause_mock if MOCK_MODE else _summarize_clause_real)
+analyze_risks = _cached(_analyze_risks_mock if MOCK_MODE else _analyze_risks_real)
\ No newline at end of file
@@ -0,0 +1,161 @@
+"""
+Precomputed results for standard Australian contract clauses.
+
+Stock payment, IP, confidentiality, termination, liability and governing
+law clauses make up much of every contract. Their summaries and risk
+analyses are generated once offline with build_precomputed_cache and
+shipped in precomputed_clauses.json, so those clauses never need an LLM
+call.
+
+To (re)build the file, put the curated clauses in a JSON object mapping
+clause titles to clause text and run, with OPENAI_API_KEY set:
+
+    python -m utils.precomputed_cache standard_clauses.json
+
+Then commit utils/precomputed_clauses.json. Until it exists every lookup
+misses and clauses go through the LLM as usual.
+
+Entries are keyed by the clause title slug plus a digest of the normalised
+clause text, so a canned result is only used for the exact standard wording
+it was generated from.
+"""
+
+import os
+import re
+import sys
+import copy
+import json
+import hashlib
+import logging
+import functools
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PRECOMPUTED_PATH = os.path.join(os.path.dirname(__file__), "precomputed_clauses.json")
+
+# Checked once, so lookups cost nothing until the file is built and committed
+_available = os.path.exists(PRECOMPUTED_PATH)
+
+_NUMBERING_RE = re.compile(r'^\d+\.\s*')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+def title_slug(clause_title: str) -> str:
+    """
+    Normalise a clause title, e.g. "7. Limitation of Liability" -> "limitation of liability"
+
+    Args:
+        clause_title: Title or identifier of the clause
+
+    Returns:
+        Lowercase title without leading numbering
+    """
+    return _NUMBERING_RE.sub('', clause_title.strip().lower())
+
+def precomputed_key(clause_title: str, clause_text: str) -> str:
+    """
+    Build the lookup key for a clause
+
+    Whitespace and case are normalised so re-flowed copies of a standard
+    clause still match.
+
+    Args:
+        clause_title: Title or identifier of the clause
+        clause_text: Full text of the clause
+
+    Returns:
+        Key into PRECOMPUTED_SUMMARIES and PRECOMPUTED_RISKS
+    """
+    normalised_text = _WHITESPACE_RE.sub(' ', clause_text).strip().lower()
+    digest = hashlib.blake2b(normalised_text.encode('utf-8'), digest_size=16).hexdigest()
+    return f"{title_slug(clause_title)}:{digest}"
+
+@functools.lru_cache(maxsize=1)
+def _load() -> Tuple[Dict[str, str], Dict[str, List[Dict[str, Any]]]]:
+    """Load the precomputed summaries and risks"""
+    try:
+        with open(PRECOMPUTED_PATH, 'r', encoding='utf-8') as file:
+            entries = json.load(file)
+    except FileNotFoundError:
+        return {}, {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable precomputed clause cache: {str(e)}")
+        return {}, {}
+
+    summaries = {key: entry["summary"] for key, entry in entries.items() if "summary" in entry}
+    risks = {key: entry["risks"] for key, entry in entries.items() if "risks" in entry}
+    return summaries, risks
+
+def has_precomputed() -> bool:
+    """Whether there is a precomputed results file to look clauses up in"""
+    return _available
+
+def get_precomputed_summary(clause_title: str, clause_text: str) -> Optional[str]:
+    """Get the precomputed summary for a standard clause, if there is one"""
+    if not _available:
+        return None
+    return _load()[0].get(precomputed_key(clause_title, clause_text))
+
+def get_precomputed_risks(clause_title: str, clause_text: str) -> Optional[List[Dict[str, Any]]]:
+    """Get a copy of the precomputed detailed risks for a standard clause, if there are any"""
+    if not _available:
+        return None
+    risks = _load()[1].get(precomputed_key(clause_title, clause_text))
+    return copy.deepcopy(risks) if risks is not None else None
+
+def warmup(titles: Iterable[str] = ()) -> int:
+    """
+    Load the precomputed table ahead of the first request
+
+    Args:
+        titles: Clause titles about to be analysed
+
+    Returns:
+        Number of the given titles with at least one precomputed entry
+    """
+    if not _available:
+        return 0
+    summaries, risks = _load()
+    slugs = {key.split(':', 1)[0] for key in summaries} | {key.split(':', 1)[0] for key in risks}
+    return sum(1 for clause_title in titles if title_slug(clause_title) in slugs)
+
+def build_precomputed_cache(clauses: Dict[str, str], path: str = PRECOMPUTED_PATH) -> None:
+    """
+    Generate precomputed results for a curated set of standard clauses
+
+    This is run offline and its output committed; it calls the live LLM path
+    for every clause and overwrites the file. The LLM result cache still
+    applies, so rerunning with unchanged prompts and models is cheap.
+
+    Args:
+        clauses: Dictionary with standard clause titles as keys and their text as values
+        path: File to write the results to
+    """
+    # Imported here because llm_interface imports this module. The real
+    # implementations are used directly, since the public wrappers are
+    # mocked in MOCK_MODE and cache results in memory
+    from utils.llm_interface import _summarize_clause_real, _analyze_risks_real
+
+    entries = {}
+    for clause_title, clause_text in clauses.items():
+        _, detailed_risks = _analyze_risks_real(clause_title, clause_text)
+        entries[precomputed_key(clause_title, clause_text)] = {
+            "title": clause_title,
+            "summary": _summarize_clause_real(clause_title, clause_text),
+            "risks": detailed_risks
+        }
+
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(entries, file, indent=2, ensure_ascii=False)
+
+    global _available
+    _available = os.path.exists(PRECOMPUTED_PATH)
+    _load.cache_clear()
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python -m utils.precomputed_cache <clauses.json>")
+    with open(sys.argv[1], 'r', encoding='utf-8') as clauses_file:
+        standard_clauses = json.load(clauses_file)
+    build_precomputed_cache(standard_clauses)
+    print(f"Wrote {len(standard_clauses)} precomputed clauses to {PRECOMPUTED_PATH}")
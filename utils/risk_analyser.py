@@ -5,6 +5,8 @@ This provides rule-based analysis to supplement the LLM analysis.
 
 from typing import Dict, List, Tuple, Set
 import re
+import functools
+import ahocorasick
 
 # Key terms and phrases that often indicate unfair terms under Australian Consumer Law
 UNFAIR_TERM_INDICATORS = {
@@ -46,6 +48,51 @@ UNFAIR_TERM_INDICATORS = {
     ]
 }
 
+# Risk message for each indicator category, formatted with the matched phrase
+_MSG = {
+    "termination": "This clause contains potentially unfair termination language ('{}'). Under Australian Consumer Law, termination rights should be balanced between parties.",
+    "liability": "This clause contains broad liability exclusions ('{}'). The Australian Consumer Law limits how much a business can exclude liability, especially for negligence or statutory guarantees.",
+    "amendment": "This clause allows unilateral changes to terms ('{}'). The ACCC guidelines highlight this as potentially unfair under Australian Consumer Law.",
+    "penalty": "This clause includes what may be considered penalty provisions ('{}'). Australian courts generally won't enforce penalty clauses that aren't a genuine pre-estimate of loss.",
+    "indemnity": "This clause contains broad indemnity language ('{}'). Overly broad indemnities may be considered unfair for small businesses under Australian Consumer Law."
+}
+
+def _build_indicator_automaton() -> ahocorasick.Automaton:
+    """
+    Compile every unfair term indicator into one automaton
+    
+    Each phrase maps to its position in UNFAIR_TERM_INDICATORS and its
+    formatted risk message, so hits can be reported in the original order.
+    """
+    automaton = ahocorasick.Automaton()
+    position = 0
+    for category, phrases in UNFAIR_TERM_INDICATORS.items():
+        for phrase in phrases:
+            automaton.add_word(phrase.lower(), (position, _MSG[category].format(phrase)))
+            position += 1
+    automaton.make_automaton()
+    return automaton
+
+# Finds every unfair term indicator in a single pass over the clause text
+_INDICATOR_AUTOMATON = _build_indicator_automaton()
+
+# Notice periods like "X days notice", "notice of X days", "X days written notice"
+# or "X days before". The alternatives are fused into one lookahead so a single
+# scan finds every period, including ones that overlap another match; the
+# lookbehind stops it re-matching the tail of a longer number
+_NOTICE_RE = re.compile(
+    r"(?=(?<!\d)(\d+)\s*(?:calendar|business)?\s*days['\s]*(?:notice|before|prior|(?:written|advance)\s*notice)"
+    r"|notice\s*(?:period|)\s*(?:of|)\s*(\d+)\s*(?:calendar|business)?\s*days)",
+    re.IGNORECASE
+)
+
+# Percentage fees like "X% fee" or "interest at X%", fused the same way
+_PCT_RE = re.compile(
+    r"(?=(?<!\d)(?<!\d\.)(\d+(?:\.\d+)?)\s*%\s*(?:fee|charge|penalty|interest)"
+    r"|(?:fee|charge|penalty|interest)\s*(?:of|is|at)\s*(\d+(?:\.\d+)?)\s*%)",
+    re.IGNORECASE
+)
+
 # Australian-specific legal references for common clause issues
 AUSTRALIAN_LAW_REFERENCES = {
     "unfair_terms": "Under the Australian Consumer Law (Competition and Consumer Act 2010), a term is unfair if it causes a significant imbalance in the parties' rights, is not reasonably necessary to protect legitimate interests, and would cause detriment if relied upon.",
@@ -79,24 +126,19 @@ def analyze_clause_risks(clause_title: str, clause_text: str) -> List[str]:
     Returns:
         List of potential risk statements with Australian legal context
     """
-    risks = []
+    return list(_analyze_clause_risks(clause_title, clause_text))
+
+# Results depend only on the clause, so reruns over the same document are cache
+# hits. They are cached as tuples so no caller can mutate a shared result
+@functools.lru_cache(maxsize=512)
+def _analyze_clause_risks(clause_title: str, clause_text: str) -> Tuple[str, ...]:
+    """Run the rule-based analysis behind analyze_clause_risks"""
     clause_text_lower = clause_text.lower()
     clause_title_lower = clause_title.lower()
     
-    # Check for unfair term indicators
-    for category, phrases in UNFAIR_TERM_INDICATORS.items():
-        for phrase in phrases:
-            if phrase.lower() in clause_text_lower:
-                if category == "termination":
-                    risks.append(f"This clause contains potentially unfair termination language ('{phrase}'). Under Australian Consumer Law, termination rights should be balanced between parties.")
-                elif category == "liability":
-                    risks.append(f"This clause contains broad liability exclusions ('{phrase}'). The Australian Consumer Law limits how much a business can exclude liability, especially for negligence or statutory guarantees.")
-                elif category == "amendment":
-                    risks.append(f"This clause allows unilateral changes to terms ('{phrase}'). The ACCC guidelines highlight this as potentially unfair under Australian Consumer Law.")
-                elif category == "penalty":
-                    risks.append(f"This clause includes what may be considered penalty provisions ('{phrase}'). Australian courts generally won't enforce penalty clauses that aren't a genuine pre-estimate of loss.")
-                elif category == "indemnity":
-                    risks.append(f"This clause contains broad indemnity language ('{phrase}'). Overly broad indemnities may be considered unfair for small businesses under Australian Consumer Law.")
+    # Check for unfair term indicators, reporting each phrase once in indicator order
+    hits = dict(value for _, value in _INDICATOR_AUTOMATON.iter(clause_text_lower))
+    risks = [hits[position] for position in sorted(hits)]
     
     # Check for specific clause types
     if "govern" in clause_title_lower and "law" in clause_title_lower:
@@ -127,51 +169,16 @@ def analyze_clause_risks(clause_title: str, clause_text: str) -> List[str]:
     if "entire agreement" in clause_text_lower or "whole agreement" in clause_text_lower:
         risks.append("This 'entire agreement' clause may attempt to exclude liability for pre-contractual representations. Under Australian law, businesses cannot contract out of liability for misleading or deceptive conduct.")
     
-    return risks
+    return tuple(risks)
 
 def extract_notice_periods(text: str) -> List[int]:
-    """Extract notice periods (in days) from text"""
-    notice_periods = []
-    
-    # Look for patterns like "X days notice" or "notice of X days"
-    patterns = [
-        r'(\d+)\s*(?:calendar|business)?\s*days[\'\s]*notice',
-        r'notice\s*(?:period|)\s*(?:of|)\s*(\d+)\s*(?:calendar|business)?\s*days',
-        r'(\d+)\s*(?:calendar|business)?\s*days[\'\s]*(?:written|advance|prior)\s*notice',
-        r'(\d+)\s*(?:calendar|business)?\s*days[\'\s]*(?:before|prior)'
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for match in matches:
-            try:
-                days = int(match)
-                notice_periods.append(days)
-            except (ValueError, TypeError):
-                continue
-    
-    return notice_periods
+    """Extract notice periods (in days) from text, once per place they are stated, in text order"""
+    # Exactly one of the two groups matches, and it is always all digits
+    return [int(days or alt_days) for days, alt_days in _NOTICE_RE.findall(text)]
 
 def extract_percentage_fees(text: str) -> List[float]:
-    """Extract percentage fees from text"""
-    percentage_fees = []
-    
-    # Look for patterns like "X% fee" or "fee of X%"
-    patterns = [
-        r'(\d+(?:\.\d+)?)\s*%\s*(?:fee|charge|penalty|interest)',
-        r'(?:fee|charge|penalty|interest)\s*(?:of|is|at)\s*(\d+(?:\.\d+)?)\s*%'
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for match in matches:
-            try:
-                percentage = float(match)
-                percentage_fees.append(percentage)
-            except (ValueError, TypeError):
-                continue
-    
-    return percentage_fees
+    """Extract percentage fees from text, once per place they are stated, in text order"""
+    return [float(percentage or alt_percentage) for percentage, alt_percentage in _PCT_RE.findall(text)]
 
 def get_australian_law_reference(risk_category: str) -> str:
     """Get relevant Australian legal references for a risk category"""
@@ -0,0 +1,97 @@
+"""
+Typed schema for the risk analysis responses returned by the LLM.
+
+Validating with pydantic replaces per-item dict introspection and fills in
+the defaults for fields the model leaves out.
+"""
+
+from typing import Any, Dict, List, Union
+
+from pydantic import BaseModel, TypeAdapter, ValidationInfo, field_validator
+
+DEFAULT_LEGAL_REFERENCE = "General Australian contract law principles"
+DEFAULT_SEVERITY = "medium"
+
+class Risk(BaseModel):
+    """A single risk identified in a clause"""
+    problematic_text: str = ""
+    explanation: str
+    legal_reference: str = DEFAULT_LEGAL_REFERENCE
+    severity: str = DEFAULT_SEVERITY
+
+    @field_validator("problematic_text", "legal_reference", "severity", mode="before")
+    @classmethod
+    def _null_to_default(cls, value: Any, info: ValidationInfo) -> Any:
+        """Treat explicit nulls from the model as missing fields"""
+        return cls.model_fields[info.field_name].default if value is None else value
+
+class RiskResponse(BaseModel):
+    """Structured output response, which wraps the risk array in an object"""
+    risks: List[Risk]
+
+# Structured output format for risk requests. The server constrains decoding
+# to this schema, so responses always parse into RiskResponse
+RISK_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "risks",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "risks": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "problematic_text": {"type": "string"},
+                            "explanation": {"type": "string"},
+                            "legal_reference": {"type": "string"},
+                            "severity": {"type": "string", "enum": ["high", "medium", "low"]}
+                        },
+                        "required": ["problematic_text", "explanation", "legal_reference", "severity"],
+                        "additionalProperties": False
+                    }
+                }
+            },
+            "required": ["risks"],
+            "additionalProperties": False
+        }
+    }
+}
+
+# Accept both the wrapped object and a bare array from older responses
+_RISK_RESPONSE_ADAPTER = TypeAdapter(Union[RiskResponse, List[Risk]])
+_RISK_LIST_ADAPTER = TypeAdapter(List[Risk])
+
+def parse_risks(json_str: str) -> List[Dict[str, Any]]:
+    """
+    Parse and validate a JSON risk response
+
+    Args:
+        json_str: JSON text, either {"risks": [...]} or a bare array
+
+    Returns:
+        List of risk dictionaries with every field present
+
+    Raises:
+        pydantic.ValidationError: If the text isn't valid JSON or doesn't match the schema
+    """
+    parsed = _RISK_RESPONSE_ADAPTER.validate_json(json_str)
+    risks = parsed.risks if isinstance(parsed, RiskResponse) else parsed
+    return [risk.model_dump() for risk in risks]
+
+def validate_risk_list(value: Any) -> List[Dict[str, Any]]:
+    """
+    Validate an already-parsed risk list, e.g. one entry of a bulk response
+
+    Args:
+        value: Parsed JSON value expected to be a list of risks
+
+    Returns:
+        List of risk dictionaries with every field present
+
+    Raises:
+        pydantic.ValidationError: If the value doesn't match the schema
+    """
+    return [risk.model_dump() for risk in _RISK_LIST_ADAPTER.validate_python(value)]
@@ -0,0 +1,227 @@
+"""
+Semantic cache for clause-level LLM results.
+
+The exact-match cache in utils.llm_cache misses on clauses that differ only
+in whitespace, numbering or light re-wording. This cache stores an embedding
+of each analysed clause in a FAISS HNSW inner-product index and reuses the
+stored result when a new clause's embedding is close enough.
+
+Entries are appended to a SQLite table as they are added, so storing a result
+never rewrites the rest of the cache. The FAISS index uses the SQLite row ids
+as its ids and is only written out every few adds and at exit; on load, any
+rows the persisted index is missing are added back from SQLite.
+"""
+
+import os
+import json
+import time
+import atexit
+import sqlite3
+import logging
+import tempfile
+import threading
+from typing import Any, Optional
+
+import faiss
+import numpy as np
+
+from config import SEMANTIC_CACHE_DIR
+
+# Results are decoded on every cache hit, so use orjson when available
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = lambda value: json.dumps(value).encode('utf-8')
+
+logger = logging.getLogger(__name__)
+
+# Dimension of text-embedding-3-small vectors
+EMBEDDING_DIM = 1536
+
+# Minimum cosine similarity for a cached result to be reused. Risk analyses
+# quote the clause and turn on exact figures, so they need a closer match
+SIMILARITY_THRESHOLD = 0.95
+RISK_SIMILARITY_THRESHOLD = 0.98
+
+# HNSW graph parameters: neighbours per node, build-time and query-time search breadth
+HNSW_NEIGHBOURS = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+# Cached results older than this are treated as misses and dropped on the next load
+CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Number of adds between writes of the FAISS index; rows added since the last
+# write are recovered from SQLite on load, so this only bounds rebuild work
+SAVE_EVERY_ADDS = 32
+
+class SemanticCache:
+    """
+    Nearest-neighbour cache of LLM results, persisted under SEMANTIC_CACHE_DIR
+
+    Each cache is scoped by name (e.g. function and model) so summaries and
+    risk analyses never answer for each other.
+    """
+
+    def __init__(self, name: str, threshold: float = SIMILARITY_THRESHOLD):
+        self.name = name
+        self.threshold = threshold
+        self._index_path = os.path.join(SEMANTIC_CACHE_DIR, f"{name}.faiss")
+        self._db_path = os.path.join(SEMANTIC_CACHE_DIR, f"{name}.sqlite3")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._unsaved_adds = 0
+        self._index = self._load()
+        atexit.register(self.save)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection to the cache database, creating the database if needed"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(SEMANTIC_CACHE_DIR, exist_ok=True)
+            conn = sqlite3.connect(self._db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "id INTEGER PRIMARY KEY, vector BLOB NOT NULL, result BLOB NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def _load(self):
+        """Load the persisted index and bring it up to date with the unexpired rows in SQLite"""
+        try:
+            conn = self._connection()
+            conn.execute("DELETE FROM entries WHERE created_at <= ?", (time.time() - CACHE_TTL_SECONDS,))
+            rows = conn.execute("SELECT id, vector FROM entries").fetchall()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Ignoring unreadable semantic cache {self.name}: {str(e)}")
+            return self._new_index()
+
+        index = self._read_index()
+        row_ids = {row_id for row_id, _ in rows}
+        if index is not None:
+            indexed_ids = set(faiss.vector_to_array(index.id_map).tolist())
+            # HNSW can't remove vectors, so expired entries mean a rebuild
+            if not indexed_ids <= row_ids:
+                logger.info(f"Semantic cache {self.name} has expired entries, rebuilding its index")
+                index = None
+        if index is None:
+            index, indexed_ids = self._new_index(), set()
+
+        missing = [(row_id, vector) for row_id, vector in rows if row_id not in indexed_ids]
+        if missing:
+            vectors = np.vstack([np.frombuffer(vector, dtype=np.float32) for _, vector in missing])
+            index.add_with_ids(vectors, np.array([row_id for row_id, _ in missing], dtype=np.int64))
+            self._unsaved_adds = len(missing)
+        return index
+
+    def _read_index(self):
+        """Read the persisted index, or None if it is missing, unreadable or of an old type"""
+        try:
+            index = faiss.read_index(self._index_path)
+        except (OSError, RuntimeError) as e:
+            if os.path.exists(self._index_path):
+                logger.warning(f"Ignoring unreadable semantic cache index {self.name}: {str(e)}")
+            return None
+        if not isinstance(index, faiss.IndexIDMap):
+            logger.info(f"Semantic cache {self.name} uses an old index type, rebuilding it")
+            return None
+        faiss.downcast_index(index.index).hnsw.efSearch = HNSW_EF_SEARCH
+        return index
+
+    @staticmethod
+    def _new_index():
+        """
+        Create an empty HNSW index, which keeps lookups sub-millisecond as the cache grows,
+        mapped to SQLite row ids
+        """
+        hnsw = faiss.IndexHNSWFlat(EMBEDDING_DIM, HNSW_NEIGHBOURS, faiss.METRIC_INNER_PRODUCT)
+        hnsw.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        hnsw.hnsw.efSearch = HNSW_EF_SEARCH
+        return faiss.IndexIDMap(hnsw)
+
+    def save(self) -> None:
+        """Write the index out atomically if anything has been added since the last write"""
+        with self._lock:
+            self._save()
+
+    def _save(self) -> None:
+        """Write the index out atomically; the caller must hold the lock"""
+        if self._unsaved_adds == 0:
+            return
+        tmp_path = None
+        try:
+            os.makedirs(SEMANTIC_CACHE_DIR, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=SEMANTIC_CACHE_DIR, suffix=".faiss", delete=False) as tmp_file:
+                tmp_path = tmp_file.name
+            faiss.write_index(self._index, tmp_path)
+            os.replace(tmp_path, self._index_path)
+            self._unsaved_adds = 0
+        except (OSError, RuntimeError) as e:
+            logger.warning(f"Could not write semantic cache {self.name}: {str(e)}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        """Shape a vector for FAISS and scale it to unit length, so inner product is cosine similarity"""
+        vector = np.asarray(vector, dtype=np.float32).reshape(1, -1).copy()
+        faiss.normalize_L2(vector)
+        return vector
+
+    def lookup(self, vector: np.ndarray) -> Optional[Any]:
+        """
+        Find the cached result for the most similar clause
+
+        Args:
+            vector: Embedding of the clause being analysed
+
+        Returns:
+            The cached result, or None if no clause is similar enough
+        """
+        with self._lock:
+            if self._index.ntotal == 0:
+                return None
+            scores, ids = self._index.search(self._normalize(vector), 1)
+        if ids[0][0] < 0 or scores[0][0] < self.threshold:
+            return None
+        try:
+            row = self._connection().execute(
+                "SELECT result FROM entries WHERE id = ? AND created_at > ?",
+                (int(ids[0][0]), time.time() - CACHE_TTL_SECONDS)
+            ).fetchone()
+            if row is None:
+                return None
+            logger.info(f"Semantic cache {self.name} hit with similarity {scores[0][0]:.3f}")
+            return _json_loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Ignoring unreadable semantic cache entry {self.name}: {str(e)}")
+            return None
+
+    def add(self, vector: np.ndarray, result: Any) -> None:
+        """
+        Store the result for a clause
+
+        Args:
+            vector: Embedding of the clause
+            result: JSON-serialisable result to store
+        """
+        vector = self._normalize(vector)
+        with self._lock:
+            try:
+                row_id = self._connection().execute(
+                    "INSERT INTO entries (vector, result, created_at) VALUES (?, ?, ?)",
+                    (vector.tobytes(), _json_dumps(result), time.time())
+                ).lastrowid
+            except (OSError, sqlite3.Error, TypeError) as e:
+                logger.warning(f"Could not write semantic cache entry {self.name}: {str(e)}")
+                return
+            self._index.add_with_ids(vector, np.array([row_id], dtype=np.int64))
+            self._unsaved_adds += 1
+            if self._unsaved_adds >= SAVE_EVERY_ADDS:
+                self._save()
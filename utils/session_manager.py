@@ -1,6 +1,32 @@
 import streamlit as st
-from typing import Dict, List, Any, Optional
+import ahocorasick
+from typing import Dict, List, Any, Mapping, Optional
 from utils.llm_interface import summarize_clause, analyze_risks
+from utils.australian_law import freeze
+
+# Keywords used to estimate a clause's risk level when no GPT analysis is available
+_HIGH_RISK_INDICATORS = (
+    'indemnify', 'warranty', 'liability', 'termination',
+    'confidential', 'exclusive', 'assignment', 'jurisdiction',
+    'penalty', 'damages', 'breach', 'default'
+)
+_MEDIUM_RISK_INDICATORS = (
+    'payment', 'fee', 'cost', 'expense', 'charge',
+    'notice', 'period', 'time', 'date', 'deadline'
+)
+
+def _build_risk_indicator_automaton() -> ahocorasick.Automaton:
+    """Compile the risk indicator keywords into one automaton valued by (risk level, keyword)"""
+    automaton = ahocorasick.Automaton()
+    for indicator in _HIGH_RISK_INDICATORS:
+        automaton.add_word(indicator, ('high', indicator))
+    for indicator in _MEDIUM_RISK_INDICATORS:
+        automaton.add_word(indicator, ('medium', indicator))
+    automaton.make_automaton()
+    return automaton
+
+# Finds every risk indicator in a single pass over the clause text
+_RISK_INDICATOR_AUTOMATON = _build_risk_indicator_automaton()
 
 def initialize_session_state():
     """Initialize all session state variables"""
@@ -27,7 +53,8 @@ def initialize_session_state():
             'total_risks': 0,
             'high_risk_clauses': [],
             'medium_risk_clauses': [],
-            'low_risk_clauses': []
+            'low_risk_clauses': [],
+            'clause_risk_level': {}
         }
     
     if 'current_clause' not in st.session_state:
@@ -48,14 +75,27 @@ def initialize_session_state():
     if 'clause_user_notes' not in st.session_state:
         st.session_state.clause_user_notes = {}
 
-def update_risk_metrics(clauses):
-    """Update risk metrics based on analyzed clauses"""
-    # Reset risk metrics
-    st.session_state.risk_metrics = {
+@st.cache_data(show_spinner=False, max_entries=64)
+def compute_risk_metrics(clauses: Dict[str, str], clause_detailed_risks: Dict[str, List[Dict[str, Any]]], clause_simple_risks: Dict[str, List[str]]) -> Dict[str, Any]:
+    """
+    Compute risk metrics for a set of analyzed clauses
+    
+    Pure, so Streamlit reruns over the same document reuse the cached result.
+    
+    Args:
+        clauses: Dictionary with clause titles as keys and clause text as values
+        clause_detailed_risks: Detailed GPT risks for each clause
+        clause_simple_risks: Simple GPT risk statements for each clause
+        
+    Returns:
+        Risk metrics dictionary, in the shape stored in st.session_state.risk_metrics
+    """
+    risk_metrics = {
         'total_risks': 0,
         'high_risk_clauses': [],
         'medium_risk_clauses': [],
-        'low_risk_clauses': []
+        'low_risk_clauses': [],
+        'clause_risk_level': {}  # Clause title -> risk level, for O(1) lookups
     }
     
     # First check if we have detailed risk analysis from GPT
@@ -63,9 +103,8 @@ def update_risk_metrics(clauses):
     
     for clause_id in clauses.keys():
         # Get the detailed risks for this clause if available
-        detailed_risks = st.session_state.get('clause_detailed_risks', {}).get(clause_id, [])
-        simple_risks = st.session_state.get('clause_simple_risks', {}).get(clause_id, [])
-        
+        detailed_risks = clause_detailed_risks.get(clause_id, [])
+        simple_risks = clause_simple_risks.get(clause_id, [])
         # If we have GPT-analyzed risks, use them to determine risk level
         if detailed_risks:
             # Count risks by severity
@@ -74,11 +113,11 @@ def update_risk_metrics(clauses):
             
             # Determine risk level based on risk counts
             if high_risks > 0:
-                st.session_state.risk_metrics['high_risk_clauses'].append(clause_id)
+                risk_level = 'high'
             elif medium_risks > 0 or len(simple_risks) > 0:
-                st.session_state.risk_metrics['medium_risk_clauses'].append(clause_id)
+                risk_level = 'medium'
             else:
-                st.session_state.risk_metrics['low_risk_clauses'].append(clause_id)
+                risk_level = 'low'
                 
             # Add to total risk count
             total_risks += len(detailed_risks)
@@ -86,42 +125,47 @@ def update_risk_metrics(clauses):
             # Fallback to keyword-based risk analysis if GPT analysis is not available
             clause_text = clauses[clause_id]
             
-            # Analyze the clause text for risk indicators
-            risk_indicators = {
-                'high': [
-                    'indemnify', 'warranty', 'liability', 'termination',
-                    'confidential', 'exclusive', 'assignment', 'jurisdiction',
-                    'penalty', 'damages', 'breach', 'default'
-                ],
-                'medium': [
-                    'payment', 'fee', 'cost', 'expense', 'charge',
-                    'notice', 'period', 'time', 'date', 'deadline'
-                ]
-            }
-            
-            # Count risk indicators
-            high_risk_count = sum(1 for indicator in risk_indicators['high'] 
-                                if indicator.lower() in clause_text.lower())
-            medium_risk_count = sum(1 for indicator in risk_indicators['medium'] 
-                                  if indicator.lower() in clause_text.lower())
+            # Count the distinct risk indicators in the clause text. The
+            # indicators are all lowercase, so the text is lowercased once
+            clause_text_lower = clause_text.lower()
+            found = {'high': set(), 'medium': set()}
+            for _, (level, indicator) in _RISK_INDICATOR_AUTOMATON.iter(clause_text_lower):
+                found[level].add(indicator)
+                # Two distinct high-risk indicators already make the clause high risk
+                if len(found['high']) >= 2:
+                    break
+            high_risk_count = len(found['high'])
+            medium_risk_count = len(found['medium'])
             
             # Determine risk level
             if high_risk_count >= 2:
                 risk_level = 'high'
-                st.session_state.risk_metrics['high_risk_clauses'].append(clause_id)
             elif high_risk_count >= 1 or medium_risk_count >= 2:
                 risk_level = 'medium'
-                st.session_state.risk_metrics['medium_risk_clauses'].append(clause_id)
             else:
                 risk_level = 'low'
-                st.session_state.risk_metrics['low_risk_clauses'].append(clause_id)
             
             # Add to total risk count (only count medium and high risks)
             if risk_level != 'low':
                 total_risks += 1
+        
+        risk_metrics[f'{risk_level}_risk_clauses'].append(clause_id)
+        risk_metrics['clause_risk_level'][clause_id] = risk_level
     
-    # Update total risks
-    st.session_state.risk_metrics['total_risks'] = total_risks
+    risk_metrics['total_risks'] = total_risks
+    return risk_metrics
+
+def update_risk_metrics(clauses):
+    """Update risk metrics based on analyzed clauses"""
+    detailed_risks = st.session_state.get('clause_detailed_risks', {})
+    simple_risks = st.session_state.get('clause_simple_risks', {})
+    
+    # Only pass this document's risks, so the cache key doesn't depend on earlier documents
+    st.session_state.risk_metrics = compute_risk_metrics(
+        clauses,
+        {clause_id: detailed_risks.get(clause_id, []) for clause_id in clauses},
+        {clause_id: simple_risks.get(clause_id, []) for clause_id in clauses}
+    )
 
 def set_current_clause(clause_title: str) -> None:
     """
@@ -169,13 +213,8 @@ def get_current_clause_data() -> Dict[str, Any]:
         'low_risk_clauses': []
     })
     
-    # Determine risk level based on which list the clause is in
-    if current in risk_metrics['high_risk_clauses']:
-        risk_level = "high"
-    elif current in risk_metrics['medium_risk_clauses']:
-        risk_level = "medium"
-    else:
-        risk_level = "low"
+    # Look up the risk level computed by update_risk_metrics
+    risk_level = risk_metrics.get('clause_risk_level', {}).get(current, "low")
     
     # Get summary
     summary = st.session_state.get('clause_summaries', {}).get(current, "")
@@ -222,117 +261,124 @@ def save_user_note(clause_title: str, note_text: str) -> None:
         
     st.session_state.clause_user_notes[clause_title] = note_text
 
-def get_sample_contract_data() -> Dict[str, Any]:
+# Sample contract shown before a document is uploaded. Built once and shared
+# across reruns rather than rebuilt on every call, so it is frozen all the way
+# down (mappings and tuples) to stop any caller mutating the shared copy
+_SAMPLE_CONTRACT: Mapping[str, Any] = freeze({
+    "clauses": [
+        {
+            "title": "1. Definitions",
+            "text": "In this Agreement: 'Service' means the consulting services provided by the Consultant to the Client as described in Schedule A; 'Deliverables' means all documents, products, and materials developed by the Consultant in relation to the Services; 'Intellectual Property Rights' means patents, rights to inventions, copyright and related rights, trademarks, trade names and domain names, rights in get-up, goodwill and the right to sue for passing off, rights in designs, rights in computer software, database rights, rights to preserve the confidentiality of information (including know-how and trade secrets) and any other intellectual property rights, in each case whether registered or unregistered and including all applications (or rights to apply) for and renewals or extensions of, such rights and all similar or equivalent rights or forms of protection which subsist or will subsist now or in the future in any part of the world.",
+            "summary": "This section defines the key terms used throughout the agreement. It clarifies what constitutes the 'Service', 'Deliverables', and 'Intellectual Property Rights' so both parties have a clear understanding of these concepts when referenced elsewhere in the contract.",
+            "risks": [],
+            "risk_level": "low"
+        },
+        {
+            "title": "2. Scope of Work",
+            "text": "The Consultant shall provide the Services with reasonable skill and care. The Consultant shall allocate sufficient resources to provide the Services in accordance with this Agreement. The Consultant shall meet any agreed performance dates and times for the Services. Time shall not be of the essence in this Agreement.",
+            "summary": "This section outlines what work the consultant must do. It requires them to use reasonable skill, allocate enough resources, and meet agreed deadlines. However, the last sentence 'time shall not be of the essence' means that missing deadlines is not automatically considered a fundamental breach of contract.",
+            "risks": [],
+            "risk_level": "low"
+        },
+        {
+            "title": "3. Payment Terms",
+            "text": "The Client shall pay the Consultant within 30 days of receipt of invoice. Late payment shall incur interest at 2% above the Reserve Bank of Australia cash rate calculated from the due date until the date of actual payment. The Consultant may suspend the Services if payment is not received within 45 days of the invoice date. All amounts payable by the Client are exclusive of GST.",
+            "summary": "You must pay the consultant within 30 days after receiving their invoice. If you pay late, you'll be charged interest at 2% above the RBA cash rate. The consultant can stop working if you haven't paid within 45 days. All prices are subject to additional GST.",
+            "risks": [
+                "The 30-day payment term may be too long for small businesses with cash flow concerns."
+            ],
+            "detailed_risks": [
+                {
+                    "problematic_text": "The Client shall pay the Consultant within 30 days of receipt of invoice",
+                    "explanation": "The 30-day payment term may be too long for small businesses with cash flow concerns.",
+                    "legal_reference": "ACCC guidelines on fair payment terms for small businesses",
+                    "severity": "medium"
+                }
+            ],
+            "risk_level": "medium"
+        },
+        {
+            "title": "4. Intellectual Property",
+            "text": "All Intellectual Property Rights in the Deliverables shall be owned by the Client. The Consultant hereby assigns to the Client, with full title guarantee and free from all third party rights, all Intellectual Property Rights in the Deliverables. This assignment shall take effect on the date of this Agreement or as a present assignment of future rights that will take effect immediately on the creation of the Deliverables.",
+            "summary": "This clause gives the client ownership of all intellectual property created during the project. The consultant transfers all rights to the client automatically, both for existing work and anything created in the future under this contract.",
+            "risks": [],
+            "risk_level": "low"
+        },
+        {
+            "title": "5. Confidentiality",
+            "text": "Each party shall maintain the confidentiality of all information disclosed to it by the other party which is identified as confidential or which would reasonably be understood to be confidential in nature. Neither party shall use any confidential information of the other party for any purpose other than to perform its obligations under this Agreement. The obligations of confidentiality shall survive the termination of this Agreement and continue indefinitely.",
+            "summary": "Both parties must keep each other's sensitive information private and only use it for purposes related to this contract. This confidentiality requirement continues forever, even after the contract ends.",
+            "risks": [
+                "The confidentiality obligations continue indefinitely, which may be overly restrictive."
+            ],
+            "detailed_risks": [
+                {
+                    "problematic_text": "The obligations of confidentiality shall survive the termination of this Agreement and continue indefinitely",
+                    "explanation": "The confidentiality obligations continue indefinitely, which may be overly restrictive.",
+                    "legal_reference": "Australian common law on restraint of trade",
+                    "severity": "medium"
+                }
+            ],
+            "risk_level": "medium"
+        },
+        {
+            "title": "6. Termination",
+            "text": "This Agreement may be terminated by either party with 30 days written notice to the other party. Either party may terminate this Agreement immediately if the other party commits a material breach of this Agreement which is not remedied within 14 days of written notice, or if the other party becomes insolvent. Upon termination, the Client shall pay the Consultant for all Services provided up to the date of termination.",
+            "summary": "Either party can end this agreement with 30 days' notice. Immediate termination is possible if there's a serious breach that isn't fixed within 14 days, or if either party goes bankrupt. You'll still need to pay for all work completed up to the termination date.",
+            "risks": [
+                "The 30-day notice period for termination may be problematic if you need to exit quickly."
+            ],
+            "detailed_risks": [
+                {
+                    "problematic_text": "This Agreement may be terminated by either party with 30 days written notice",
+                    "explanation": "The 30-day notice period for termination may be problematic if you need to exit quickly.",
+                    "legal_reference": "ACCC guidelines on fair termination clauses",
+                    "severity": "low"
+                }
+            ],
+            "risk_level": "medium"
+        },
+        {
+            "title": "7. Limitation of Liability",
+            "text": "The Consultant's liability shall not exceed the fees paid by the Client to the Consultant under this Agreement. Neither party shall be liable for any indirect, special, incidental or consequential damages arising out of or in connection with this Agreement. Nothing in this Agreement shall limit or exclude either party's liability for death or personal injury caused by negligence, or fraud or fraudulent misrepresentation.",
+            "summary": "The consultant's liability is limited to the total amount you've paid them. Neither party is responsible for indirect damages like lost profits. However, they can't limit liability for negligence causing death/injury or for fraud.",
+            "risks": [
+                "This broad limitation of liability clause may be unenforceable under Australian Consumer Law for certain types of loss.",
+                "The clause attempts to exclude liability for consequential losses which may be unfair under the ACCC's unfair contract terms guidance."
+            ],
+            "detailed_risks": [
+                {
+                    "problematic_text": "The Consultant's liability shall not exceed the fees paid by the Client to the Consultant under this Agreement",
+                    "explanation": "This broad limitation of liability clause may be unenforceable under Australian Consumer Law for certain types of loss.",
+                    "legal_reference": "Section 64A of the Australian Consumer Law",
+                    "severity": "high"
+                },
+                {
+                    "problematic_text": "Neither party shall be liable for any indirect, special, incidental or consequential damages",
+                    "explanation": "The clause attempts to exclude liability for consequential losses which may be unfair under the ACCC's unfair contract terms guidance.",
+                    "legal_reference": "ACCC Unfair Contract Terms guidance",
+                    "severity": "high"
+                }
+            ],
+            "risk_level": "high"
+        },
+        {
+            "title": "8. Governing Law",
+            "text": "This Agreement is governed by the laws of New South Wales. The parties submit to the non-exclusive jurisdiction of the courts of New South Wales and courts of appeal from them for determining any dispute concerning this Agreement.",
+            "summary": "This contract is governed by New South Wales law. If there's a legal dispute, it will be handled in NSW courts, though other courts might also be able to hear the case.",
+            "risks": [],
+            "risk_level": "low"
+        }
+    ]
+})
+
+def get_sample_contract_data() -> Mapping[str, Any]:
     """
     Get sample contract data for demonstration
     
+    The data is shared between callers and must not be modified.
+    
     Returns:
-        Dictionary with sample clauses and risk information
+        Read-only mapping with sample clauses and risk information
     """
-    return {
-        "clauses": [
-            {
-                "title": "1. Definitions",
-                "text": "In this Agreement: 'Service' means the consulting services provided by the Consultant to the Client as described in Schedule A; 'Deliverables' means all documents, products, and materials developed by the Consultant in relation to the Services; 'Intellectual Property Rights' means patents, rights to inventions, copyright and related rights, trademarks, trade names and domain names, rights in get-up, goodwill and the right to sue for passing off, rights in designs, rights in computer software, database rights, rights to preserve the confidentiality of information (including know-how and trade secrets) and any other intellectual property rights, in each case whether registered or unregistered and including all applications (or rights to apply) for and renewals or extensions of, such rights and all similar or equivalent rights or forms of protection which subsist or will subsist now or in the future in any part of the world.",
-                "summary": "This section defines the key terms used throughout the agreement. It clarifies what constitutes the 'Service', 'Deliverables', and 'Intellectual Property Rights' so both parties have a clear understanding of these concepts when referenced elsewhere in the contract.",
-                "risks": [],
-                "risk_level": "low"
-            },
-            {
-                "title": "2. Scope of Work",
-                "text": "The Consultant shall provide the Services with reasonable skill and care. The Consultant shall allocate sufficient resources to provide the Services in accordance with this Agreement. The Consultant shall meet any agreed performance dates and times for the Services. Time shall not be of the essence in this Agreement.",
-                "summary": "This section outlines what work the consultant must do. It requires them to use reasonable skill, allocate enough resources, and meet agreed deadlines. However, the last sentence 'time shall not be of the essence' means that missing deadlines is not automatically considered a fundamental breach of contract.",
-                "risks": [],
-                "risk_level": "low"
-            },
-            {
-                "title": "3. Payment Terms",
-                "text": "The Client shall pay the Consultant within 30 days of receipt of invoice. Late payment shall incur interest at 2% above the Reserve Bank of Australia cash rate calculated from the due date until the date of actual payment. The Consultant may suspend the Services if payment is not received within 45 days of the invoice date. All amounts payable by the Client are exclusive of GST.",
-                "summary": "You must pay the consultant within 30 days after receiving their invoice. If you pay late, you'll be charged interest at 2% above the RBA cash rate. The consultant can stop working if you haven't paid within 45 days. All prices are subject to additional GST.",
-                "risks": [
-                    "The 30-day payment term may be too long for small businesses with cash flow concerns."
-                ],
-                "detailed_risks": [
-                    {
-                        "problematic_text": "The Client shall pay the Consultant within 30 days of receipt of invoice",
-                        "explanation": "The 30-day payment term may be too long for small businesses with cash flow concerns.",
-                        "legal_reference": "ACCC guidelines on fair payment terms for small businesses",
-                        "severity": "medium"
-                    }
-                ],
-                "risk_level": "medium"
-            },
-            {
-                "title": "4. Intellectual Property",
-                "text": "All Intellectual Property Rights in the Deliverables shall be owned by the Client. The Consultant hereby assigns to the Client, with full title guarantee and free from all third party rights, all Intellectual Property Rights in the Deliverables. This assignment shall take effect on the date of this Agreement or as a present assignment of future rights that will take effect immediately on the creation of the Deliverables.",
-                "summary": "This clause gives the client ownership of all intellectual property created during the project. The consultant transfers all rights to the client automatically, both for existing work and anything created in the future under this contract.",
-                "risks": [],
-                "risk_level": "low"
-            },
-            {
-                "title": "5. Confidentiality",
-                "text": "Each party shall maintain the confidentiality of all information disclosed to it by the other party which is identified as confidential or which would reasonably be understood to be confidential in nature. Neither party shall use any confidential information of the other party for any purpose other than to perform its obligations under this Agreement. The obligations of confidentiality shall survive the termination of this Agreement and continue indefinitely.",
-                "summary": "Both parties must keep each other's sensitive information private and only use it for purposes related to this contract. This confidentiality requirement continues forever, even after the contract ends.",
-                "risks": [
-                    "The confidentiality obligations continue indefinitely, which may be overly restrictive."
-                ],
-                "detailed_risks": [
-                    {
-                        "problematic_text": "The obligations of confidentiality shall survive the termination of this Agreement and continue indefinitely",
-                        "explanation": "The confidentiality obligations continue indefinitely, which may be overly restrictive.",
-                        "legal_reference": "Australian common law on restraint of trade",
-                        "severity": "medium"
-                    }
-                ],
-                "risk_level": "medium"
-            },
-            {
-                "title": "6. Termination",
-                "text": "This Agreement may be terminated by either party with 30 days written notice to the other party. Either party may terminate this Agreement immediately if the other party commits a material breach of this Agreement which is not remedied within 14 days of written notice, or if the other party becomes insolvent. Upon termination, the Client shall pay the Consultant for all Services provided up to the date of termination.",
-                "summary": "Either party can end this agreement with 30 days' notice. Immediate termination is possible if there's a serious breach that isn't fixed within 14 days, or if either party goes bankrupt. You'll still need to pay for all work completed up to the termination date.",
-                "risks": [
-                    "The 30-day notice period for termination may be problematic if you need to exit quickly."
-                ],
-                "detailed_risks": [
-                    {
-                        "problematic_text": "This Agreement may be terminated by either party with 30 days written notice",
-                        "explanation": "The 30-day notice period for termination may be problematic if you need to exit quickly.",
-                        "legal_reference": "ACCC guidelines on fair termination clauses",
-                        "severity": "low"
-                    }
-                ],
-                "risk_level": "medium"
-            },
-            {
-                "title": "7. Limitation of Liability",
-                "text": "The Consultant's liability shall not exceed the fees paid by the Client to the Consultant under this Agreement. Neither party shall be liable for any indirect, special, incidental or consequential damages arising out of or in connection with this Agreement. Nothing in this Agreement shall limit or exclude either party's liability for death or personal injury caused by negligence, or fraud or fraudulent misrepresentation.",
-                "summary": "The consultant's liability is limited to the total amount you've paid them. Neither party is responsible for indirect damages like lost profits. However, they can't limit liability for negligence causing death/injury or for fraud.",
-                "risks": [
-                    "This broad limitation of liability clause may be unenforceable under Australian Consumer Law for certain types of loss.",
-                    "The clause attempts to exclude liability for consequential losses which may be unfair under the ACCC's unfair contract terms guidance."
-                ],
-                "detailed_risks": [
-                    {
-                        "problematic_text": "The Consultant's liability shall not exceed the fees paid by the Client to the Consultant under this Agreement",
-                        "explanation": "This broad limitation of liability clause may be unenforceable under Australian Consumer Law for certain types of loss.",
-                        "legal_reference": "Section 64A of the Australian Consumer Law",
-                        "severity": "high"
-                    },
-                    {
-                        "problematic_text": "Neither party shall be liable for any indirect, special, incidental or consequential damages",
-                        "explanation": "The clause attempts to exclude liability for consequential losses which may be unfair under the ACCC's unfair contract terms guidance.",
-                        "legal_reference": "ACCC Unfair Contract Terms guidance",
-                        "severity": "high"
-                    }
-                ],
-                "risk_level": "high"
-            },
-            {
-                "title": "8. Governing Law",
-                "text": "This Agreement is governed by the laws of New South Wales. The parties submit to the non-exclusive jurisdiction of the courts of New South Wales and courts of appeal from them for determining any dispute concerning this Agreement.",
-                "summary": "This contract is governed by New South Wales law. If there's a legal dispute, it will be handled in NSW courts, though other courts might also be able to hear the case.",
-                "risks": [],
-                "risk_level": "low"
-            }
-        ]
-    }
\ No newline at end of file
+    return _SAMPLE_CONTRACT
\ No newline at end of file
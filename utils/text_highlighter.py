@@ -6,357 +6,475 @@ with different severity levels, detailed annotations, and interactive navigation
 """
 
 import streamlit as st
+import functools
 import html
+import io
 import re
+import ahocorasick
 from typing import List, Dict, Any, Optional, Tuple
 import uuid
 import json
 
 
-class LegalTextAnalyzer:
+# Whitespace in the generated CSS, and whitespace around its punctuation
+_CSS_WS_RE = re.compile(r'\s+')
+_CSS_PUNCT_WS_RE = re.compile(r'\s*([{}:;,>])\s*')
+
+
+def _minify_css(css: str) -> str:
     """
-    A class that analyzes legal text and highlights problematic segments
-    with annotations and severity indicators.
+    Strip the indentation and optional whitespace from the generated CSS.
+    
+    Safe for this stylesheet because none of its values contain the
+    punctuation whose surrounding whitespace is removed.
+    
+    Args:
+        css (str): CSS wrapped in a <style> tag
+        
+    Returns:
+        str: Minified CSS
     """
+    return _CSS_PUNCT_WS_RE.sub(r'\1', _CSS_WS_RE.sub(' ', css)).strip()
 
-    SEVERITY_COLORS = {
-        "high": {"bg": "rgba(255, 0, 0, 0.15)", "border": "rgba(255, 0, 0, 0.6)", "text": "#990000"},
-        "medium": {"bg": "rgba(255, 153, 0, 0.15)", "border": "rgba(255, 153, 0, 0.6)", "text": "#b36b00"},
-        "low": {"bg": "rgba(255, 204, 0, 0.15)", "border": "rgba(255, 204, 0, 0.6)", "text": "#806600"},
-    }
 
-    def __init__(self):
-        """Initialize the LegalTextAnalyzer."""
-        self.unique_id = str(uuid.uuid4()).replace("-", "")[:8]
+def _minify_js(js: str) -> str:
+    """
+    Strip indentation, blank lines and comment-only lines from the generated JavaScript.
+    
+    Line breaks are kept, so automatic semicolon insertion and template
+    literals behave exactly as before.
+    
+    Args:
+        js (str): JavaScript wrapped in a <script> tag
         
-    def _generate_css(self) -> str:
-        """
-        Generate the CSS for styling the highlighted text and annotations with a dark theme.
+    Returns:
+        str: Minified JavaScript
+    """
+    lines = (line.strip() for line in js.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//'))
+
+
+@functools.lru_cache(maxsize=32)
+def _build_css(unique_id: str) -> str:
+    """
+    Build the component CSS, scoped to one analyzer's unique ID.
+    
+    The stylesheet only depends on the ID, so it is templated once per ID.
+    
+    Args:
+        unique_id (str): Value of the data-ps attribute every selector is scoped to
         
-        Returns:
-            str: CSS styles for the component
-        """
-        css = f"""
-        <style>
-            .legal-clause-{self.unique_id} {{
-                position: relative;
-                padding: 1.5rem;
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 8px;
-                margin-bottom: 1.25rem;
-                font-size: 1rem;
-                line-height: 1.6;
-                color: rgba(255, 255, 255, 0.87);
-                background-color: rgba(30, 30, 35, 0.7);
-                box-shadow: 0 4px 6px rgba(0, 0, 0, 0.2);
-                font-family: "Inter", "Georgia", serif;
-            }}
-            
-            .legal-clause-{self.unique_id}::before,
-            .legal-clause-{self.unique_id}::after {{
-                content: "⋯";
-                display: block;
-                color: rgba(255, 255, 255, 0.5);
-                font-size: 1.5rem;
-                margin: 0.5rem 0;
-                text-align: center;
-            }}
-            
-            .highlight-{self.unique_id} {{
-                cursor: pointer;
-                border-bottom-width: 2px;
-                border-bottom-style: solid;
-                padding: 0 2px;
-                position: relative;
-                transition: all 0.2s ease;
-                border-radius: 3px;
-            }}
-            
-            .highlight-{self.unique_id}:hover {{
-                filter: brightness(1.2);
-            }}
-            
-            .highlight-{self.unique_id}.active {{
-                filter: brightness(1.5);
-                box-shadow: 0 0 8px rgba(255, 255, 255, 0.3);
-            }}
-            
-            .annotation-ref-{self.unique_id} {{
-                font-size: 0.65rem;
-                vertical-align: super;
-                font-weight: 600;
-                margin-left: 1px;
-                margin-right: 1px;
-                opacity: 0.9;
-            }}
-            
-            .annotations-section-{self.unique_id} {{
-                margin-top: 2rem;
-                border-top: 1px solid rgba(255, 255, 255, 0.1);
-                padding-top: 1.5rem;
-            }}
-            
-            .annotations-section-{self.unique_id} h3 {{
-                color: rgba(255, 255, 255, 0.87);
-                margin-bottom: 1rem;
-                font-weight: 500;
-                font-family: "Inter", "Georgia", serif;
-            }}
-            
-            .annotation-item-{self.unique_id} {{
-                margin-bottom: 1.25rem;
+    Returns:
+        str: CSS styles for the component
+    """
+    css = f"""
+    <style>
+        [data-ps="{unique_id}"] .clause {{
+            position: relative;
+            padding: 1.5rem;
+            border: 1px solid rgba(255, 255, 255, 0.1);
+            border-radius: 8px;
+            margin-bottom: 1.25rem;
+            font-size: 1rem;
+            line-height: 1.6;
+            color: rgba(255, 255, 255, 0.87);
+            background-color: rgba(30, 30, 35, 0.7);
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.2);
+            font-family: "Inter", "Georgia", serif;
+        }}
+        
+        [data-ps="{unique_id}"] .clause::before,
+        [data-ps="{unique_id}"] .clause::after {{
+            content: "⋯";
+            display: block;
+            color: rgba(255, 255, 255, 0.5);
+            font-size: 1.5rem;
+            margin: 0.5rem 0;
+            text-align: center;
+        }}
+        
+        [data-ps="{unique_id}"] .hl {{
+            cursor: pointer;
+            border-bottom-width: 2px;
+            border-bottom-style: solid;
+            padding: 0 2px;
+            position: relative;
+            transition: all 0.2s ease;
+            border-radius: 3px;
+        }}
+        
+        [data-ps="{unique_id}"] .hl:hover {{
+            filter: brightness(1.2);
+        }}
+        
+        [data-ps="{unique_id}"] .hl.active {{
+            filter: brightness(1.5);
+            box-shadow: 0 0 8px rgba(255, 255, 255, 0.3);
+        }}
+        
+        [data-ps="{unique_id}"] .ref {{
+            font-size: 0.65rem;
+            vertical-align: super;
+            font-weight: 600;
+            margin-left: 1px;
+            margin-right: 1px;
+            opacity: 0.9;
+        }}
+        
+        [data-ps="{unique_id}"] .anns {{
+            margin-top: 2rem;
+            border-top: 1px solid rgba(255, 255, 255, 0.1);
+            padding-top: 1.5rem;
+        }}
+        
+        [data-ps="{unique_id}"] .anns h3 {{
+            color: rgba(255, 255, 255, 0.87);
+            margin-bottom: 1rem;
+            font-weight: 500;
+            font-family: "Inter", "Georgia", serif;
+        }}
+        
+        [data-ps="{unique_id}"] .ann {{
+            margin-bottom: 1.25rem;
+            padding: 1rem;
+            border-left: 3px solid rgba(255, 255, 255, 0.2);
+            background-color: rgba(40, 40, 45, 0.6);
+            border-radius: 0 6px 6px 0;
+            transition: all 0.2s ease;
+        }}
+        
+        [data-ps="{unique_id}"] .ann:hover {{
+            background-color: rgba(50, 50, 55, 0.7);
+        }}
+        
+        [data-ps="{unique_id}"] .ann.high {{
+            border-left-color: rgba(255, 70, 70, 0.9);
+        }}
+        
+        [data-ps="{unique_id}"] .ann.medium {{
+            border-left-color: rgba(255, 153, 0, 0.9);
+        }}
+        
+        [data-ps="{unique_id}"] .ann.low {{
+            border-left-color: rgba(255, 204, 0, 0.9);
+        }}
+        
+        [data-ps="{unique_id}"] .ann-head {{
+            font-weight: 600;
+            margin-bottom: 0.5rem;
+            cursor: pointer;
+            color: rgba(255, 255, 255, 0.9);
+            display: flex;
+            align-items: center;
+            justify-content: space-between;
+        }}
+        
+        [data-ps="{unique_id}"] .ann-head::after {{
+            content: "▼";
+            font-size: 0.75rem;
+            opacity: 0.7;
+            transition: transform 0.2s ease;
+        }}
+        
+        [data-ps="{unique_id}"] .ann-head.collapsed::after {{
+            transform: rotate(-90deg);
+        }}
+        
+        [data-ps="{unique_id}"] .ann-body {{
+            font-size: 0.9rem;
+            color: rgba(255, 255, 255, 0.8);
+            line-height: 1.5;
+        }}
+        
+        [data-ps="{unique_id}"] .legal-ref {{
+            font-style: italic;
+            margin-top: 0.5rem;
+            font-size: 0.8rem;
+            color: rgba(180, 180, 200, 0.7);
+        }}
+        
+        [data-ps="{unique_id}"] .legend {{
+            display: flex;
+            flex-wrap: wrap;
+            gap: 0.75rem;
+            margin: 1.25rem 0;
+            padding: 0.75rem 1rem;
+            border: 1px solid rgba(255, 255, 255, 0.1);
+            border-radius: 6px;
+            background-color: rgba(35, 35, 40, 0.7);
+            color: rgba(255, 255, 255, 0.87);
+        }}
+        
+        [data-ps="{unique_id}"] .legend-item {{
+            display: flex;
+            align-items: center;
+            margin-right: 1rem;
+            padding: 0.25rem 0;
+        }}
+        
+        [data-ps="{unique_id}"] .legend-color {{
+            display: inline-block;
+            width: 1.25rem;
+            height: 0.9rem;
+            margin-right: 0.5rem;
+            border-radius: 3px;
+            border-bottom-width: 2px;
+            border-bottom-style: solid;
+        }}
+        
+        [data-ps="{unique_id}"] .legend-label {{
+            font-size: 0.85rem;
+        }}
+
+        @media (max-width: 768px) {{
+            [data-ps="{unique_id}"] .clause {{
                 padding: 1rem;
-                border-left: 3px solid rgba(255, 255, 255, 0.2);
-                background-color: rgba(40, 40, 45, 0.6);
-                border-radius: 0 6px 6px 0;
-                transition: all 0.2s ease;
-            }}
-            
-            .annotation-item-{self.unique_id}:hover {{
-                background-color: rgba(50, 50, 55, 0.7);
-            }}
-            
-            .annotation-item-{self.unique_id}.high {{
-                border-left-color: rgba(255, 70, 70, 0.9);
-            }}
-            
-            .annotation-item-{self.unique_id}.medium {{
-                border-left-color: rgba(255, 153, 0, 0.9);
-            }}
-            
-            .annotation-item-{self.unique_id}.low {{
-                border-left-color: rgba(255, 204, 0, 0.9);
-            }}
-            
-            .annotation-header-{self.unique_id} {{
-                font-weight: 600;
-                margin-bottom: 0.5rem;
-                cursor: pointer;
-                color: rgba(255, 255, 255, 0.9);
-                display: flex;
-                align-items: center;
-                justify-content: space-between;
+                font-size: 0.9rem;
             }}
             
-            .annotation-header-{self.unique_id}::after {{
-                content: "▼";
-                font-size: 0.75rem;
-                opacity: 0.7;
-                transition: transform 0.2s ease;
+            [data-ps="{unique_id}"] .ann {{
+                padding: 0.75rem;
             }}
             
-            .annotation-header-{self.unique_id}.collapsed::after {{
-                transform: rotate(-90deg);
+            [data-ps="{unique_id}"] .legend {{
+                flex-direction: column;
+                gap: 0.5rem;
             }}
-            
-            .annotation-body-{self.unique_id} {{
-                font-size: 0.9rem;
-                color: rgba(255, 255, 255, 0.8);
-                line-height: 1.5;
-            }}
-            
-            .legal-reference-{self.unique_id} {{
-                font-style: italic;
-                margin-top: 0.5rem;
-                font-size: 0.8rem;
-                color: rgba(180, 180, 200, 0.7);
+        }}
+    </style>
+    """
+    return _minify_css(css)
+
+
+@functools.lru_cache(maxsize=32)
+def _build_js(unique_id: str) -> str:
+    """
+    Build the component JavaScript, scoped to one analyzer's unique ID.
+    
+    Args:
+        unique_id (str): Value of the data-ps attribute every selector is scoped to, and suffix for every function name
+        
+    Returns:
+        str: JavaScript code for the component
+    """
+    js = f"""
+    <script>
+        // The markup comes before this script, so every element is looked up once here
+        const highlights_{unique_id} = Array.from(document.querySelectorAll('[data-ps="{unique_id}"] .hl'));
+        const highlightsByRef_{unique_id} = {{}};
+        highlights_{unique_id}.forEach(el => {{
+            el.dataset.refIds.split(',').forEach(refId => {{
+                (highlightsByRef_{unique_id}[refId] ||= []).push(el);
+            }});
+        }});
+        const annotationsByRef_{unique_id} = {{}};
+        document.querySelectorAll('[data-ps="{unique_id}"] .ann').forEach(el => {{
+            annotationsByRef_{unique_id}[el.dataset.refId] = {{
+                item: el,
+                header: el.querySelector('.ann-head'),
+                body: el.querySelector('.ann-body')
+            }};
+        }});
+        
+        // Initialize collapsed state for annotations
+        document.addEventListener('DOMContentLoaded', () => {{
+            // Set all annotation bodies to be visible by default
+            Object.values(annotationsByRef_{unique_id}).forEach(({{ body }}) => {{
+                body.style.display = 'block';
+            }});
+        }});
+        
+        // One delegated listener handles clicks on every highlight and annotation
+        document.addEventListener('click', event => {{
+            const highlight = event.target.closest('[data-ps="{unique_id}"] .hl');
+            if (highlight) {{
+                highlightClick_{unique_id}(highlight.dataset.refIds.split(',')[0]);
+                return;
             }}
             
-            .severity-legend-{self.unique_id} {{
-                display: flex;
-                flex-wrap: wrap;
-                gap: 0.75rem;
-                margin: 1.25rem 0;
-                padding: 0.75rem 1rem;
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 6px;
-                background-color: rgba(35, 35, 40, 0.7);
-                color: rgba(255, 255, 255, 0.87);
+            const annotation = event.target.closest('[data-ps="{unique_id}"] .ann');
+            if (!annotation) {{
+                return;
             }}
-            
-            .legend-item-{self.unique_id} {{
-                display: flex;
-                align-items: center;
-                margin-right: 1rem;
-                padding: 0.25rem 0;
+            if (event.target.closest('[data-ps="{unique_id}"] .ann-title')) {{
+                // Toggles the annotation itself, so the header handler must not run too
+                annotationClick_{unique_id}(annotation.dataset.refId);
+            }} else if (event.target.closest('[data-ps="{unique_id}"] .ann-head')) {{
+                toggleAnnotation_{unique_id}(annotation.dataset.refId);
             }}
+        }});
+        
+        function highlightClick_{unique_id}(refId) {{
+            // Remove active class from all highlights
+            highlights_{unique_id}.forEach(el => {{
+                el.classList.remove('active');
+            }});
             
-            .legend-color-{self.unique_id} {{
-                display: inline-block;
-                width: 1.25rem;
-                height: 0.9rem;
-                margin-right: 0.5rem;
-                border-radius: 3px;
-                border-bottom-width: 2px;
-                border-bottom-style: solid;
-            }}
+            // Add active class to clicked highlight
+            (highlightsByRef_{unique_id}[refId] || []).forEach(el => {{
+                el.classList.add('active');
+            }});
             
-            .legend-label-{self.unique_id} {{
-                font-size: 0.85rem;
-            }}
-
-            @media (max-width: 768px) {{
-                .legal-clause-{self.unique_id} {{
-                    padding: 1rem;
-                    font-size: 0.9rem;
-                }}
+            // Scroll to annotation
+            const annotation = annotationsByRef_{unique_id}[refId];
+            if (annotation) {{
+                // Ensure the annotation body is visible
+                annotation.body.style.display = 'block';
                 
-                .annotation-item-{self.unique_id} {{
-                    padding: 0.75rem;
-                }}
+                // Remove collapsed class from header
+                annotation.header.classList.remove('collapsed');
                 
-                .severity-legend-{self.unique_id} {{
-                    flex-direction: column;
-                    gap: 0.5rem;
-                }}
+                // Smooth scroll to the annotation
+                const item = annotation.item;
+                item.scrollIntoView({{ behavior: 'smooth', block: 'center' }});
+                
+                // Pulse animation effect
+                item.style.transition = 'background-color 0.3s ease';
+                item.style.backgroundColor = 'rgba(80, 80, 100, 0.5)';
+                setTimeout(() => {{
+                    item.style.backgroundColor = '';
+                }}, 800);
             }}
-        </style>
-        """
-        return css
-
-    def _generate_js(self) -> str:
-        """
-        Generate the JavaScript code for enabling interactive features with improved animations.
+        }}
         
-        Returns:
-            str: JavaScript code for the component
-        """
-        js = f"""
-        <script>
-            // Initialize collapsed state for annotations
-            document.addEventListener('DOMContentLoaded', () => {{
-                // Set all annotation bodies to be visible by default
-                document.querySelectorAll('.annotation-body-{self.unique_id}').forEach(el => {{
-                    el.style.display = 'block';
-                }});
+        function annotationClick_{unique_id}(refId) {{
+            // Toggle the body visibility
+            toggleAnnotation_{unique_id}(refId);
+            
+            // Remove active class from all highlights first
+            highlights_{unique_id}.forEach(el => {{
+                el.classList.remove('active');
             }});
             
-            function highlightClick_{self.unique_id}(refId) {{
-                // Remove active class from all highlights
-                document.querySelectorAll('.highlight-{self.unique_id}').forEach(el => {{
-                    el.classList.remove('active');
-                }});
-                
-                // Add active class to clicked highlight
-                document.querySelectorAll(`.highlight-{self.unique_id}[data-ref-ids*="${{refId}}"]`).forEach(el => {{
+            // Find all corresponding highlights
+            const highlights = highlightsByRef_{unique_id}[refId] || [];
+            
+            // If there are no active highlights, activate and scroll to the first one
+            if (highlights.length > 0) {{
+                // Add active class to all corresponding highlights
+                highlights.forEach(el => {{
                     el.classList.add('active');
                 }});
                 
-                // Scroll to annotation
-                const annotation = document.getElementById(`annotation-${{refId}}-{self.unique_id}`);
-                if (annotation) {{
-                    // Ensure the annotation body is visible
-                    const body = document.getElementById(`annotation-body-${{refId}}-{self.unique_id}`);
-                    if (body) {{
-                        body.style.display = 'block';
-                    }}
-                    
-                    // Remove collapsed class from header
-                    const header = annotation.querySelector(`.annotation-header-{self.unique_id}`);
-                    if (header) {{
-                        header.classList.remove('collapsed');
-                    }}
-                    
-                    // Smooth scroll to the annotation
-                    annotation.scrollIntoView({{ behavior: 'smooth', block: 'center' }});
-                    
-                    // Pulse animation effect
-                    annotation.style.transition = 'background-color 0.3s ease';
-                    annotation.style.backgroundColor = 'rgba(80, 80, 100, 0.5)';
+                // Scroll to the first highlight
+                highlights[0].scrollIntoView({{ behavior: 'smooth', block: 'center' }});
+                
+                // Pulse animation effect
+                highlights.forEach(el => {{
+                    el.style.transition = 'all 0.3s ease';
+                    const originalBackground = el.style.backgroundColor;
+                    el.style.backgroundColor = 'rgba(100, 100, 140, 0.3)';
                     setTimeout(() => {{
-                        annotation.style.backgroundColor = '';
+                        el.style.backgroundColor = originalBackground;
                     }}, 800);
-                }}
+                }});
             }}
+        }}
+        
+        function toggleAnnotation_{unique_id}(refId) {{
+            const annotation = annotationsByRef_{unique_id}[refId];
             
-            function annotationClick_{self.unique_id}(refId) {{
-                // Toggle the body visibility
-                toggleAnnotation_{self.unique_id}(refId);
+            if (annotation) {{
+                const {{ body, header }} = annotation;
+                const expanding = body.style.display === 'none';
                 
-                // Remove active class from all highlights first
-                document.querySelectorAll('.highlight-{self.unique_id}').forEach(el => {{
-                    el.classList.remove('active');
-                }});
+                // Drop the constraints from any toggle still in flight
+                if (body.finishToggle) {{
+                    body.removeEventListener('transitionend', body.finishToggle);
+                }}
                 
-                // Find all corresponding highlights
-                const highlights = document.querySelectorAll(`.highlight-{self.unique_id}[data-ref-ids*="${{refId}}"]`);
+                // Clean up exactly when the height transition ends rather than on a timer
+                const finish = () => {{
+                    body.removeEventListener('transitionend', body.finishToggle);
+                    body.finishToggle = null;
+                    if (!expanding) {{
+                        body.style.display = 'none';
+                    }}
+                    body.style.maxHeight = '';
+                    body.style.overflow = '';
+                    body.style.transition = '';
+                }};
+                body.finishToggle = event => {{
+                    if (event.target === body && event.propertyName === 'max-height') {{
+                        finish();
+                    }}
+                }};
                 
-                // If there are no active highlights, activate and scroll to the first one
-                if (highlights.length > 0) {{
-                    // Add active class to all corresponding highlights
-                    highlights.forEach(el => {{
-                        el.classList.add('active');
-                    }});
-                    
-                    // Scroll to the first highlight
-                    highlights[0].scrollIntoView({{ behavior: 'smooth', block: 'center' }});
-                    
-                    // Pulse animation effect
-                    highlights.forEach(el => {{
-                        el.style.transition = 'all 0.3s ease';
-                        const originalBackground = el.style.backgroundColor;
-                        el.style.backgroundColor = 'rgba(100, 100, 140, 0.3)';
-                        setTimeout(() => {{
-                            el.style.backgroundColor = originalBackground;
-                        }}, 800);
-                    }});
+                // Do every write that affects layout first, then read the height once
+                if (expanding) {{
+                    body.style.display = 'block';
+                    body.style.maxHeight = '0';
+                }}
+                body.style.overflow = 'hidden';
+                const fullHeight = body.scrollHeight;
+                if (!expanding) {{
+                    body.style.maxHeight = fullHeight + 'px';
                 }}
-            }}
-            
-            function toggleAnnotation_{self.unique_id}(refId) {{
-                const body = document.getElementById(`annotation-body-${{refId}}-{self.unique_id}`);
-                const header = document.querySelector(`#annotation-${{refId}}-{self.unique_id} .annotation-header-{self.unique_id}`);
                 
-                if (body && header) {{
-                    // Toggle body visibility with a smooth animation
-                    if (body.style.display === 'none') {{
-                        // Show the body
-                        body.style.display = 'block';
-                        body.style.maxHeight = '0';
-                        body.style.overflow = 'hidden';
-                        body.style.transition = 'max-height 0.3s ease';
-                        
-                        // Use setTimeout to allow the transition to work
-                        setTimeout(() => {{
-                            body.style.maxHeight = body.scrollHeight + 'px';
-                        }}, 10);
-                        
-                        // After transition completes, remove the constraints
-                        setTimeout(() => {{
-                            body.style.maxHeight = '';
-                            body.style.overflow = '';
-                            body.style.transition = '';
-                        }}, 300);
-                        
-                        // Update header state
-                        header.classList.remove('collapsed');
-                    }} else {{
-                        // Hide the body with animation
-                        body.style.maxHeight = body.scrollHeight + 'px';
-                        body.style.overflow = 'hidden';
-                        body.style.transition = 'max-height 0.3s ease';
-                        
-                        // Use setTimeout to allow the transition to work
-                        setTimeout(() => {{
-                            body.style.maxHeight = '0';
-                        }}, 10);
-                        
-                        // After transition completes, actually hide it
-                        setTimeout(() => {{
-                            body.style.display = 'none';
-                            body.style.maxHeight = '';
-                            body.style.overflow = '';
-                            body.style.transition = '';
-                        }}, 300);
-                        
-                        // Update header state
-                        header.classList.add('collapsed');
-                    }}
+                // Update header state
+                header.classList.toggle('collapsed', !expanding);
+                
+                // Nothing to animate, and no transitionend would fire
+                if (fullHeight === 0) {{
+                    finish();
+                    return;
                 }}
+                
+                // Let the start height be committed for a frame before animating to the end height
+                body.addEventListener('transitionend', body.finishToggle);
+                requestAnimationFrame(() => {{
+                    requestAnimationFrame(() => {{
+                        body.style.transition = 'max-height 0.3s ease';
+                        body.style.maxHeight = expanding ? fullHeight + 'px' : '0';
+                    }});
+                }});
             }}
-        </script>
+        }}
+    </script>
+    """
+    return _minify_js(js)
+
+
+
+class LegalTextAnalyzer:
+    """
+    A class that analyzes legal text and highlights problematic segments
+    with annotations and severity indicators.
+    """
+
+    SEVERITY_COLORS = {
+        "high": {"bg": "rgba(255, 0, 0, 0.15)", "border": "rgba(255, 0, 0, 0.6)", "text": "#990000"},
+        "medium": {"bg": "rgba(255, 153, 0, 0.15)", "border": "rgba(255, 153, 0, 0.6)", "text": "#b36b00"},
+        "low": {"bg": "rgba(255, 204, 0, 0.15)", "border": "rgba(255, 204, 0, 0.6)", "text": "#806600"},
+    }
+
+    # Rank of each severity, for picking the highest among overlapping segments
+    _SEV_RANK = {"low": 0, "medium": 1, "high": 2}
+
+    # Runs of whitespace, collapsed to a single space when normalizing
+    _WS_RE = re.compile(r'\s+')
+
+    def __init__(self):
+        """Initialize the LegalTextAnalyzer."""
+        self.unique_id = str(uuid.uuid4()).replace("-", "")[:8]
+        
+    def _generate_css(self) -> str:
+        """
+        Generate the CSS for styling the highlighted text and annotations with a dark theme.
+        
+        Returns:
+            str: CSS styles for the component
         """
-        return js
+        return _build_css(self.unique_id)
+
+    def _generate_js(self) -> str:
+        """
+        Generate the JavaScript code for enabling interactive features with improved animations.
+        
+        Returns:
+            str: JavaScript code for the component
+        """
+        return _build_js(self.unique_id)
     
     def _escape_text(self, text: str) -> str:
         """
@@ -381,32 +499,51 @@ class LegalTextAnalyzer:
             str: Text with normalized whitespace
         """
         # Replace multiple whitespace characters with a single space
-        return re.sub(r'\s+', ' ', text.strip())
+        return self._WS_RE.sub(' ', text.strip())
     
-    def _find_text_positions(self, clause_text: str, problematic_text: str) -> List[Tuple[int, int]]:
+    def _find_all_text_positions(self, normalized_clause: str, problematic_texts: List[str]) -> List[List[Tuple[int, int]]]:
         """
-        Find all occurrences of problematic_text in clause_text with flexible whitespace matching.
+        Find all occurrences of every problematic text in a single pass over the clause.
+        
+        Both the clause and the segments are whitespace-normalized, so flexible
+        whitespace matching reduces to plain substring matching and all segments
+        can share one Aho-Corasick automaton.
         
         Args:
-            clause_text (str): The full legal clause text
-            problematic_text (str): The problematic text segment to find
+            normalized_clause (str): The legal clause text, already whitespace-normalized
+            problematic_texts (List[str]): The problematic text segments to find
             
         Returns:
-            List[Tuple[int, int]]: List of (start, end) positions for all occurrences
+            List[List[Tuple[int, int]]]: (start, end) positions of each segment's occurrences, in input order
         """
-        # Normalize both texts for comparison
-        normalized_clause = self._normalize_whitespace(clause_text)
-        normalized_problematic = self._normalize_whitespace(problematic_text)
-        
-        # Create a regex pattern that matches the problematic text with flexible whitespace
-        # Convert spaces to \s+ in the regex pattern
-        pattern = re.escape(normalized_problematic).replace('\\ ', '\\s+')
-        
-        # Find all matches in the normalized clause
-        matches = list(re.finditer(pattern, normalized_clause))
-        
-        # Return all start and end positions
-        return [(m.start(), m.end()) for m in matches]
+        # Group segments by their normalized text so repeated segments share one pattern
+        needles: Dict[str, List[int]] = {}
+        for i, problematic_text in enumerate(problematic_texts):
+            needle = self._normalize_whitespace(problematic_text)
+            if needle:
+                needles.setdefault(needle, []).append(i)
+        
+        positions: List[List[Tuple[int, int]]] = [[] for _ in problematic_texts]
+        if not needles:
+            return positions
+        
+        automaton = ahocorasick.Automaton()
+        for needle in needles:
+            automaton.add_word(needle, needle)
+        automaton.make_automaton()
+        
+        found: Dict[str, List[Tuple[int, int]]] = {needle: [] for needle in needles}
+        for end_index, needle in automaton.iter(normalized_clause):
+            start = end_index - len(needle) + 1
+            matches = found[needle]
+            # Like re.finditer, skip occurrences overlapping the previous one of the same text
+            if not matches or start >= matches[-1][1]:
+                matches.append((start, end_index + 1))
+        
+        for needle, indices in needles.items():
+            for i in indices:
+                positions[i] = found[needle]
+        return positions
     
     def highlight_problematic_texts(self, clause_text: str, problematic_segments: List[Dict[str, Any]]) -> str:
         """
@@ -418,107 +555,115 @@ class LegalTextAnalyzer:
                 Each dict must have 'problematic_text' and 'explanation' keys
                 Optional keys: 'severity' (default: 'medium') and 'legal_reference'
                 
+        Returns:
+            str: HTML string with highlighted problematic segments
+        """
+        # Only the segment text and severity affect the highlighting
+        segment_keys = tuple(
+            (segment.get('problematic_text', ''), segment.get('severity', 'medium'))
+            for segment in problematic_segments
+        )
+        return _cached_highlighted_html(self, clause_text, segment_keys)
+    
+    def _highlight_html(self, clause_text: str, segment_keys: Tuple[Tuple[str, str], ...]) -> str:
+        """
+        Build the highlighted clause HTML.
+        
+        Args:
+            clause_text (str): The full legal clause text
+            segment_keys (Tuple): (problematic_text, severity) for each problematic segment
+            
         Returns:
             str: HTML string with highlighted problematic segments
         """
         # Normalize the clause text
         normalized_clause = self._normalize_whitespace(clause_text)
         
-        # Create a list to track all segment positions with their annotations
+        # Track every segment position as a (start, segment index, end, severity)
+        # tuple, so sorting orders by position and then by segment like a stable
+        # sort on start would, with the comparison done in C
         segments = []
         
-        # Generate unique reference IDs for each problematic segment
-        for i, segment in enumerate(problematic_segments):
-            ref_id = f"ref{i+1}"
-            problematic_text = segment.get('problematic_text', '')
-            positions = self._find_text_positions(normalized_clause, problematic_text)
-            
-            severity = segment.get('severity', 'medium').lower()
+        # Find every segment's occurrences in one pass over the clause
+        all_positions = self._find_all_text_positions(
+            normalized_clause,
+            [problematic_text for problematic_text, _ in segment_keys]
+        )
+        
+        for i, ((_, severity), positions) in enumerate(zip(segment_keys, all_positions)):
+            severity = severity.lower()
             # Ensure severity is one of the supported levels
             if severity not in self.SEVERITY_COLORS:
                 severity = 'medium'
             
-            # Add all positions with this reference ID and severity
-            for start, end in positions:
-                segments.append({
-                    'start': start,
-                    'end': end,
-                    'ref_id': ref_id,
-                    'severity': severity
-                })
-        
-        # Sort segments by start position to process them in order
-        segments.sort(key=lambda x: x['start'])
-        
-        # Merge overlapping segments
+            # Add all positions with this segment index and severity
+            segments.extend((start, i, end, severity) for start, end in positions)
+        
+        segments.sort()
+        
+        # Merge overlapping segments into (start, end, reference IDs, severity) tuples
         merged_segments = []
         if segments:
-            current = segments[0].copy()
-            for segment in segments[1:]:
-                if segment['start'] <= current['end']:
+            current_start, i, current_end, current_severity = segments[0]
+            current_ref_ids = [f"ref{i+1}"]
+            for start, i, end, severity in segments[1:]:
+                if start <= current_end:
                     # Overlapping segments - extend the end if needed
-                    current['end'] = max(current['end'], segment['end'])
+                    current_end = max(current_end, end)
                     # Combine reference IDs for annotations
-                    if segment['ref_id'] not in current['ref_id']:
-                        current['ref_id'] = f"{current['ref_id']},{segment['ref_id']}"
+                    ref_id = f"ref{i+1}"
+                    if ref_id not in current_ref_ids:
+                        current_ref_ids.append(ref_id)
                     # Use the highest severity among overlapping segments
-                    severities = ['low', 'medium', 'high']
-                    current_severity_idx = severities.index(current['severity'])
-                    segment_severity_idx = severities.index(segment['severity'])
-                    if segment_severity_idx > current_severity_idx:
-                        current['severity'] = segment['severity']
+                    if self._SEV_RANK[severity] > self._SEV_RANK[current_severity]:
+                        current_severity = severity
                 else:
                     # Non-overlapping - add the current segment and start a new one
-                    merged_segments.append(current)
-                    current = segment.copy()
+                    merged_segments.append((current_start, current_end, current_ref_ids, current_severity))
+                    current_start, current_end, current_severity = start, end, severity
+                    current_ref_ids = [f"ref{i+1}"]
             
             # Add the last segment
-            merged_segments.append(current)
+            merged_segments.append((current_start, current_end, current_ref_ids, current_severity))
         
-        # Prepare for building the highlighted HTML
-        result = []
+        # Build the highlighted HTML in one buffer, opening the wrapping div with
+        # the document context indicators first so the body is never copied again
+        buf = io.StringIO()
+        buf.write('<div class="clause">')
         last_end = 0
         
+        # Everything in a highlight's markup except its reference IDs depends only
+        # on the severity, so the fixed parts are built once per clause
+        span_starts = {
+            severity: (
+                f'<span class="hl" '
+                f'style="background-color: {colors["bg"]}; border-bottom-color: {colors["border"]};" '
+                f'data-ref-ids="'
+            )
+            for severity, colors in self.SEVERITY_COLORS.items()
+        }
+        badge_start = '<sup class="ref">'
+        
         # Apply highlights to the original text
-        for segment in merged_segments:
+        for start, end, ref_ids, severity in merged_segments:
             # Add text before this segment
-            result.append(self._escape_text(normalized_clause[last_end:segment['start']]))
+            buf.write(self._escape_text(normalized_clause[last_end:start]))
             
             # Add the highlighted segment
-            severity = segment['severity']
-            colors = self.SEVERITY_COLORS[severity]
-            
-            # Extract multiple reference IDs if present
-            ref_ids = segment['ref_id'].split(',')
-            ref_badges = ''.join([
-                f'<sup class="annotation-ref-{self.unique_id}">{ref_id[3:]}</sup>' 
-                for ref_id in ref_ids
-            ])
+            ref_badges = ''.join([f'{badge_start}{ref_id[3:]}</sup>' for ref_id in ref_ids])
             
             # Create the highlighted text with all annotation references
-            highlighted_text = self._escape_text(normalized_clause[segment['start']:segment['end']])
+            highlighted_text = self._escape_text(normalized_clause[start:end])
             
-            result.append(
-                f'<span class="highlight-{self.unique_id}" '
-                f'style="background-color: {colors["bg"]}; border-bottom-color: {colors["border"]};" '
-                f'data-ref-ids="{segment["ref_id"]}" '
-                f'onclick="highlightClick_{self.unique_id}(\'{ref_ids[0]}\')">'
-                f'{highlighted_text}{ref_badges}</span>'
-            )
+            buf.write(f'{span_starts[severity]}{",".join(ref_ids)}">{highlighted_text}{ref_badges}</span>')
             
-            last_end = segment['end']
-        
-        # Add any remaining text
-        result.append(self._escape_text(normalized_clause[last_end:]))
+            last_end = end
         
-        # Wrap in a div with the document context indicators
-        html_result = (
-            f'<div class="legal-clause-{self.unique_id}">'
-            f'{"".join(result)}'
-            f'</div>'
-        )
+        # Add any remaining text and close the wrapping div
+        buf.write(self._escape_text(normalized_clause[last_end:]))
+        buf.write('</div>')
         
-        return html_result
+        return buf.getvalue()
     
     def _generate_annotations_html(self, problematic_segments: List[Dict[str, Any]]) -> str:
         """
@@ -530,40 +675,56 @@ class LegalTextAnalyzer:
         Returns:
             str: HTML string with annotations
         """
-        annotations_html = f'<div class="annotations-section-{self.unique_id}">'
-        annotations_html += f'<h3>Annotations</h3>'
+        segment_keys = tuple(
+            (
+                segment.get('problematic_text', ''),
+                segment.get('severity', 'medium'),
+                segment.get('explanation', ''),
+                segment.get('legal_reference', '')
+            )
+            for segment in problematic_segments
+        )
+        return _cached_annotations_html(self, segment_keys)
+    
+    def _annotations_html(self, segment_keys: Tuple[Tuple[str, str, str, str], ...]) -> str:
+        """
+        Build the annotations HTML.
         
-        for i, segment in enumerate(problematic_segments):
+        Args:
+            segment_keys (Tuple): (problematic_text, severity, explanation, legal_reference)
+                for each problematic segment
+            
+        Returns:
+            str: HTML string with annotations
+        """
+        parts = ['<div class="anns">', '<h3>Annotations</h3>']
+        
+        for i, (problematic_text, severity, explanation, legal_reference) in enumerate(segment_keys):
             ref_id = f"ref{i+1}"
-            severity = segment.get('severity', 'medium').lower()
+            severity = severity.lower()
             if severity not in self.SEVERITY_COLORS:
                 severity = 'medium'
             
-            explanation = self._escape_text(segment.get('explanation', ''))
-            legal_reference = segment.get('legal_reference', '')
+            explanation = self._escape_text(explanation)
             
-            annotations_html += f"""
-            <div id="annotation-{ref_id}-{self.unique_id}" 
-                 class="annotation-item-{self.unique_id} {severity}">
-                <div class="annotation-header-{self.unique_id}" 
-                     onclick="toggleAnnotation_{self.unique_id}('{ref_id}')">
-                    <span onclick="annotationClick_{self.unique_id}('{ref_id}')"
-                          style="cursor: pointer;">
-                        Issue {i+1}: {self._escape_text(segment.get('problematic_text', '')[:50])}
-                        {' [...]' if len(segment.get('problematic_text', '')) > 50 else ''}
+            parts.append(f"""
+            <div class="ann {severity}" data-ref-id="{ref_id}">
+                <div class="ann-head">
+                    <span class="ann-title" style="cursor: pointer;">
+                        Issue {i+1}: {self._escape_text(problematic_text[:50])}
+                        {' [...]' if len(problematic_text) > 50 else ''}
                     </span>
                 </div>
-                <div id="annotation-body-{ref_id}-{self.unique_id}" 
-                     class="annotation-body-{self.unique_id}">
+                <div class="ann-body">
                     <p>{explanation}</p>
-                    {f'<p class="legal-reference-{self.unique_id}">{self._escape_text(legal_reference)}</p>' 
+                    {f'<p class="legal-ref">{self._escape_text(legal_reference)}</p>' 
                       if legal_reference else ''}
                 </div>
             </div>
-            """
+            """)
         
-        annotations_html += '</div>'
-        return annotations_html
+        parts.append('</div>')
+        return ''.join(parts)
     
     def _generate_severity_legend(self) -> str:
         """
@@ -572,23 +733,23 @@ class LegalTextAnalyzer:
         Returns:
             str: HTML string for the severity legend
         """
-        legend_html = f'<div class="severity-legend-{self.unique_id}">'
+        parts = ['<div class="legend">']
         
         # Add a title for the legend
-        legend_html += '<div style="width: 100%; margin-bottom: 8px;"><strong>Risk Severity Levels:</strong></div>'
+        parts.append('<div style="width: 100%; margin-bottom: 8px;"><strong>Risk Severity Levels:</strong></div>')
         
         # Add legend items for each severity level
         for severity, colors in self.SEVERITY_COLORS.items():
-            legend_html += f"""
-            <div class="legend-item-{self.unique_id}">
-                <span class="legend-color-{self.unique_id}" 
+            parts.append(f"""
+            <div class="legend-item">
+                <span class="legend-color" 
                       style="background-color: {colors['bg']}; border-bottom-color: {colors['border']};"></span>
-                <span class="legend-label-{self.unique_id}">{severity.capitalize()}</span>
+                <span class="legend-label">{severity.capitalize()}</span>
             </div>
-            """
+            """)
         
-        legend_html += '</div>'
-        return legend_html
+        parts.append('</div>')
+        return ''.join(parts)
     
     def display_highlighted_clause(self, clause_text: str, problematic_segments: List[Dict[str, Any]]) -> None:
         """
@@ -603,8 +764,8 @@ class LegalTextAnalyzer:
         js = self._generate_js()
         highlighted_html = self.highlight_problematic_texts(clause_text, problematic_segments)
         
-        # Combine into a single HTML string
-        full_html = f"{css}{js}{highlighted_html}"
+        # Combine into a single HTML string, with the script last so it doesn't hold up parsing the markup
+        full_html = f'{css}<div data-ps="{self.unique_id}">{highlighted_html}</div>{js}'
         
         # Display in Streamlit
         st.components.v1.html(full_html, height=400, scrolling=True)
@@ -627,8 +788,14 @@ class LegalTextAnalyzer:
         # Add heading above text
         heading_html = f'<h3 style="color: rgba(255, 255, 255, 0.87); margin-bottom: 15px; font-family: \\"Inter\\", \\"Georgia\\", serif; font-weight: 500;">Clause Text With Annotations</h3>'
         
-        # Combine into a single HTML string - heading first, then text, legend, and annotations
-        full_html = f"{css}{js}{heading_html}{highlighted_html}{legend_html}{annotations_html}"
+        # Combine into a single HTML string - heading first, then text, legend, and annotations,
+        # inside the element the styles are scoped to, with the script last so it doesn't
+        # hold up parsing the markup
+        full_html = (
+            f'{css}<div data-ps="{self.unique_id}">'
+            f'{heading_html}{highlighted_html}{legend_html}{annotations_html}'
+            f'</div>{js}'
+        )
         
         # Calculate appropriate height based on content
         content_height = 500 + (len(problematic_segments) * 50)
@@ -637,41 +804,46 @@ class LegalTextAnalyzer:
         st.components.v1.html(full_html, height=content_height, scrolling=True)
 
 
-# Create a wrapper function to maintain backward compatibility
-def annotate_clause_risks(clause_text: str, problematic_segments: List[Dict[str, Any]]) -> None:
+# Streamlit reruns re-render the same clause on every interaction, so the
+# generated HTML is cached by content. The markup doesn't depend on the
+# analyzer's ID, so the analyzer itself isn't hashed
+@st.cache_data(show_spinner=False, max_entries=128)
+def _cached_highlighted_html(_analyzer: LegalTextAnalyzer, clause_text: str,
+                             segment_keys: Tuple[Tuple[str, str], ...]) -> str:
+    """Cached LegalTextAnalyzer._highlight_html"""
+    return _analyzer._highlight_html(clause_text, segment_keys)
+
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def _cached_annotations_html(_analyzer: LegalTextAnalyzer,
+                             segment_keys: Tuple[Tuple[str, str, str, str], ...]) -> str:
+    """Cached LegalTextAnalyzer._annotations_html"""
+    return _analyzer._annotations_html(segment_keys)
+
+
+@st.cache_resource(show_spinner=False)
+def _get_analyzer() -> LegalTextAnalyzer:
     """
-    Wrapper function to maintain backward compatibility with existing code.
-    Creates an instance of LegalTextAnalyzer and calls the annotate_clause_risks method.
+    Get the analyzer shared by the wrapper functions.
     
-    Args:
-        clause_text (str): The full legal clause text
-        problematic_segments (List[Dict]): List of dictionaries containing problematic text segments
-    """
-    # Convert string segments to dictionary format if needed
-    if problematic_segments and isinstance(problematic_segments[0], str):
-        problematic_segments = [
-            {
-                'problematic_text': segment,
-                'explanation': segment,
-                'severity': 'medium'
-            }
-            for segment in problematic_segments
-        ]
+    Each render goes into its own iframe, so one ID can be reused across
+    clauses and reruns, which also keeps the CSS/JS cache warm.
     
-    analyzer = LegalTextAnalyzer()
-    analyzer.annotate_clause_risks(clause_text, problematic_segments)
+    Returns:
+        LegalTextAnalyzer: The shared analyzer
+    """
+    return LegalTextAnalyzer()
 
 
-def highlight_problematic_texts(clause_text: str, problematic_segments: List[Dict[str, Any]]) -> str:
+# Create a wrapper function to maintain backward compatibility
+def annotate_clause_risks(clause_text: str, problematic_segments: List[Dict[str, Any]]) -> None:
     """
-    Wrapper function for highlight_problematic_texts method.
+    Wrapper function to maintain backward compatibility with existing code.
+    Creates an instance of LegalTextAnalyzer and calls the annotate_clause_risks method.
     
     Args:
         clause_text (str): The full legal clause text
         problematic_segments (List[Dict]): List of dictionaries containing problematic text segments
-            
-    Returns:
-        str: HTML string with highlighted problematic segments
     """
     # Convert string segments to dictionary format if needed
     if problematic_segments and isinstance(problematic_segments[0], str):
@@ -684,8 +856,8 @@ def highlight_problematic_texts(clause_text: str, problematic_segments: List[Dic
             for segment in problematic_segments
         ]
     
-    analyzer = LegalTextAnalyzer()
-    return analyzer.highlight_problematic_texts(clause_text, problematic_segments)
+    analyzer = _get_analyzer()
+    analyzer.annotate_clause_risks(clause_text, problematic_segments)
 
 
 def display_highlighted_clause(clause_text: str, problematic_segments: List[Dict[str, Any]]) -> None:
@@ -707,5 +879,5 @@ def display_highlighted_clause(clause_text: str, problematic_segments: List[Dict
             for segment in problematic_segments
         ]
     
-    analyzer = LegalTextAnalyzer()
+    analyzer = _get_analyzer()
     analyzer.display_highlighted_clause(clause_text, problematic_segments)
\ No newline at end of file